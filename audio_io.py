@@ -0,0 +1,263 @@
+"""
+오디오 입출력 드라이버
+
+RealtimeClient는 마이크 입력과 스피커 출력을 콜백 두 개(MicrophoneCapture.callback,
+PlaybackEngine.callback)로만 주고받으므로, 그 콜백을 불러 주는 쪽을 바꿔 끼울 수 있습니다.
+
+- AudioIO: 드라이버 인터페이스 (open → start → close)
+- PyAudioIO: 실제 오디오 장치 (PyAudio 콜백 모드 스트림)
+- WavFileIO: 장치 없이 WAV 파일을 마이크 입력으로 흘려 보내고 응답 음성을 WAV로 녹음.
+  실시간(speed=1) 또는 그보다 빠르게 재생하며, 발화 파일마다 응답 재생이 끝날 때까지
+  무음을 넣고 기다린 뒤 다음 파일로 넘어감 (서버 없는 환경의 배치 벤치마크용)
+"""
+import json
+import os
+import threading
+import time
+import wave
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+# 응답이 끝났다고 볼 출력 무음 길이와, 응답을 기다리는 최대 시간 (모두 오디오 시간 기준)
+REPLY_IDLE_MS = 800
+REPLY_TIMEOUT_SECONDS = 30.0
+
+AudioCallback = Callable[[Optional[bytes], int, Optional[dict], int], tuple]
+
+
+class AudioIO:
+    """
+    오디오 입출력 드라이버 인터페이스입니다.
+
+    open()에 PyAudio 스트림 콜백과 같은 모양의 입력/출력 콜백을 넘기면, start() 이후
+    frame_samples 마다 입력 콜백에 PCM16 mono 바이트를 넘기고 출력 콜백이 돌려준
+    바이트를 재생합니다.
+    """
+
+    def open(self, sample_rate: int, frame_samples: int,
+             input_callback: AudioCallback, output_callback: AudioCallback) -> None:
+        """입출력을 열어 둡니다 (start() 전까지 콜백을 부르지 않음)."""
+        raise NotImplementedError
+
+    def start(self) -> None:
+        """콜백 호출을 시작합니다."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """입출력을 멈추고 자원을 해제합니다 (여러 번 불러도 됨)."""
+        raise NotImplementedError
+
+
+class PyAudioIO(AudioIO):
+    """PyAudio 콜백 모드 입출력 스트림 (실제 마이크/스피커)."""
+
+    def __init__(self):
+        import pyaudio
+
+        self._pyaudio = pyaudio
+        self.audio = pyaudio.PyAudio()
+        self.input_stream = None
+        self.output_stream = None
+
+    def open(self, sample_rate, frame_samples, input_callback, output_callback):
+        self.input_stream = self.audio.open(
+            format=self._pyaudio.paInt16,
+            channels=1,
+            rate=sample_rate,
+            input=True,
+            frames_per_buffer=frame_samples,
+            stream_callback=input_callback,
+            start=False
+        )
+
+        self.output_stream = self.audio.open(
+            format=self._pyaudio.paInt16,
+            channels=1,
+            rate=sample_rate,
+            output=True,
+            frames_per_buffer=frame_samples,
+            stream_callback=output_callback,
+            start=False
+        )
+
+    def start(self):
+        self.input_stream.start_stream()
+        self.output_stream.start_stream()
+
+    def close(self):
+        for stream in (self.input_stream, self.output_stream):
+            if stream:
+                stream.stop_stream()
+                stream.close()
+        self.input_stream = None
+        self.output_stream = None
+        if self.audio is not None:
+            self.audio.terminate()
+            self.audio = None
+
+
+def read_wav(path: str, sample_rate: int) -> np.ndarray:
+    """PCM16 WAV를 mono int16 배열로 읽습니다 (채널 평균, 샘플레이트가 다르면 선형 보간)."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"PCM16 WAV만 지원합니다: {path}")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate and len(samples):
+        count = int(len(samples) * sample_rate / rate)
+        samples = np.interp(np.arange(count) * rate / sample_rate,
+                            np.arange(len(samples)), samples)
+    return samples.astype(np.int16)
+
+
+class WavFileIO(AudioIO):
+    """
+    WAV 파일 입력 / WAV 녹음 출력 드라이버입니다.
+
+    inputs의 각 항목(WAV 경로 또는 sample_rate의 int16 배열)을 사용자 발화 한 번으로 보고,
+    처음 인사와 각 발화 뒤에는 응답이 재생되고 REPLY_IDLE_MS 동안 조용해질 때까지
+    (최대 REPLY_TIMEOUT_SECONDS) 무음을 입력합니다. 모두 끝나면 finished가 설정되고,
+    close() 전까지는 무음 입력을 계속합니다.
+
+    입력과 출력은 한 스레드가 같은 오디오 시계로 frame_samples 씩 진행하므로, 녹음된
+    output_path의 위치는 입력 시작부터의 오디오 시간과 같습니다. 입력 구간과 응답 구간의
+    시각(ms, 오디오 시간)은 timeline에 모으고 close() 때 output_path 옆
+    .timeline.jsonl 파일에도 남깁니다. speed가 1보다 크면 그 배속으로 진행합니다.
+    """
+
+    def __init__(self, inputs: list[Union[str, np.ndarray]], output_path: Optional[str] = None,
+                 speed: float = 1.0, wait_for_greeting: bool = True,
+                 reply_idle_ms: int = REPLY_IDLE_MS,
+                 reply_timeout: float = REPLY_TIMEOUT_SECONDS):
+        if speed <= 0:
+            raise ValueError("speed는 0보다 커야 합니다")
+        self.inputs = list(inputs)
+        self.output_path = output_path
+        self.speed = speed
+        self.wait_for_greeting = wait_for_greeting
+        self.reply_idle_ms = reply_idle_ms
+        self.reply_timeout = reply_timeout
+        self.finished = threading.Event()
+        self.timeline: list[dict] = []
+        self.reply_timeouts = 0
+        self.frames = 0
+        self.late_frames = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._writer = None
+
+    def open(self, sample_rate, frame_samples, input_callback, output_callback):
+        self.sample_rate = sample_rate
+        self.frame_samples = frame_samples
+        self._input_callback = input_callback
+        self._output_callback = output_callback
+        self._silence = bytes(frame_samples * 2)
+        if self.output_path:
+            directory = os.path.dirname(self.output_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._writer = wave.open(self.output_path, "wb")
+            self._writer.setnchannels(1)
+            self._writer.setsampwidth(2)
+            self._writer.setframerate(sample_rate)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="wav-file-io", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            with open(os.path.splitext(self.output_path)[0] + ".timeline.jsonl", "w",
+                      encoding="utf-8") as f:
+                for entry in self.timeline:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def media_ms(self) -> float:
+        """지금까지 진행한 오디오 시간 (ms)."""
+        return self.frames * self.frame_samples * 1000 / self.sample_rate
+
+    def _run(self) -> None:
+        frame_time = self.frame_samples / self.sample_rate / self.speed
+        started = time.perf_counter()
+        if self.wait_for_greeting:
+            self._wait_for_reply(started, frame_time)
+        for index, source in enumerate(self.inputs):
+            if self._stop.is_set():
+                return
+            samples = read_wav(source, self.sample_rate) if isinstance(source, str) else source
+            entry = {"type": "input", "index": index, "start_ms": self.media_ms()}
+            if isinstance(source, str):
+                entry["file"] = source
+            for offset in range(0, len(samples), self.frame_samples):
+                frame = samples[offset:offset + self.frame_samples]
+                data = frame.tobytes()
+                if len(frame) < self.frame_samples:
+                    data += bytes((self.frame_samples - len(frame)) * 2)
+                self._tick(data, started, frame_time)
+                if self._stop.is_set():
+                    return
+            entry["end_ms"] = self.media_ms()
+            self.timeline.append(entry)
+            self._wait_for_reply(started, frame_time)
+        self.finished.set()
+        while not self._stop.is_set():
+            self._tick(self._silence, started, frame_time)
+
+    def _wait_for_reply(self, started: float, frame_time: float) -> None:
+        """응답 음성이 나왔다가 reply_idle_ms 동안 조용해질 때까지 무음을 입력합니다."""
+        deadline = self.frames + int(self.reply_timeout * self.sample_rate / self.frame_samples)
+        idle_frames = int(self.reply_idle_ms * self.sample_rate / 1000 / self.frame_samples)
+        reply = None
+        idle = 0
+        while not self._stop.is_set():
+            audible = self._tick(self._silence, started, frame_time)
+            if audible:
+                if reply is None:
+                    reply = {"type": "output", "start_ms": self.media_ms() - self._frame_ms(),
+                             "wall_time": round(time.time(), 3)}
+                reply["end_ms"] = self.media_ms()
+                idle = 0
+            elif reply is not None:
+                idle += 1
+                if idle >= idle_frames:
+                    self.timeline.append(reply)
+                    return
+            if self.frames >= deadline:
+                self.reply_timeouts += 1
+                if reply is not None:
+                    self.timeline.append(reply)
+                return
+
+    def _frame_ms(self) -> float:
+        return self.frame_samples * 1000 / self.sample_rate
+
+    def _tick(self, data: bytes, started: float, frame_time: float) -> bool:
+        """
+        한 프레임을 진행합니다: 출력 콜백 → 녹음, 입력 콜백. 출력에 소리가 있었는지 반환합니다.
+
+        예정 시각(started + frames × frame_time)까지 기다리며, 이미 늦었으면 바로 진행합니다.
+        """
+        due = started + self.frames * frame_time
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -frame_time:
+            self.late_frames += 1
+        now = time.perf_counter()
+        time_info = {"current_time": now, "output_buffer_dac_time": now}
+        out, _ = self._output_callback(None, self.frame_samples, time_info, 0)
+        if self._writer is not None:
+            self._writer.writeframes(out)
+        self._input_callback(data, self.frame_samples, time_info, 0)
+        self.frames += 1
+        return bool(np.any(np.frombuffer(out, dtype=np.int16)))
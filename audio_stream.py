@@ -0,0 +1,407 @@
+"""
+실시간 오디오 스트림 버퍼
+
+- PcmRingBuffer: 잠금 없는 단일 생산자/단일 소비자 int16 PCM 링 버퍼
+- MicrophoneCapture: PyAudio 콜백 스레드가 링 버퍼에 쓰고, asyncio 쪽은
+  프레임이 채워질 때까지 await 하는 마이크 입력 (이벤트 루프를 막지 않음)
+- FrameRing: 응답 오디오를 고정 길이 출력 프레임으로 자르되, 복사하지 않고
+  미리 할당한 링의 NumPy 뷰로 내주는 버퍼 (Gradio WebRTC 출력용)
+- PlaybackEngine: 적응형 지터 버퍼를 둔 PyAudio 콜백 모드 출력
+  (반향 제거용으로 장치에 넘긴 출력을 참조 신호로 따로 보관할 수 있음)
+"""
+import asyncio
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+
+# PyAudio 콜백 반환/상태 플래그 (pyaudio.paContinue, pyaudio.paInputOverflow)
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 0x2
+
+# 지터 버퍼 목표치(ms): 처음엔 최소로 시작해 끊김(underrun)이 날 때만 늘림
+PREBUFFER_MIN_MS = 40
+PREBUFFER_MAX_MS = 400
+PREBUFFER_STEP_MS = 40
+# 이 시간(초) 동안 끊김 없이 재생되면 목표치를 한 단계 줄임
+PREBUFFER_DECAY_SECONDS = 10.0
+# 반향 제거 참조 신호가 이보다 많이 밀려 있으면 오래된 쪽을 버림
+# (참조가 마이크의 반향보다 늦어지면 적응 필터가 반향을 예측할 수 없음)
+REFERENCE_MAX_LAG_MS = 40
+
+
+class PcmRingBuffer:
+    """
+    고정 크기 int16 샘플 링 버퍼입니다.
+
+    쓰기 위치는 생산자만, 읽기 위치는 소비자만 바꾸는 누적 카운터이므로
+    스레드 하나가 쓰고 다른 하나가 읽는 경우 잠금이 필요 없습니다.
+    공간이 모자라면 새로 들어온 샘플을 버리고 overruns를 셉니다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self._write_pos = 0
+        self._read_pos = 0
+        self.overruns = 0
+        self.dropped_samples = 0
+
+    def available(self) -> int:
+        """읽을 수 있는 샘플 수."""
+        return self._write_pos - self._read_pos
+
+    def free(self) -> int:
+        """쓸 수 있는 샘플 수."""
+        return self.capacity - self.available()
+
+    def write(self, samples: np.ndarray) -> int:
+        """샘플을 기록하고 실제로 기록한 샘플 수를 반환합니다 (생산자 전용)."""
+        count = min(len(samples), self.free())
+        if count < len(samples):
+            self.overruns += 1
+            self.dropped_samples += len(samples) - count
+        start = self._write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:count - first] = samples[first:count]
+        # 데이터를 모두 쓴 뒤에 위치를 올려 소비자에게 공개
+        self._write_pos += count
+        return count
+
+    def read_into(self, out: np.ndarray) -> int:
+        """out을 채울 만큼 읽고 읽은 샘플 수를 반환합니다 (소비자 전용)."""
+        count = min(len(out), self.available())
+        start = self._read_pos % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        out[first:count] = self._data[:count - first]
+        self._read_pos += count
+        return count
+
+    def clear(self) -> None:
+        """읽지 않은 샘플을 모두 버립니다 (소비자 전용)."""
+        self._read_pos = self._write_pos
+
+
+class MicrophoneCapture:
+    """
+    PyAudio 콜백 모드 마이크 입력입니다.
+
+    `audio.open(..., stream_callback=capture.callback)`으로 연결하면 PortAudio
+    스레드가 링 버퍼에 샘플을 쓰고, read_frame()은 frame_samples 만큼 모일 때까지
+    이벤트 루프를 막지 않고 기다립니다.
+    """
+
+    def __init__(self, frame_samples: int, capacity_samples: Optional[int] = None):
+        self.frame_samples = frame_samples
+        # 기본 100 프레임(20ms 프레임이면 2초) 분량을 보관
+        self.ring = PcmRingBuffer(capacity_samples or frame_samples * 100)
+        self._frame = np.zeros(frame_samples, dtype=np.int16)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self.closed = False
+        self.device_overflows = 0
+        self.frames_read = 0
+
+    def callback(self, in_data, frame_count, time_info, status):
+        """PyAudio 스트림 콜백 (PortAudio 스레드에서 호출)."""
+        if status & PA_INPUT_OVERFLOW:
+            self.device_overflows += 1
+        self.ring.write(np.frombuffer(in_data, dtype=np.int16))
+        waiter = self._waiter
+        if waiter is not None and self.ring.available() >= self.frame_samples:
+            self._loop.call_soon_threadsafe(self._wake, waiter)
+        return None, PA_CONTINUE
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(None)
+
+    async def read_frame(self) -> Optional[bytes]:
+        """PCM16 프레임 하나를 기다려 반환합니다. close() 후에는 None."""
+        while self.ring.available() < self.frame_samples:
+            if self.closed:
+                return None
+            self._loop = asyncio.get_running_loop()
+            waiter = self._loop.create_future()
+            self._waiter = waiter
+            try:
+                # 대기 등록 직전에 도착한 샘플은 콜백이 깨우지 못하므로 다시 확인
+                if self.ring.available() < self.frame_samples:
+                    await waiter
+            finally:
+                self._waiter = None
+        self.ring.read_into(self._frame)
+        self.frames_read += 1
+        return self._frame.tobytes()
+
+    def discard(self) -> None:
+        """쌓여 있는 입력을 버립니다."""
+        self.ring.clear()
+
+    def close(self) -> None:
+        """대기 중인 read_frame()을 깨워 종료시킵니다."""
+        self.closed = True
+        waiter = self._waiter
+        if waiter is not None:
+            self._loop.call_soon_threadsafe(self._wake, waiter)
+
+    def stats(self) -> dict:
+        return {
+            "frames_read": self.frames_read,
+            "ring_overruns": self.ring.overruns,
+            "dropped_samples": self.ring.dropped_samples,
+            "device_overflows": self.device_overflows,
+        }
+
+
+class FrameRing:
+    """
+    고정 길이 프레임을 NumPy 뷰로 내주는 int16 링 버퍼입니다.
+
+    feed()로 받은 샘플을 링에 한 번만 복사하고, frame_samples가 찰 때마다 그 구간의
+    (1, frame_samples) 모양 뷰를 내줍니다. 링 길이가 프레임 길이의 배수이고 프레임은
+    항상 프레임 경계에서 시작하므로 한 프레임이 링 끝에서 나뉘지 않으며, 칸마다 뷰를
+    미리 만들어 두어 프레임을 내줄 때 새로 할당하지 않습니다.
+
+    내준 뷰는 그 뒤로 frames - 1 프레임을 더 쓸 때까지 유효합니다. 프레임을 쌓아 두는
+    큐의 최대 길이보다 frames를 넉넉히 잡아야 합니다.
+    """
+
+    def __init__(self, frame_samples: int, frames: int):
+        self.frame_samples = frame_samples
+        self.frames = frames
+        self.capacity = frame_samples * frames
+        self._data = np.zeros(self.capacity, dtype=np.int16)
+        self._views = [self._data[i:i + frame_samples].reshape(1, -1)
+                       for i in range(0, self.capacity, frame_samples)]
+        # 누적 위치: _read는 아직 내주지 않은 프레임의 시작 (항상 프레임 경계)
+        self._write = 0
+        self._read = 0
+
+    def pending(self) -> int:
+        """아직 프레임으로 내주지 않은 샘플 수 (프레임 하나보다 적음)."""
+        return self._write - self._read
+
+    def feed(self, samples: np.ndarray) -> Iterator[np.ndarray]:
+        """
+        샘플을 쓰면서 완성된 프레임 뷰를 차례로 내줍니다.
+
+        프레임 하나씩 채워 가며 쓰므로, 긴 입력이라도 아직 내주지 않은 샘플이 한 프레임을
+        넘지 않고 이미 내준 뷰를 덮어쓰지 않습니다 (위의 frames 조건 아래).
+        """
+        frame = self.frame_samples
+        offset = 0
+        while offset < len(samples):
+            start = self._write % self.capacity
+            count = min(len(samples) - offset, frame - (self._write - self._read))
+            self._data[start:start + count] = samples[offset:offset + count]
+            self._write += count
+            offset += count
+            if self._write - self._read == frame:
+                slot = self._read // frame % self.frames
+                self._read += frame
+                yield self._views[slot]
+
+    def flush(self) -> Optional[np.ndarray]:
+        """남은 샘플을 짧은 프레임 뷰로 내주고 다음 프레임 경계로 넘어갑니다 (없으면 None)."""
+        count = self._write - self._read
+        if not count:
+            return None
+        slot = self._read // self.frame_samples % self.frames
+        self.clear()
+        return self._views[slot][:, :count]
+
+    def clear(self) -> None:
+        """내주지 않은 샘플을 버리고 다음 프레임 경계로 넘어갑니다."""
+        if self._write != self._read:
+            self._read += self.frame_samples
+        self._write = self._read
+
+
+class PlaybackEngine:
+    """
+    PyAudio 콜백 스레드에서 재생하는 출력 엔진입니다.
+
+    이벤트 루프는 write()로 응답 오디오를 넣기만 하고, 콜백은 지터 버퍼에
+    목표치(prebuffer)만큼 쌓이면 재생을 시작합니다. 응답 도중 버퍼가 비면
+    underrun으로 세고 목표치를 늘린 뒤 다시 쌓일 때까지 무음을 냅니다.
+    응답 끝(mark_end)에서 비는 것은 underrun이 아닙니다.
+
+    played_samples()는 장치 출력 지연까지 반영해 실제로 스피커에서 재생된
+    응답 샘플 수를 추정합니다 (무음 채움은 세지 않음). position()은 같은 추정을
+    write_position()과 같은 좌표(지금까지 write()로 넣은 샘플 위치)로 돌려주므로,
+    응답 항목이 시작된 write_position()과 비교하면 그 항목을 얼마나 들려줬는지 알 수 있습니다.
+    """
+
+    def __init__(self, sample_rate: int, capacity_seconds: float = 120.0):
+        self.sample_rate = sample_rate
+        self.ring = PcmRingBuffer(int(sample_rate * capacity_seconds))
+        self._out = np.zeros(0, dtype=np.int16)
+        self.prebuffer_samples = self._ms_to_samples(PREBUFFER_MIN_MS)
+        self._buffering = True
+        self._ended = False
+        self._clear_requested = False
+        self._interrupted_at: Optional[float] = None
+        self._stable_samples = 0
+        # 장치에 넘긴 응답 샘플 수 (누적, 무음 채움과 버린 샘플 제외)
+        self.samples_out = 0
+        # 마지막 콜백의 (벽시계, 버퍼 첫 샘플의 위치, 버퍼 앞까지의 samples_out,
+        #                장치 출력까지 남은 지연, 버퍼의 응답 샘플 수)
+        self._last_callback = (0.0, 0, 0, 0.0, 0)
+        self.underruns = 0
+        self.callbacks = 0
+        # interrupt() 호출부터 스피커가 조용해질 때까지 걸린 시간(초)들
+        self.interrupt_latencies: list[float] = []
+        # enable_reference() 후 콜백이 장치에 넘긴 출력(무음 포함)을 복사해 둠
+        self.reference: Optional[PcmRingBuffer] = None
+        self._reference_scratch = np.zeros(0, dtype=np.int16)
+        self.reference_skipped = 0
+
+    def _ms_to_samples(self, ms: float) -> int:
+        return int(self.sample_rate * ms / 1000)
+
+    # ----- 이벤트 루프 (생산자) 쪽 -----
+
+    def write(self, pcm: bytes) -> None:
+        """응답 오디오(PCM16)를 지터 버퍼에 넣습니다."""
+        self._ended = False
+        self.ring.write(np.frombuffer(pcm, dtype=np.int16))
+
+    def mark_end(self) -> None:
+        """현재 응답의 오디오가 모두 도착했음을 알립니다 (남은 버퍼는 끝까지 재생)."""
+        self._ended = True
+
+    def clear(self) -> None:
+        """재생 대기 중인 오디오를 버리도록 요청합니다 (다음 콜백에서 적용)."""
+        self._clear_requested = True
+
+    def interrupt(self) -> int:
+        """
+        사용자 끼어들기(barge-in)로 재생을 멈춥니다.
+
+        다음 콜백(한 프레임 이내)부터 무음을 내며, 멈춘 시점의 position()을 반환합니다.
+        """
+        position = self.position()
+        self._interrupted_at = time.perf_counter()
+        self._clear_requested = True
+        return position
+
+    def enable_reference(self) -> None:
+        """장치 출력을 반향 제거 참조 신호로 보관하기 시작합니다 (스트림 시작 전에 호출)."""
+        self.reference = PcmRingBuffer(self.sample_rate)
+
+    def read_reference(self, out: np.ndarray) -> None:
+        """
+        마이크 프레임과 짝지을 참조 신호로 out을 채웁니다 (이벤트 루프 쪽 소비자).
+
+        입력/출력 스트림의 시작 시각 차이나 클럭 차이로 참조가 밀려 있으면
+        최근 REFERENCE_MAX_LAG_MS 만큼만 남기고 버립니다. 모자라면 0으로 채웁니다.
+        """
+        reference = self.reference
+        excess = reference.available() - len(out) - self._ms_to_samples(REFERENCE_MAX_LAG_MS)
+        if excess > 0:
+            if len(self._reference_scratch) < excess:
+                self._reference_scratch = np.zeros(excess, dtype=np.int16)
+            reference.read_into(self._reference_scratch[:excess])
+            self.reference_skipped += excess
+        count = reference.read_into(out)
+        out[count:] = 0
+
+    def write_position(self) -> int:
+        """다음 write()의 첫 샘플이 놓일 위치."""
+        return self.ring._write_pos
+
+    def is_active(self) -> bool:
+        """재생할 오디오가 남아 있거나 장치에서 아직 재생 중인지 여부."""
+        return self.ring.available() > 0 or self.played_samples() < self.samples_out
+
+    # ----- PyAudio 콜백 (소비자) 쪽 -----
+
+    def callback(self, in_data, frame_count, time_info, status):
+        """PyAudio 출력 스트림 콜백 (PortAudio 스레드에서 호출)."""
+        if len(self._out) < frame_count:
+            self._out = np.zeros(frame_count, dtype=np.int16)
+        out = self._out[:frame_count]
+        self.callbacks += 1
+
+        interrupted_at = None
+        if self._clear_requested:
+            self._clear_requested = False
+            self.ring.clear()
+            self._buffering = True
+            interrupted_at, self._interrupted_at = self._interrupted_at, None
+
+        if self._buffering and (self.ring.available() >= self.prebuffer_samples
+                                or (self._ended and self.ring.available())):
+            self._buffering = False
+
+        count = 0
+        if not self._buffering:
+            count = self.ring.read_into(out)
+            if count < frame_count:
+                self._buffering = True
+                if not self._ended:
+                    self._on_underrun()
+            else:
+                self._on_stable(count)
+        out[count:] = 0
+        if self.reference is not None:
+            self.reference.write(out)
+
+        delay = 0.0
+        if time_info:
+            delay = max(0.0, time_info.get("output_buffer_dac_time", 0.0)
+                        - time_info.get("current_time", 0.0))
+        now = time.perf_counter()
+        if interrupted_at is not None:
+            # 이번 버퍼(무음)가 스피커에 닿는 시각까지
+            self.interrupt_latencies.append(now - interrupted_at + delay)
+        self._last_callback = (now, self.ring._read_pos - count, self.samples_out, delay, count)
+        self.samples_out += count
+        return out.tobytes(), PA_CONTINUE
+
+    def _on_underrun(self) -> None:
+        self.underruns += 1
+        self._stable_samples = 0
+        self.prebuffer_samples = min(
+            self.prebuffer_samples + self._ms_to_samples(PREBUFFER_STEP_MS),
+            self._ms_to_samples(PREBUFFER_MAX_MS),
+        )
+
+    def _on_stable(self, count: int) -> None:
+        self._stable_samples += count
+        if self._stable_samples >= PREBUFFER_DECAY_SECONDS * self.sample_rate:
+            self._stable_samples = 0
+            self.prebuffer_samples = max(
+                self.prebuffer_samples - self._ms_to_samples(PREBUFFER_STEP_MS),
+                self._ms_to_samples(PREBUFFER_MIN_MS),
+            )
+
+    # ----- 상태 -----
+
+    def _played_in_buffer(self) -> int:
+        wall, _, _, delay, count = self._last_callback
+        elapsed = time.perf_counter() - wall - delay
+        return min(count, int(max(0.0, elapsed) * self.sample_rate))
+
+    def played_samples(self) -> int:
+        """스피커에서 실제로 재생된 응답 샘플 수 (누적) 추정치."""
+        return self._last_callback[2] + self._played_in_buffer()
+
+    def position(self) -> int:
+        """지금 스피커에서 나오고 있는 샘플의 위치 (write_position()과 같은 좌표)."""
+        return self._last_callback[1] + self._played_in_buffer()
+
+    def stats(self) -> dict:
+        return {
+            "underruns": self.underruns,
+            "overruns": self.ring.overruns,
+            "dropped_samples": self.ring.dropped_samples,
+            "prebuffer_ms": self.prebuffer_samples * 1000 // self.sample_rate,
+            "queued_ms": self.ring.available() * 1000 // self.sample_rate,
+            "played_samples": self.played_samples(),
+            "interrupts": len(self.interrupt_latencies),
+        }
@@ -0,0 +1,117 @@
+"""
+반향 제거기(EchoCanceller) 프레임당 CPU 시간과 반향 감쇄량 측정
+
+합성 음성 같은 참조 신호(스피커 출력)를 실내 임펄스 응답(직접음 지연 + 지수 감쇠
+잔향)에 통과시켜 마이크 반향을 만들고, 중간에 근단 화자(사용자) 발화를 섞습니다.
+20ms 프레임마다 process()에 걸린 CPU 시간 백분위수(μs)와 실시간 대비 비율,
+구간별 ERLE(dB), 동시 발화 구간에서 근단 음성이 보존된 정도(상관계수)를 JSON으로 출력합니다.
+
+사용법:
+    python -m benchmarks.aec_cpu --seconds 12 --tail-ms 300
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from echo_cancel import EchoCanceller
+from metrics import summarize
+
+SAMPLE_RATE = 24000
+FRAME_SAMPLES = SAMPLE_RATE // 50  # 20ms
+
+
+def speech_like(rng: np.random.Generator, samples: int, level: float) -> np.ndarray:
+    """저역 통과한 잡음을 음절 속도(2.5Hz)로 변조한 음성 대용 신호."""
+    noise = rng.normal(0.0, 1.0, samples)
+    shaped = np.convolve(noise, np.exp(-np.arange(60) / 8.0), "same")
+    envelope = np.sin(2 * np.pi * 2.5 * np.arange(samples) / SAMPLE_RATE) ** 2
+    return shaped / np.max(np.abs(shaped)) * envelope * level
+
+
+def room_response(rng: np.random.Generator, delay_ms: float, gain: float) -> np.ndarray:
+    """delay_ms 뒤 직접음(gain)과 30ms 시정수로 감쇠하는 잔향."""
+    direct = int(delay_ms * SAMPLE_RATE / 1000)
+    length = direct + int(0.12 * SAMPLE_RATE)
+    response = rng.normal(0.0, 1.0, length) * np.exp(-np.arange(length) / (0.03 * SAMPLE_RATE))
+    response *= gain * 0.25
+    response[:direct + 1] = 0.0
+    response[direct] = gain
+    return response
+
+
+def to_pcm(signal: np.ndarray) -> np.ndarray:
+    return (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def erle(mic: np.ndarray, out: np.ndarray) -> Optional[float]:
+    """구간 ERLE(dB). 구간이 비어 있으면 (--seconds가 짧을 때) None → JSON null."""
+    if not len(mic):
+        return None
+    return round(float(10 * np.log10(np.mean(mic ** 2) / (np.mean(out ** 2) + 1e-12))), 1)
+
+
+def run(seconds: float, tail_ms: int, delay_ms: float, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    far = speech_like(rng, total, 0.5)
+    echo = np.convolve(far, room_response(rng, delay_ms, 0.3))[:total]
+    # 뒤에서 1/3 지점부터 2초간 사용자 발화 (동시 발화)
+    talk = slice(max(0, int(total * 2 / 3) - 2 * SAMPLE_RATE), int(total * 2 / 3))
+    near = np.zeros(total)
+    near[talk] = speech_like(rng, talk.stop - talk.start, 1.0)
+    mic = echo + near + rng.normal(0.0, 1e-4, total)
+    mic_pcm, far_pcm = to_pcm(mic), to_pcm(far)
+
+    canceller = EchoCanceller(FRAME_SAMPLES, SAMPLE_RATE, tail_ms=tail_ms)
+    out = np.zeros(total)
+    timings = []
+    for start in range(0, total - FRAME_SAMPLES + 1, FRAME_SAMPLES):
+        frame = slice(start, start + FRAME_SAMPLES)
+        began = time.process_time()
+        cleaned = canceller.process(mic_pcm[frame], far_pcm[frame])
+        timings.append(time.process_time() - began)
+        out[frame] = cleaned / 32768.0
+
+    frame_us = summarize(timings, scale=1e6)
+    second = SAMPLE_RATE
+    after = slice(talk.stop, total)
+    before = slice(max(0, talk.start - 2 * second), talk.start)
+    return {
+        "frame_us": frame_us,
+        "realtime_ratio": frame_us["mean"] / (FRAME_SAMPLES / SAMPLE_RATE * 1e6),
+        "partitions": canceller.partitions,
+        "erle_db": {
+            "first_second": erle(mic[:second], out[:second]),
+            "before_double_talk": erle(mic[before], out[before]),
+            "after_double_talk": erle(mic[after], out[after]),
+        },
+        "near_end_correlation": round(float(np.corrcoef(out[talk], near[talk])[0, 1]), 3),
+        "canceller": canceller.stats(),
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=12.0)
+    parser.add_argument("--tail-ms", type=int, default=300)
+    parser.add_argument("--delay-ms", type=float, default=40.0, help="스피커→마이크 직접음 지연")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = {
+        "seconds": args.seconds,
+        "tail_ms": args.tail_ms,
+        "delay_ms": args.delay_ms,
+        **run(args.seconds, args.tail_ms, args.delay_ms, args.seed),
+    }
+    json.dump(report, sys.stdout, indent=2, default=float)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
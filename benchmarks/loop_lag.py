@@ -0,0 +1,109 @@
+"""
+마이크 입력 방식별 이벤트 루프 지연 비교
+
+실시간 속도로 20ms 프레임을 내는 가상 마이크로 두 방식을 비교합니다.
+- blocking_read: 기존 send_audio 처럼 코루틴 안에서 blocking read 후 10ms sleep
+- callback_capture: 별도 스레드(PyAudio 콜백 대용)가 MicrophoneCapture에 쓰고
+  코루틴은 read_frame()을 await
+
+LoopLagMonitor로 잰 루프 지연 백분위수와 전달된 프레임 수를 JSON으로 출력합니다.
+
+사용법:
+    python -m benchmarks.loop_lag --seconds 5
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+
+from audio_stream import MicrophoneCapture
+from metrics import LoopLagMonitor
+
+SAMPLE_RATE = 24000
+FRAME_SAMPLES = SAMPLE_RATE // 50  # 20ms
+
+
+class VirtualMicrophone:
+    """시작 시각 기준으로 20ms 마다 프레임 하나가 준비되는 가상 마이크입니다."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.frames = 0
+        self._frame = np.zeros(FRAME_SAMPLES, dtype=np.int16).tobytes()
+
+    def read(self) -> bytes:
+        """다음 프레임이 준비될 때까지 막힌 뒤 반환합니다 (pyaudio Stream.read 대용)."""
+        due = self.start + (self.frames + 1) * FRAME_SAMPLES / SAMPLE_RATE
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self.frames += 1
+        return self._frame
+
+    def run_callback(self, callback, stop: threading.Event) -> None:
+        """PortAudio 콜백 스레드처럼 프레임마다 callback을 호출합니다."""
+        while not stop.is_set():
+            data = self.read()
+            callback(data, FRAME_SAMPLES, None, 0)
+
+
+async def blocking_read(seconds: float) -> dict:
+    mic = VirtualMicrophone()
+    monitor = LoopLagMonitor(interval=0.001)
+    monitor.start()
+    sent = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        mic.read()
+        sent += 1
+        await asyncio.sleep(0.01)
+    await monitor.stop()
+    return {"loop_lag_ms": monitor.summary(), "frames_sent": sent, "frames_expected": mic.frames}
+
+
+async def callback_capture(seconds: float) -> dict:
+    mic = VirtualMicrophone()
+    capture = MicrophoneCapture(FRAME_SAMPLES)
+    monitor = LoopLagMonitor(interval=0.001)
+    monitor.start()
+    stop = threading.Event()
+    thread = threading.Thread(target=mic.run_callback, args=(capture.callback, stop), daemon=True)
+    thread.start()
+    sent = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if await capture.read_frame() is None:
+            break
+        sent += 1
+    stop.set()
+    thread.join()
+    await monitor.stop()
+    return {
+        "loop_lag_ms": monitor.summary(),
+        "frames_sent": sent,
+        "frames_expected": mic.frames,
+        "capture": capture.stats(),
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    report = {
+        "seconds": args.seconds,
+        "blocking_read": asyncio.run(blocking_read(args.seconds)),
+        "callback_capture": asyncio.run(callback_capture(args.seconds)),
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,271 @@
+"""
+회원 DB 규모별 성능 벤치마크
+
+합성 회원 CSV(기본 1천 / 10만 / 1천만 행)를 만들어 저장소 백엔드별로
+load_members, 저장소 열기, search_member_by_name, verify_member,
+process_withdrawal, execute_function(검색 → 인증 → 탈퇴 흐름)을 측정하고
+지연 시간 백분위수, 최대 RSS, 파일 I/O 바이트를 JSON으로 출력합니다.
+
+각 (행 수, 백엔드) 조합은 새 프로세스에서 실행되므로 최대 RSS가 서로 섞이지 않으며,
+생성한 CSV는 --data-dir에 남겨 두면 다음 실행(다른 커밋)에서 재사용합니다.
+
+사용법:
+    python -m benchmarks.member_db_bench --rows 1000 100000 --backend csv sqlite \\
+        --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .synthetic import write_members_csv
+
+DEFAULT_ROWS = [1_000, 100_000, 10_000_000]
+# list[dict]로 전부 읽는 load_members는 이 행 수를 넘으면 메모리 때문에 건너뜀
+DEFAULT_MAX_DICT_ROWS = 1_000_000
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile_summary(samples: list[float]) -> dict:
+    """초 단위 측정값들의 백분위수 요약(밀리초)을 반환합니다."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    summary = {"count": len(ordered), "mean_ms": sum(ordered) / len(ordered) * 1000}
+    for p in PERCENTILES:
+        # nearest-rank 방식
+        rank = max(1, -(-p * len(ordered) // 100))
+        summary[f"p{p}_ms"] = ordered[rank - 1] * 1000
+    summary["max_ms"] = ordered[-1] * 1000
+    return summary
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """현재 프로세스의 최대 RSS(바이트)를 반환합니다."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KiB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def io_counters() -> Optional[dict]:
+    """현재 프로세스의 누적 I/O 바이트 (/proc/self/io, Linux 전용)."""
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return None
+
+
+class Phase:
+    """한 측정 구간의 지연 시간, I/O, 최대 RSS를 모읍니다."""
+
+    IO_KEYS = ("rchar", "wchar", "read_bytes", "write_bytes")
+
+    def __init__(self):
+        self.samples: list[float] = []
+        self._io_start = io_counters()
+
+    def time(self, fn: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.samples.append(time.perf_counter() - start)
+        return result
+
+    def report(self, **extra) -> dict:
+        report = {"latency": percentile_summary(self.samples), **extra}
+        io_end = io_counters()
+        if self._io_start is not None and io_end is not None:
+            report["io_bytes"] = {
+                key: io_end.get(key, 0) - self._io_start.get(key, 0) for key in self.IO_KEYS
+            }
+        report["peak_rss_bytes"] = peak_rss_bytes()
+        return report
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def run_case(csv_path: str, rows: int, backend: str, iterations: int, seed: int,
+             max_dict_rows: int) -> dict:
+    """한 (행 수, 백엔드) 조합을 측정합니다. 새 프로세스에서 호출됩니다."""
+    import member_db
+
+    rng = random.Random(seed)
+    width = max(3, len(str(rows)))
+    phases: dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # 쓰기(저널, 스냅샷)가 원본 데이터에 남지 않도록 작업 디렉터리에 연결
+        path = os.path.join(work_dir, "members.csv")
+        _link_or_copy(csv_path, path)
+
+        if rows <= max_dict_rows:
+            phase = Phase()
+            phase.time(member_db.load_members, path)
+            phases["load_members"] = phase.report()
+        else:
+            phases["load_members"] = {"skipped": f"rows > max_dict_rows ({max_dict_rows})"}
+
+        def open_store():
+            if backend == "sqlite":
+                db_path = os.path.join(work_dir, "members.sqlite3")
+                if not os.path.exists(db_path):
+                    member_db.import_csv(path, db_path)
+                store = member_db.SqliteMemberStore(db_path)
+            else:
+                store = member_db.MemberStore(path)
+            store.get("")  # 첫 조회에서 로드/연결
+            return store
+
+        # cold: CSV 파싱(또는 SQLite 가져오기)과 스냅샷 생성, warm: 만들어진 파일 재사용
+        phase = Phase()
+        phase.time(lambda: open_store().close())
+        phases["store_open_cold"] = phase.report()
+        phase = Phase()
+        store = phase.time(open_store)
+        phases["store_open_warm"] = phase.report()
+        member_db.set_store(store)
+
+        sample_ids = [f"M{rng.randrange(1, rows + 1):0{width}d}" for _ in range(iterations)]
+        members = [member for member in map(store.get, sample_ids) if member]
+
+        phase = Phase()
+        for member in members:
+            phase.time(member_db.search_member_by_name, member["name"])
+        for _ in range(max(1, iterations // 10)):
+            phase.time(member_db.search_member_by_name, "없는회원")
+        phases["search_member_by_name"] = phase.report()
+
+        # 성공 / 생년월일 불일치 / 전화번호 불일치를 섞어서 측정
+        phase = Phase()
+        for i, member in enumerate(members):
+            phone, birth = member["phone"][-4:], member["birth_date"]
+            if i % 3 == 1:
+                birth = "1900-01-01"
+            elif i % 3 == 2:
+                phone = f"{(int(phone) + 1) % 10000:04d}"
+            phase.time(member_db.verify_member, member["name"], phone, birth)
+        phases["verify_member"] = phase.report()
+
+        active = [m for m in members if m["status"] == "active"]
+        half = len(active) // 2
+        phase = Phase()
+        for member in active[:half]:
+            phase.time(member_db.process_withdrawal, member["member_id"], reason="benchmark")
+        phases["process_withdrawal"] = phase.report()
+
+        # 음성 세션의 함수 호출 흐름 전체 (search → verify → withdraw)
+        phase = Phase()
+        for member in active[half:]:
+            phase.time(member_db.execute_function, "search_member_by_name",
+                       {"name": member["name"]})
+            phase.time(member_db.execute_function, "verify_member", {
+                "name": member["name"],
+                "phone_last_4": member["phone"][-4:],
+                "birth_date": member["birth_date"],
+            })
+            phase.time(member_db.execute_function, "process_withdrawal",
+                       {"member_id": member["member_id"], "reason": "benchmark"})
+        phases["execute_function"] = phase.report()
+
+        member_db.set_store(None)
+
+    return {
+        "rows": rows,
+        "backend": backend,
+        "iterations": iterations,
+        "phases": phases,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_path(data_dir: str, rows: int, seed: int, withdrawn_ratio: float) -> str:
+    """합성 CSV 경로를 반환하고, 없으면 생성합니다."""
+    path = os.path.join(data_dir, f"members-{rows}-s{seed}-w{withdrawn_ratio:g}.csv")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp"
+        write_members_csv(tmp_path, rows, seed, withdrawn_ratio)
+        os.replace(tmp_path, path)
+    return path
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--backend", nargs="+", choices=("csv", "sqlite"), default=["csv"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--withdrawn-ratio", type=float, default=0.1)
+    parser.add_argument("--max-dict-rows", type=int, default=DEFAULT_MAX_DICT_ROWS)
+    parser.add_argument("--data-dir", help="합성 CSV를 보관/재사용할 디렉터리 (기본: 임시 디렉터리)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "withdrawn_ratio": args.withdrawn_ratio,
+        },
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in args.rows:
+            path = dataset_path(data_dir, rows, args.seed, args.withdrawn_ratio)
+            for backend in args.backend:
+                print(f"[bench] rows={rows} backend={backend}", file=sys.stderr)
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    case = pool.submit(
+                        run_case, path, rows, backend, args.iterations, args.seed,
+                        args.max_dict_rows,
+                    ).result()
+                report["cases"].append(case)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
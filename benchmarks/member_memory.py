@@ -0,0 +1,78 @@
+"""
+회원 데이터 메모리 사용량 비교
+
+load_members()의 list[dict] 표현과 MemberStore의 컬럼 기반 표현(MemberTable +
+인덱스)의 행당 힙 메모리를 tracemalloc으로 측정하고, mmap 으로 공유되는
+바이너리 스냅샷 파일의 행당 크기와 함께 JSON으로 출력합니다.
+
+사용법:
+    python -m benchmarks.member_memory --rows 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from member_db import MemberStore, load_members, read_member_table
+
+from .synthetic import write_members_csv
+
+
+def measure(fn) -> tuple[object, int]:
+    """fn()이 반환한 객체가 유지하는 메모리(바이트)를 측정합니다."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_members_csv(os.path.join(tmp, "members.csv"), args.rows, args.seed)
+
+        members, dict_bytes = measure(lambda: load_members(path))
+        del members
+
+        def load_store():
+            store = MemberStore(path, use_snapshot=False)
+            store.reload()
+            return store
+
+        store, store_bytes = measure(load_store)
+        table_bytes = measure(lambda: read_member_table(path))[1]
+        store.close()
+
+        snapshot_store = MemberStore(path)
+        snapshot_store.reload()
+        snapshot_bytes = os.path.getsize(snapshot_store.snapshot_path)
+        snapshot_store.close()
+
+    report = {
+        "rows": args.rows,
+        "list_of_dicts": {"bytes": dict_bytes, "bytes_per_row": dict_bytes / args.rows},
+        "member_table": {"bytes": table_bytes, "bytes_per_row": table_bytes / args.rows},
+        "member_store_with_indexes": {
+            "bytes": store_bytes, "bytes_per_row": store_bytes / args.rows,
+        },
+        "mmap_snapshot_file": {
+            "bytes": snapshot_bytes, "bytes_per_row": snapshot_bytes / args.rows,
+        },
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
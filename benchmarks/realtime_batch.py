@@ -0,0 +1,117 @@
+"""
+CLI 클라이언트 배치 벤치마크 (오디오 장치 없이 WAV 파일 입력 → 대역 서버)
+
+RealtimeClient를 WavFileIO 드라이버로 실행해, 사용자 발화 WAV 파일들을 마이크 입력으로
+차례로 흘려 보내고 응답 음성을 WAV로 녹음합니다. --server를 주지 않으면 로컬 대역 서버
+(benchmarks.standin_server)를 별도 스레드에서 띄워 접속합니다. 입력 파일이 없으면
+--synthetic 개의 합성 발화를 사용합니다.
+
+끝나면 턴별 지연 히스토그램(발화 끝 대비 응답 시작/첫 응답 음성/재생 완료 등),
+재생 끊김, 업링크, 이벤트 루프 지연을 JSON으로 출력합니다. 클라이언트의 콘솔 출력은
+stderr로 보냅니다.
+
+사용법:
+    python -m benchmarks.realtime_batch --synthetic 6 --speed 4 --output /tmp/batch.wav
+    python -m benchmarks.realtime_batch utterance1.wav utterance2.wav --speed 1 \\
+        --server ws://127.0.0.1:8765/v1
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+import time
+
+import numpy as np
+
+from audio_io import WavFileIO
+from benchmarks.aec_cpu import speech_like
+from benchmarks.standin_server import StandInServerThread, add_options, options_from_args
+from realtime_client import SAMPLE_RATE, RealtimeClient
+
+UTTERANCE_SECONDS = 1.5
+
+
+def synthetic_utterances(count: int, seed: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed + 1)
+    samples = int(UTTERANCE_SECONDS * SAMPLE_RATE)
+    return [(speech_like(rng, samples, 0.5) * 32767).astype(np.int16) for _ in range(count)]
+
+
+async def run_batch(client: RealtimeClient, audio_io: WavFileIO, timeout: float) -> bool:
+    """모든 입력을 재생하고 마지막 응답까지 끝나면 True (시간 초과나 클라이언트 종료면 False)."""
+    task = asyncio.create_task(client.run())
+    deadline = time.perf_counter() + timeout
+    while not audio_io.finished.is_set() and not task.done():
+        if time.perf_counter() > deadline:
+            break
+        await asyncio.sleep(0.1)
+    completed = audio_io.finished.is_set()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return completed
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="*", help="사용자 발화 WAV 파일 (PCM16)")
+    parser.add_argument("--synthetic", type=int, default=4,
+                        help="입력 파일이 없을 때 쓸 합성 발화 수")
+    parser.add_argument("--speed", type=float, default=1.0, help="실시간 대비 진행 배속")
+    parser.add_argument("--output", default="batch_output.wav", help="응답 음성 녹음 WAV")
+    parser.add_argument("--server", help="접속할 서버 (기본: 로컬 대역 서버를 띄움)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="전체 제한 시간(초)")
+    parser.add_argument("--full-duplex", action="store_true", help="반향 제거 모드로 실행")
+    add_options(parser)
+    args = parser.parse_args(argv)
+
+    inputs = args.inputs or synthetic_utterances(args.synthetic, args.seed)
+    server = None
+    url = args.server
+    if url is None:
+        server = StandInServerThread(options_from_args(args))
+        url = server.start()
+
+    audio_io = WavFileIO(inputs, output_path=args.output, speed=args.speed)
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            client = RealtimeClient("standin", full_duplex=args.full_duplex,
+                                    audio_io=audio_io, websocket_base_url=url)
+            completed = asyncio.run(run_batch(client, audio_io, args.timeout))
+    finally:
+        if server is not None:
+            server.stop()
+    elapsed = time.perf_counter() - started
+
+    playback = client.playback.stats()
+    uplink = client.uplink.stats()
+    report = {
+        "server": args.server or "standin",
+        "inputs": len(inputs),
+        "speed": args.speed,
+        "completed": completed,
+        "wall_seconds": round(elapsed, 2),
+        "audio_seconds": round(audio_io.media_ms() / 1000, 2),
+        "reply_timeouts": audio_io.reply_timeouts,
+        "late_frames": audio_io.late_frames,
+        "turns": client.tracer.turns,
+        "interrupted_turns": client.tracer.interrupted,
+        "turn_latency_ms": {name: {key: round(value, 1) for key, value in stats.items()}
+                            for name, stats in client.tracer.summary().items()},
+        "underruns": playback["underruns"],
+        "prebuffer_ms": playback["prebuffer_ms"],
+        "uplink_messages_per_sec": round(uplink["messages_per_sec"], 1),
+        "loop_lag_ms": {key: round(value, 2) for key, value in client.loop_lag.summary().items()},
+        "output": args.output,
+    }
+    json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0 if completed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,137 @@
+"""
+브라우저 입력 리샘플링 방식별 품질(SNR, 앨리어싱)과 처리량 비교
+
+48kHz → 24kHz를 20ms 청크 단위 스트리밍으로 변환합니다.
+
+- nearest: 기존 방식. 청크마다 np.linspace로 가장 가까운 입력 샘플을 고름
+- polyphase: PolyphaseResampler (필터 상태 유지, 다위상 필터 뱅크)
+
+품질: 통과 대역 사인파(--tones)의 이상적인 24kHz 신호 대비 SNR(dB)과, 출력 나이퀴스트
+(12kHz)를 넘는 사인파(--alias-tones)가 접혀 들어온 에너지(입력 대비 dB, 낮을수록 좋음).
+처리량: 한 세션 스트리밍의 청크당 시간(μs)과 실시간 대비 배율, --sessions 개 세션을
+세션별로 따로 변환할 때와 배치 모드(2차원 입력 한 번)로 변환할 때의 배율을 JSON으로 출력합니다.
+
+사용법:
+    python -m benchmarks.resampler --seconds 10 --sessions 64
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from resample import PolyphaseResampler
+
+IN_RATE = 48000
+OUT_RATE = 24000
+CHUNK = IN_RATE // 50  # 20ms
+
+
+def nearest(chunk: np.ndarray, in_rate: int = IN_RATE, out_rate: int = OUT_RATE) -> np.ndarray:
+    """기존 GradioRealtimeHandler.send_audio_chunk의 리샘플링."""
+    duration = len(chunk) / in_rate
+    num_samples = int(duration * out_rate)
+    indices = np.linspace(0, len(chunk) - 1, num_samples).astype(int)
+    return chunk[indices]
+
+
+def stream(method: str, signal: np.ndarray) -> tuple[np.ndarray, float]:
+    """청크 단위로 변환한 출력과 출력 지연(초)."""
+    if method == "nearest":
+        return np.concatenate([nearest(signal[i:i + CHUNK])
+                               for i in range(0, len(signal), CHUNK)]), 0.0
+    resampler = PolyphaseResampler(IN_RATE, OUT_RATE)
+    return np.concatenate([resampler.process(signal[i:i + CHUNK])
+                           for i in range(0, len(signal), CHUNK)]), resampler.delay_seconds
+
+
+def tone(freq: float, seconds: float) -> np.ndarray:
+    return (np.sin(2 * np.pi * freq * np.arange(int(seconds * IN_RATE)) / IN_RATE)
+            * 0.5).astype(np.float32)
+
+
+def snr_db(method: str, freq: float) -> float:
+    out, delay = stream(method, tone(freq, 1.0))
+    t = np.arange(len(out)) / OUT_RATE - delay
+    ideal = np.sin(2 * np.pi * freq * t) * 0.5
+    edge = OUT_RATE // 20  # 필터 시작/끝 구간 제외
+    error = out[edge:-edge] - ideal[edge:-edge]
+    return round(float(10 * np.log10(np.sum(ideal[edge:-edge] ** 2) / np.sum(error ** 2))), 1)
+
+
+def alias_db(method: str, freq: float) -> float:
+    signal = tone(freq, 1.0)
+    out, _ = stream(method, signal)
+    edge = OUT_RATE // 20
+    ratio = np.mean(out[edge:-edge].astype(np.float64) ** 2) / np.mean(signal.astype(np.float64) ** 2)
+    return round(float(10 * np.log10(ratio + 1e-20)), 1)
+
+
+def speech_pcm(seconds: float, sessions: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(-8000, 8000, (sessions, int(seconds * IN_RATE)), dtype=np.int16)
+
+
+def realtime_factor(seconds: float, elapsed: float, sessions: int = 1) -> float:
+    return round(seconds * sessions / elapsed, 1)
+
+
+def throughput(seconds: float, sessions: int) -> dict:
+    pcm = speech_pcm(seconds)[0]
+    chunks = [pcm[i:i + CHUNK] for i in range(0, len(pcm), CHUNK)]
+    report = {}
+    for method in ("nearest", "polyphase"):
+        resampler = PolyphaseResampler(IN_RATE, OUT_RATE)
+        convert = nearest if method == "nearest" else resampler.process
+        started = time.perf_counter()
+        for chunk in chunks:
+            convert(chunk)
+        elapsed = time.perf_counter() - started
+        report[method] = {
+            "chunk_us": round(elapsed * 1e6 / len(chunks), 1),
+            "realtime_factor": realtime_factor(seconds, elapsed),
+        }
+
+    batch_pcm = speech_pcm(seconds, sessions)
+    resamplers = [PolyphaseResampler(IN_RATE, OUT_RATE) for _ in range(sessions)]
+    started = time.perf_counter()
+    for i in range(0, batch_pcm.shape[1], CHUNK):
+        for k, resampler in enumerate(resamplers):
+            resampler.process(batch_pcm[k, i:i + CHUNK])
+    separate = time.perf_counter() - started
+    batch = PolyphaseResampler(IN_RATE, OUT_RATE)
+    started = time.perf_counter()
+    for i in range(0, batch_pcm.shape[1], CHUNK):
+        batch.process(batch_pcm[:, i:i + CHUNK])
+    batched = time.perf_counter() - started
+    report["sessions"] = sessions
+    report["polyphase_per_session_realtime_factor"] = realtime_factor(seconds, separate, sessions)
+    report["polyphase_batch_realtime_factor"] = realtime_factor(seconds, batched, sessions)
+    return report
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="처리량 측정용 오디오 길이")
+    parser.add_argument("--sessions", type=int, default=64, help="배치 모드 세션 수")
+    parser.add_argument("--tones", type=float, nargs="+",
+                        default=[200.0, 1000.0, 3000.0, 6000.0, 9000.0])
+    parser.add_argument("--alias-tones", type=float, nargs="+",
+                        default=[13000.0, 16000.0, 20000.0])
+    args = parser.parse_args(argv)
+
+    report = {"in_rate": IN_RATE, "out_rate": OUT_RATE, "chunk_ms": 20}
+    for method in ("nearest", "polyphase"):
+        report[method] = {
+            "snr_db": {str(int(f)): snr_db(method, f) for f in args.tones},
+            "alias_db": {str(int(f)): alias_db(method, f) for f in args.alias_tones},
+        }
+    report["throughput"] = throughput(args.seconds, args.sessions)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,334 @@
+"""
+Real-time API 대역(stand-in) 웹소켓 서버
+
+실제 API 대신 로컬에서 클라이언트가 쓰는 이벤트만 흉내 내, 배치 벤치마크를 API 비용과
+네트워크 변동 없이 반복할 수 있게 합니다.
+
+- session.update → session.updated
+- input_audio_buffer.append: 20ms 단위 RMS로 발화를 검출해 speech_started / speech_stopped
+  (세션의 silence_duration_ms 기준), committed, 사용자 항목 생성, 받아쓰기 완료를 보냄
+- 발화가 끝나거나 response.create를 받으면 응답을 생성: --first-audio-ms 뒤 합성 음성
+  (--reply-seconds 길이)을 100ms 조각으로 실시간의 --burst 배 속도로 보냄.
+  --tool-every N이면 N번째 사용자 발화마다 먼저 search_member_by_name 함수 호출을 냄
+- response.cancel, conversation.item.create / truncate, input_audio_buffer.clear 처리
+
+사용법:
+    python -m benchmarks.standin_server --port 8765 --first-audio-ms 300 --reply-seconds 2
+    # 클라이언트: RealtimeClient(..., websocket_base_url="ws://127.0.0.1:8765/v1")
+"""
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import websockets
+
+from benchmarks.aec_cpu import speech_like
+
+SAMPLE_RATE = 24000
+VAD_FRAME_SAMPLES = SAMPLE_RATE // 50  # 20ms
+SPEECH_RMS = 300
+DEFAULT_SILENCE_MS = 500
+CHUNK_MS = 100
+
+
+@dataclass
+class StandInOptions:
+    first_audio_ms: float = 300.0
+    transcribe_ms: float = 150.0
+    reply_seconds: float = 2.0
+    burst: float = 4.0
+    tool_every: int = 2
+    seed: int = 0
+
+
+def _id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:20]}"
+
+
+class StandInSession:
+    """웹소켓 연결 하나의 세션 상태 (발화 검출, 대화 항목, 진행 중인 응답)."""
+
+    def __init__(self, websocket, options: StandInOptions, reply_audio: np.ndarray):
+        self.websocket = websocket
+        self.options = options
+        self.reply_audio = reply_audio
+        self.session = {"id": _id("sess"), "object": "realtime.session", "turn_detection": None}
+        self.silence_ms = DEFAULT_SILENCE_MS
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._audio_ms = 0.0
+        self._speech_item: Optional[str] = None
+        self._silent_ms = 0.0
+        self._last_item: Optional[str] = None
+        self._response: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+        self.user_turns = 0
+        self._tool_pending = False
+
+    async def send(self, event_type: str, **fields) -> None:
+        await self.websocket.send(json.dumps({"event_id": _id("event"), "type": event_type, **fields}))
+
+    async def run(self) -> None:
+        try:
+            await self.send("session.created", session=self.session)
+            async for message in self.websocket:
+                await self.dispatch(json.loads(message))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def dispatch(self, event: dict) -> None:
+        kind = event.get("type")
+        if kind == "session.update":
+            self.session.update(event.get("session", {}))
+            detection = self.session.get("turn_detection") or {}
+            self.silence_ms = detection.get("silence_duration_ms", DEFAULT_SILENCE_MS)
+            await self.send("session.updated", session=self.session)
+        elif kind == "input_audio_buffer.append":
+            await self._feed(np.frombuffer(base64.b64decode(event["audio"]), dtype=np.int16))
+        elif kind == "input_audio_buffer.clear":
+            self._pending = np.zeros(0, dtype=np.int16)
+            self._speech_item = None
+            await self.send("input_audio_buffer.cleared")
+        elif kind == "conversation.item.create":
+            item = dict(event["item"])
+            item.setdefault("id", _id("item"))
+            item.setdefault("status", "completed")
+            await self._item_created(item)
+        elif kind == "conversation.item.truncate":
+            await self.send("conversation.item.truncated", item_id=event["item_id"],
+                            content_index=event.get("content_index", 0),
+                            audio_end_ms=event["audio_end_ms"])
+        elif kind == "response.create":
+            self._start_response()
+        elif kind == "response.cancel":
+            if self._response is not None and not self._response.done():
+                self._response.cancel()
+            else:
+                await self.send("error", error={
+                    "type": "invalid_request_error",
+                    "code": "response_cancel_not_active",
+                    "message": "Cancellation failed: no active response found.",
+                    "param": None,
+                    "event_id": event.get("event_id"),
+                })
+
+    async def _item_created(self, item: dict) -> None:
+        await self.send("conversation.item.created", previous_item_id=self._last_item, item=item)
+        self._last_item = item["id"]
+
+    async def _feed(self, samples: np.ndarray) -> None:
+        """20ms 단위로 발화 시작/끝을 검출합니다 (오디오 시간 기준)."""
+        self._pending = np.concatenate((self._pending, samples))
+        frame_ms = VAD_FRAME_SAMPLES * 1000 / SAMPLE_RATE
+        while len(self._pending) >= VAD_FRAME_SAMPLES:
+            frame = self._pending[:VAD_FRAME_SAMPLES].astype(np.float64)
+            self._pending = self._pending[VAD_FRAME_SAMPLES:]
+            self._audio_ms += frame_ms
+            speech = np.sqrt(np.mean(frame * frame)) > SPEECH_RMS
+            if self._speech_item is None:
+                if speech:
+                    self._speech_item = _id("item")
+                    self._silent_ms = 0.0
+                    await self.send("input_audio_buffer.speech_started",
+                                    audio_start_ms=int(self._audio_ms - frame_ms),
+                                    item_id=self._speech_item)
+            elif speech:
+                self._silent_ms = 0.0
+            else:
+                self._silent_ms += frame_ms
+                if self._silent_ms >= self.silence_ms:
+                    await self._end_of_speech()
+
+    async def _end_of_speech(self) -> None:
+        item_id, self._speech_item = self._speech_item, None
+        self.user_turns += 1
+        await self.send("input_audio_buffer.speech_stopped",
+                        audio_end_ms=int(self._audio_ms), item_id=item_id)
+        await self.send("input_audio_buffer.committed",
+                        previous_item_id=self._last_item, item_id=item_id)
+        await self._item_created({
+            "id": item_id, "object": "realtime.item", "type": "message", "role": "user",
+            "status": "completed",
+            "content": [{"type": "input_audio", "transcript": None}],
+        })
+        self._spawn(self._transcribe(item_id, self.user_turns))
+        self._tool_pending = (self.options.tool_every > 0
+                              and self.user_turns % self.options.tool_every == 0)
+        self._start_response()
+
+    async def _transcribe(self, item_id: str, turn: int) -> None:
+        await asyncio.sleep(self.options.transcribe_ms / 1000)
+        await self.send("conversation.item.input_audio_transcription.completed",
+                        item_id=item_id, content_index=0,
+                        transcript=f"사용자 발화 {turn}")
+
+    def _start_response(self) -> None:
+        if self._response is not None and not self._response.done():
+            self._response.cancel()
+        self._response = self._spawn(self._respond())
+
+    async def _respond(self) -> None:
+        response = {"id": _id("resp"), "object": "realtime.response",
+                    "status": "in_progress", "output": []}
+        await self.send("response.created", response=response)
+        try:
+            await asyncio.sleep(self.options.first_audio_ms / 1000)
+            if self._tool_pending:
+                self._tool_pending = False
+                await self._function_call(response["id"])
+            else:
+                await self._audio_reply(response["id"])
+            response["status"] = "completed"
+        except asyncio.CancelledError:
+            response["status"] = "cancelled"
+            await self.send("response.done", response=response)
+            raise
+        await self.send("response.done", response=response)
+
+    async def _function_call(self, response_id: str) -> None:
+        arguments = json.dumps({"name": "김철수"}, ensure_ascii=False)
+        item = {"id": _id("item"), "object": "realtime.item", "type": "function_call",
+                "status": "in_progress", "call_id": _id("call"),
+                "name": "search_member_by_name", "arguments": ""}
+        await self.send("response.output_item.added", response_id=response_id,
+                        output_index=0, item=item)
+        await self._item_created(item)
+        await self.send("response.function_call_arguments.done", response_id=response_id,
+                        item_id=item["id"], output_index=0, call_id=item["call_id"],
+                        name=item["name"], arguments=arguments)
+        item = dict(item, status="completed", arguments=arguments)
+        await self.send("response.output_item.done", response_id=response_id,
+                        output_index=0, item=item)
+
+    async def _audio_reply(self, response_id: str) -> None:
+        transcript = "네, 확인해 드리겠습니다."
+        item = {"id": _id("item"), "object": "realtime.item", "type": "message",
+                "role": "assistant", "status": "in_progress", "content": []}
+        await self.send("response.output_item.added", response_id=response_id,
+                        output_index=0, item=item)
+        await self._item_created(item)
+        location = {"response_id": response_id, "item_id": item["id"],
+                    "output_index": 0, "content_index": 0}
+        await self.send("response.audio_transcript.delta", delta=transcript, **location)
+        chunk = SAMPLE_RATE * CHUNK_MS // 1000
+        for start in range(0, len(self.reply_audio), chunk):
+            delta = base64.b64encode(self.reply_audio[start:start + chunk].tobytes()).decode("ascii")
+            await self.send("response.audio.delta", delta=delta, **location)
+            await asyncio.sleep(CHUNK_MS / 1000 / self.options.burst)
+        await self.send("response.audio.done", **location)
+        await self.send("response.audio_transcript.done", transcript=transcript, **location)
+        item = dict(item, status="completed",
+                    content=[{"type": "audio", "transcript": transcript}])
+        await self.send("response.output_item.done", response_id=response_id,
+                        output_index=0, item=item)
+
+
+def reply_waveform(options: StandInOptions) -> np.ndarray:
+    rng = np.random.default_rng(options.seed)
+    samples = int(options.reply_seconds * SAMPLE_RATE)
+    return (speech_like(rng, samples, 0.3) * 32767).astype(np.int16)
+
+
+async def serve(host: str, port: int, options: StandInOptions):
+    """대역 서버를 시작하고 websockets 서버 객체를 반환합니다 (port=0이면 빈 포트)."""
+    reply_audio = reply_waveform(options)
+
+    async def handler(websocket, path=None):
+        await StandInSession(websocket, options, reply_audio).run()
+
+    return await websockets.serve(handler, host, port, max_size=None)
+
+
+class StandInServerThread:
+    """
+    대역 서버를 별도 스레드의 이벤트 루프에서 실행합니다.
+
+    벤치마크 대상 클라이언트와 이벤트 루프를 나눠, 서버 처리 시간이 클라이언트의
+    루프 지연 측정에 섞이지 않게 합니다.
+    """
+
+    def __init__(self, options: StandInOptions, host: str = "127.0.0.1"):
+        self.options = options
+        self.host = host
+        self.url: Optional[str] = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="standin-server", daemon=True)
+        self._server = None
+
+    def start(self) -> str:
+        self._thread.start()
+        self._ready.wait()
+        return self.url
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(serve(self.host, 0, self.options))
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://{self.host}:{port}/v1"
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def add_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--first-audio-ms", type=float, default=300.0,
+                        help="응답 생성 시작부터 첫 음성(또는 함수 호출)까지 지연")
+    parser.add_argument("--transcribe-ms", type=float, default=150.0,
+                        help="발화 끝부터 받아쓰기 완료까지 지연")
+    parser.add_argument("--reply-seconds", type=float, default=2.0, help="응답 음성 길이")
+    parser.add_argument("--burst", type=float, default=4.0,
+                        help="응답 음성을 실시간의 몇 배 속도로 보낼지")
+    parser.add_argument("--tool-every", type=int, default=2,
+                        help="N번째 사용자 발화마다 함수 호출 (0 = 안 함)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def options_from_args(args) -> StandInOptions:
+    return StandInOptions(first_audio_ms=args.first_audio_ms, transcribe_ms=args.transcribe_ms,
+                          reply_seconds=args.reply_seconds, burst=args.burst,
+                          tool_every=args.tool_every, seed=args.seed)
+
+
+async def _serve_forever(host: str, port: int, options: StandInOptions) -> None:
+    server = await serve(host, port, options)
+    print(f"대역 서버 실행 중: ws://{host}:{port}/v1 (종료: Ctrl+C)")
+    await server.wait_closed()
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_options(parser)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve_forever(args.host, args.port, options_from_args(args)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""
+벤치마크용 합성 회원 데이터 생성기
+
+실제 분포처럼 성씨가 편중되어 '김철수' 같은 동명이인이 많이 생기도록 만듭니다.
+"""
+import csv
+import random
+from datetime import date, timedelta
+from typing import Iterator
+
+from member_db import MEMBER_FIELDS
+
+# (성씨, 가중치) — 대략적인 인구 비율
+SURNAMES = [
+    ("김", 21.5), ("이", 14.7), ("박", 8.4), ("최", 4.7), ("정", 4.3),
+    ("강", 2.4), ("조", 2.1), ("윤", 2.1), ("장", 2.0), ("임", 1.7),
+    ("한", 1.5), ("오", 1.5), ("서", 1.5), ("신", 1.4), ("권", 1.4),
+]
+GIVEN_NAMES = [
+    "철수", "영희", "민수", "수진", "호준", "미래", "서연", "재현", "소영", "동건",
+    "지훈", "지민", "현우", "서준", "민준", "하은", "지우", "예준", "도윤", "서윤",
+    "민서", "지호", "유진", "준호", "은지", "성민", "혜진", "상훈", "지영", "영수",
+]
+
+_BIRTH_START = date(1950, 1, 1)
+_BIRTH_DAYS = (date(2005, 12, 31) - _BIRTH_START).days
+_REGISTERED_START = date(2015, 1, 1)
+_REGISTERED_DAYS = (date(2024, 12, 31) - _REGISTERED_START).days
+
+
+def generate_members(count: int, seed: int = 0, withdrawn_ratio: float = 0.1) -> Iterator[dict]:
+    """합성 회원 count명을 생성합니다."""
+    rng = random.Random(seed)
+    surnames = [s for s, _ in SURNAMES]
+    weights = [w for _, w in SURNAMES]
+    width = max(3, len(str(count)))
+    # 전화번호 중간/뒷자리가 겹치지 않도록 섞인 순번을 사용
+    phone_numbers = rng.sample(range(100_000_000), count)
+
+    for i in range(count):
+        name = rng.choices(surnames, weights)[0] + rng.choice(GIVEN_NAMES)
+        phone = phone_numbers[i]
+        birth = _BIRTH_START + timedelta(days=rng.randrange(_BIRTH_DAYS))
+        registered = _REGISTERED_START + timedelta(days=rng.randrange(_REGISTERED_DAYS))
+        yield {
+            "member_id": f"M{i + 1:0{width}d}",
+            "name": name,
+            "phone": f"010-{phone // 10000:04d}-{phone % 10000:04d}",
+            "email": f"user{i + 1}@example.com",
+            "birth_date": birth.isoformat(),
+            "registered_at": registered.isoformat(),
+            "status": "withdrawn" if rng.random() < withdrawn_ratio else "active",
+        }
+
+
+def write_members_csv(path: str, count: int, seed: int = 0, withdrawn_ratio: float = 0.1) -> str:
+    """합성 회원 CSV를 path에 기록하고 경로를 반환합니다."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=MEMBER_FIELDS)
+        writer.writeheader()
+        writer.writerows(generate_members(count, seed, withdrawn_ratio))
+    return path
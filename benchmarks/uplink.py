@@ -0,0 +1,93 @@
+"""
+업링크 패킷 길이별 메시지 수와 전송 CPU 비용 비교
+
+마이크처럼 20ms 프레임을 AudioUplink에 넣고, 가상 연결이 실제 SDK처럼 이벤트를
+JSON으로 직렬화한 뒤 대역폭(--kbps)과 메시지당 처리 시간(--per-message-ms)만큼
+전송 시간을 흉내 냅니다. 패킷 길이(20ms 고정 = 기존 방식, 40/100/200ms 고정, auto)별로
+초당 메시지/바이트 수, 오디오 1초당 CPU 시간(ms), 최종 패킷 길이를 JSON으로 출력합니다.
+
+사용법:
+    python -m benchmarks.uplink --seconds 20 --kbps 1000 --per-message-ms 0.5
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from uplink import AudioUplink
+
+SAMPLE_RATE = 24000
+FRAME_SAMPLES = SAMPLE_RATE // 50  # 20ms
+
+
+class VirtualConnection:
+    """input_audio_buffer.append를 JSON 직렬화 + 링크 전송 시간으로 흉내 냅니다."""
+
+    def __init__(self, kbps: float, per_message_ms: float):
+        self.input_audio_buffer = self
+        self.bytes_per_sec = kbps * 1000 / 8
+        self.per_message = per_message_ms / 1000
+        self.serialize_cpu = 0.0
+
+    async def append(self, audio: str) -> None:
+        started = time.process_time()
+        wire = json.dumps({"type": "input_audio_buffer.append", "audio": audio})
+        self.serialize_cpu += time.process_time() - started
+        await asyncio.sleep(self.per_message + len(wire) / self.bytes_per_sec)
+
+
+async def run_case(packet_ms, seconds: float, kbps: float, per_message_ms: float) -> dict:
+    connection = VirtualConnection(kbps, per_message_ms)
+    uplink = AudioUplink(SAMPLE_RATE, packet_ms=packet_ms)
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(-3000, 3000, FRAME_SAMPLES, dtype=np.int16)
+              for _ in range(50)]
+    total = int(seconds * 50)
+    frame_time = FRAME_SAMPLES / SAMPLE_RATE
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for i in range(total):
+        # 실시간보다 밀린 입력 = 적체
+        backlog = max(0.0, time.perf_counter() - start - i * frame_time)
+        await uplink.send(connection, frames[i % len(frames)], backlog=backlog)
+        delay = start + (i + 1) * frame_time - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    await uplink.flush(connection)
+    cpu = time.process_time() - cpu_start
+    stats = uplink.stats()
+    return {
+        "messages": stats["messages"],
+        "messages_per_sec": round(stats["messages_per_sec"], 1),
+        "bytes_per_sec": round(stats["bytes_per_sec"]),
+        "cpu_ms_per_audio_sec": round(cpu * 1000 / seconds, 2),
+        "serialize_ms_per_audio_sec": round(connection.serialize_cpu * 1000 / seconds, 2),
+        "final_packet_ms": stats["packet_ms"],
+        "send_ms_p99": round(stats["send_ms"].get("p99", 0.0), 2),
+        "lag_ms": round((time.perf_counter() - start - seconds) * 1000, 1),
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--kbps", type=float, default=1000.0, help="가상 업링크 대역폭")
+    parser.add_argument("--per-message-ms", type=float, default=0.5,
+                        help="메시지당 고정 처리 시간 (프레이밍, 서버 처리 등)")
+    args = parser.parse_args(argv)
+
+    report = {"seconds": args.seconds, "kbps": args.kbps, "per_message_ms": args.per_message_ms}
+    for packet_ms in (20, 40, 100, 200, None):
+        name = "auto" if packet_ms is None else f"{packet_ms}ms"
+        report[name] = asyncio.run(run_case(packet_ms, args.seconds, args.kbps,
+                                            args.per_message_ms))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+"""
+WebRTC 출력 프레이밍 방식별 프레임당 할당과 시간 비교
+
+응답 음성(PCM16 24kHz)을 delta 조각으로 나눠 40ms(960샘플) WebRTC 프레임으로 자릅니다.
+
+- bytearray: 기존 방식. 조각을 bytearray에 이어 붙이고 프레임마다 bytes()로 복사한 뒤
+  남은 버퍼를 잘라 새로 만듦 (조각이 길수록 남은 버퍼 복사가 제곱으로 늘어남)
+- ring: FrameRing. 미리 할당한 링에 한 번 복사하고 프레임은 NumPy 뷰로 내줌
+
+응답 길이(--seconds)와 조각 길이(--delta-ms, 0 = 응답 전체가 한 조각)별로
+프레임당 시간(μs), 큐에 쌓인 프레임이 붙잡고 있는 할당 블록 수/바이트,
+프레이밍 중 최대 추가 메모리(KB)를 JSON으로 출력합니다.
+
+사용법:
+    python -m benchmarks.webrtc_framing --seconds 2 5 10 --delta-ms 100 1000 0
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from audio_stream import FrameRing
+
+SAMPLE_RATE = 24000
+FRAME_SAMPLES = 960
+QUEUE_FRAMES = 300
+
+
+class BytearrayFraming:
+    """기존 GradioRealtimeHandler._enqueue_audio_frames와 같은 방식."""
+
+    def __init__(self):
+        self._pcm_buffer = bytearray()
+        self._position = 0
+
+    def feed(self, audio_bytes: bytes, out: list) -> None:
+        self._pcm_buffer.extend(audio_bytes)
+        frame_bytes = FRAME_SAMPLES * 2
+        while len(self._pcm_buffer) >= frame_bytes:
+            chunk = bytes(self._pcm_buffer[:frame_bytes])
+            self._pcm_buffer = self._pcm_buffer[frame_bytes:]
+            frame_array = np.frombuffer(chunk, dtype=np.int16).reshape(1, -1)
+            out.append((self._position, (SAMPLE_RATE, frame_array)))
+            self._position += FRAME_SAMPLES
+
+
+class RingFraming:
+    """FrameRing 뷰로 프레임을 내주는 방식."""
+
+    def __init__(self, frames: int):
+        self._ring = FrameRing(FRAME_SAMPLES, frames)
+        self._position = 0
+
+    def feed(self, audio_bytes: bytes, out: list) -> None:
+        for frame in self._ring.feed(np.frombuffer(audio_bytes, dtype=np.int16)):
+            out.append((self._position, (SAMPLE_RATE, frame)))
+            self._position += FRAME_SAMPLES
+
+
+def make_deltas(seconds: float, delta_ms: int) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-8000, 8000, int(seconds * SAMPLE_RATE), dtype=np.int16).tobytes()
+    step = len(pcm) if delta_ms <= 0 else SAMPLE_RATE * delta_ms // 1000 * 2
+    return [pcm[i:i + step] for i in range(0, len(pcm), step)]
+
+
+def make_framer(method: str, frames: int):
+    return BytearrayFraming() if method == "bytearray" else RingFraming(frames)
+
+
+def measure(method: str, deltas: list[bytes], repeats: int) -> dict:
+    total_samples = sum(len(d) for d in deltas) // 2
+    # 링은 응답 전체를 큐에 쌓아 둬도 덮어쓰지 않을 만큼 (실제 핸들러는 큐 길이 + 여분)
+    ring_frames = max(QUEUE_FRAMES, total_samples // FRAME_SAMPLES + 2)
+
+    timings = []
+    for _ in range(repeats):
+        framer = make_framer(method, ring_frames)
+        frames: list = []
+        started = time.perf_counter()
+        for delta in deltas:
+            framer.feed(delta, frames)
+        timings.append(time.perf_counter() - started)
+    count = len(frames)
+    del frames, framer
+
+    # 할당: 프레임을 큐처럼 붙잡아 둔 채로 증가한 블록/바이트와 최대 추가 메모리
+    gc.collect()
+    framer = make_framer(method, ring_frames)
+    frames = []
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    for delta in deltas:
+        framer.feed(delta, frames)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks_before
+    return {
+        "frames": count,
+        "frame_us": round(min(timings) * 1e6 / count, 2),
+        "response_ms": round(min(timings) * 1000, 2),
+        "blocks_per_frame": round(blocks / count, 2),
+        "bytes_per_frame": round(current / count, 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, nargs="+", default=[2.0, 5.0, 10.0],
+                        help="응답 음성 길이(초)")
+    parser.add_argument("--delta-ms", type=int, nargs="+", default=[100, 1000, 0],
+                        help="delta 조각 길이(ms), 0 = 응답 전체가 한 조각")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    report = {"frame_samples": FRAME_SAMPLES, "cases": []}
+    for seconds in args.seconds:
+        for delta_ms in args.delta_ms:
+            deltas = make_deltas(seconds, delta_ms)
+            case = {"seconds": seconds, "delta_ms": delta_ms}
+            for method in ("bytearray", "ring"):
+                case[method] = measure(method, deltas, args.repeats)
+            report["cases"].append(case)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,114 @@
+"""
+주파수 영역 NLMS 음향 반향 제거기 (AEC)
+
+스피커로 나간 응답 음성(참조 신호)이 마이크로 되돌아오는 반향을 적응 필터로
+추정해 빼므로, 응답 재생 중에도 마이크 입력을 서버로 보낼 수 있습니다 (full-duplex).
+
+- 분할 블록 주파수 영역 적응 필터 (PBFDAF, overlap-save): 블록 = 입력 프레임(20ms),
+  반향 꼬리 길이(tail_ms)를 여러 블록으로 나눠 FFT 한 번씩으로 처리
+- 빈(bin)별 참조 신호 전력으로 정규화한 NLMS 갱신 + 기울기 제약(gradient constraint)
+- Geigel 동시 발화(double-talk) 검출: 사용자가 말하는 동안에는 필터 갱신을 멈춤
+"""
+import math
+import os
+
+import numpy as np
+
+TAIL_MS = 300           # 스피커 출력 → 마이크 입력 지연 + 실내 잔향을 덮는 길이
+STEP_SIZE = 0.5         # NLMS 갱신 크기 (0~1)
+DOUBLE_TALK_RATIO = 0.6  # 마이크 최대값이 최근 참조 최대값의 이 비율을 넘으면 동시 발화
+DOUBLE_TALK_HOLD = 10   # 동시 발화 검출 후 이 프레임 수(200ms) 동안 갱신을 계속 멈춤
+POWER_SMOOTHING = 0.9
+MIN_REFERENCE_POWER = 1e-7  # 참조 신호가 이보다 작으면(무음) 갱신하지 않음
+
+
+def full_duplex_enabled() -> bool:
+    """FULL_DUPLEX 환경 변수로 full-duplex(반향 제거) 모드 사용 여부를 정합니다 (기본: 끔)."""
+    return os.getenv("FULL_DUPLEX", "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+class EchoCanceller:
+    """
+    PCM16 마이크 프레임에서 참조 신호(스피커 출력)의 반향을 제거합니다.
+
+    process()는 매번 같은 길이(frame_samples)의 마이크/참조 프레임을 받아
+    반향이 제거된 마이크 프레임을 반환합니다.
+    """
+
+    def __init__(self, frame_samples: int, sample_rate: int, tail_ms: int = TAIL_MS,
+                 step_size: float = STEP_SIZE, double_talk_ratio: float = DOUBLE_TALK_RATIO):
+        self.frame_samples = frame_samples
+        self.partitions = max(1, -(-sample_rate * tail_ms // 1000 // frame_samples))
+        self.step_size = step_size
+        self.double_talk_ratio = double_talk_ratio
+        bins = frame_samples + 1
+        self._x_prev = np.zeros(frame_samples)
+        self._x_spectra = np.zeros((self.partitions, bins), dtype=np.complex128)
+        self._weights = np.zeros((self.partitions, bins), dtype=np.complex128)
+        self._power = np.zeros(bins)
+        self._x_peaks = np.zeros(self.partitions)
+        self._e_padded = np.zeros(2 * frame_samples)
+        self._hold = 0
+        self.frames = 0
+        self.double_talk_frames = 0
+        self._mic_energy = 0.0
+        self._out_energy = 0.0
+
+    def process(self, mic: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """마이크 프레임에서 반향을 빼고 int16 프레임을 반환합니다."""
+        block = self.frame_samples
+        d = mic.astype(np.float64) / 32768.0
+        x = reference.astype(np.float64) / 32768.0
+
+        # 참조 신호 스펙트럼 이력 갱신 (이전 블록 + 현재 블록, overlap-save)
+        self._x_spectra[1:] = self._x_spectra[:-1]
+        self._x_spectra[0] = np.fft.rfft(np.concatenate((self._x_prev, x)))
+        self._x_prev = x
+        self._x_peaks[1:] = self._x_peaks[:-1]
+        self._x_peaks[0] = np.max(np.abs(x))
+
+        # 반향 추정과 오차(= 반향 제거된 마이크 신호)
+        echo = np.fft.irfft(np.sum(self._weights * self._x_spectra, axis=0))[block:]
+        e = d - echo
+
+        # 동시 발화가 아니고 참조 신호가 있을 때만 필터 갱신
+        x0 = self._x_spectra[0]
+        self._power = POWER_SMOOTHING * self._power + (1 - POWER_SMOOTHING) * (x0.real ** 2 + x0.imag ** 2)
+        x_peak = self._x_peaks.max()
+        if np.max(np.abs(d)) > self.double_talk_ratio * x_peak:
+            self._hold = DOUBLE_TALK_HOLD
+        else:
+            self._hold = max(0, self._hold - 1)
+        double_talk = self._hold > 0
+        if double_talk and x_peak > 0:
+            self.double_talk_frames += 1
+        if not double_talk and np.mean(x * x) > MIN_REFERENCE_POWER:
+            self._e_padded[block:] = e
+            error = np.fft.rfft(self._e_padded)
+            mean_power = np.mean(self._power)
+            gain = self.step_size / (self.partitions * (self._power + 1e-3 * mean_power + 1e-10))
+            self._weights += gain * np.conj(self._x_spectra) * error
+            # 기울기 제약: 시간 영역 필터의 뒤쪽 절반(순환 합성 성분)을 0으로
+            taps = np.fft.irfft(self._weights, axis=1)
+            taps[:, block:] = 0.0
+            self._weights = np.fft.rfft(taps, axis=1)
+
+            # ERLE는 반향만 있는 구간에서만 추적
+            self._mic_energy = 0.99 * self._mic_energy + 0.01 * float(np.mean(d * d))
+            self._out_energy = 0.99 * self._out_energy + 0.01 * float(np.mean(e * e))
+
+        self.frames += 1
+        return np.clip(e * 32768.0, -32768, 32767).astype(np.int16)
+
+    def erle_db(self) -> float:
+        """반향만 있던 최근 구간의 마이크 입력 대비 출력 에너지 감소량(dB, ERLE)."""
+        if self._out_energy <= 0:
+            return 0.0
+        return 10.0 * math.log10((self._mic_energy + 1e-12) / (self._out_energy + 1e-12))
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "double_talk_frames": self.double_talk_frames,
+            "erle_db": round(self.erle_db(), 1),
+        }
@@ -4,7 +4,6 @@ OpenAI Real-time API powered voice and text interaction system.
 """
 import os
 import asyncio
-import queue
 import numpy as np
 import gradio as gr
 from dotenv import load_dotenv
@@ -12,7 +11,8 @@ from fastrtc import WebRTC, AsyncStreamHandler
 
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
-from realtime_handler import GradioRealtimeHandler, SAMPLE_RATE
+from realtime_handler import SAMPLE_RATE
+from sessions import SessionLimitError, SessionManager
 
 # ============================================================
 # JARVIS CSS Theme
@@ -532,20 +532,30 @@ HTML_LISTENING = _REACTOR_TPL.format(
     state="listening", label_cls="", label="&#9678; LISTENING"
 )
 
+# Turn latency rows shown in the UI (offsets from the start of each turn)
+LATENCY_ROWS = [
+    ("transcription_completed", "Transcription"),
+    ("response_created", "Response created"),
+    ("first_audio_delta", "First audio"),
+    ("function_call", "Function call (duration)"),
+    ("audio_done", "Audio done"),
+    ("playback_drained", "Playback drained"),
+]
+LATENCY_EMPTY = "*No completed turns yet.*"
+
 LOG_DIVIDER = '<div class="log-section-label">&#9662; COMMUNICATION LOG &#9662;</div>'
 
 # ============================================================
-# Global handler
+# Per-browser sessions
 # ============================================================
-handler = None
+sessions = SessionManager()
 
 
 # ============================================================
 # Event handlers
 # ============================================================
-async def connect_handler():
-    """Connect to the Real-time API."""
-    global handler
+async def connect_handler(request: gr.Request):
+    """Connect this browser session to the Real-time API."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key or api_key == "sk-your-api-key-here":
         err = [{"role": "assistant", "content": "OPENAI_API_KEY not configured. Check your .env file."}]
@@ -555,33 +565,40 @@ async def connect_handler():
         )
 
     try:
-        handler = GradioRealtimeHandler(api_key)
-        await handler.connect()
-        await asyncio.sleep(2)
+        handler = await sessions.open(request.session_hash, api_key)
         return (
-            _format_chat_history(), HTML_IDLE,
+            handler.chat_log.messages(), HTML_IDLE,
             gr.update(interactive=False), gr.update(interactive=True),
         )
+    except SessionLimitError as e:
+        err = [{"role": "assistant", "content": str(e)}]
     except Exception as e:
         err = [{"role": "assistant", "content": f"Connection failed: {str(e)}"}]
-        return (
-            err, HTML_DISCONNECTED,
-            gr.update(interactive=True), gr.update(interactive=False),
-        )
+    return (
+        err, HTML_DISCONNECTED,
+        gr.update(interactive=True), gr.update(interactive=False),
+    )
 
 
-async def disconnect_handler():
-    """Disconnect from the Real-time API."""
-    global handler
-    if handler:
-        await handler.disconnect()
-        handler = None
+async def disconnect_handler(request: gr.Request):
+    """Disconnect this browser session from the Real-time API."""
+    await sessions.close(request.session_hash)
     return (
         [], HTML_DISCONNECTED,
         gr.update(interactive=True), gr.update(interactive=False),
     )
 
 
+async def close_session(request: gr.Request):
+    """Free the session's connection when its browser tab goes away."""
+    await sessions.close(request.session_hash)
+
+
+def get_session_id(request: gr.Request):
+    """Session id handed to the WebRTC stream, which has no gr.Request of its own."""
+    return request.session_hash
+
+
 class OpenAIVoiceHandler(AsyncStreamHandler):
     """WebRTC stream handler that bridges browser audio ↔ OpenAI Real-time API."""
 
@@ -591,9 +608,11 @@ class OpenAIVoiceHandler(AsyncStreamHandler):
             output_sample_rate=SAMPLE_RATE,
             input_sample_rate=48000,
         )
+        self.session_id = None
 
     async def receive(self, frame):
-        """Send browser audio to OpenAI Real-time API."""
+        """Send browser audio to this session's Real-time connection."""
+        handler = sessions.get(self.session_id)
         if handler is None or not handler.is_connected:
             return
         sr, data = frame
@@ -602,67 +621,93 @@ class OpenAIVoiceHandler(AsyncStreamHandler):
 
     async def emit(self):
         """Return next audio frame from OpenAI to the browser."""
+        handler = sessions.get(self.session_id)
         if handler is None or not handler.is_connected:
             await asyncio.sleep(0.04)
             return None
-        try:
-            return handler._webrtc_queue.get_nowait()
-        except queue.Empty:
+        frame = handler.next_output_frame()
+        if frame is None:
             await asyncio.sleep(0.02)
-            return None
+        return frame
 
     def copy(self):
         return OpenAIVoiceHandler()
 
     async def start_up(self):
-        if handler is not None:
-            handler.webrtc_active = True
+        # The stream's additional input is the browser session id (see create_app)
+        await self.wait_for_args()
+        self.session_id = self.latest_args[1]
+        if self.session_id is not None:
+            sessions.attach_stream(self.session_id)
 
     async def shutdown(self):
-        if handler is not None:
-            handler.webrtc_active = False
-
+        if self.session_id is not None:
+            sessions.detach_stream(self.session_id)
 
-async def handle_text_submit(text):
-    """Process text input from the user."""
-    if handler is None or not handler.is_connected:
-        return _format_chat_history(), ""
-    if not text.strip():
-        return _format_chat_history(), ""
 
+async def handle_text_submit(text, request: gr.Request):
+    """Send text input; the message and the reply reach the log via the update stream."""
+    handler = sessions.get(request.session_hash)
+    if handler is None or not handler.is_connected or not text.strip():
+        return ""
     await handler.send_text_message(text)
-    await asyncio.sleep(1.5)
-    return _format_chat_history(), ""
-
+    return ""
 
-def poll_updates():
-    """Called periodically by gr.Timer to update chat, audio, and status."""
-    if handler is None or not handler.is_connected:
-        return [], None, HTML_DISCONNECTED
 
-    audio_bytes = handler.get_and_clear_audio_output()
-    audio_output = None
-    if audio_bytes:
-        pcm_array = np.frombuffer(audio_bytes, dtype=np.int16)
-        audio_output = (SAMPLE_RATE, pcm_array)
-
-    status_html = HTML_SPEAKING if handler.is_speaking else HTML_IDLE
-    return _format_chat_history(), audio_output, status_html
+async def stream_updates(request: gr.Request):
+    """
+    Push chat, status, fallback audio and latency changes to this browser as the
+    handler publishes them. Runs for the life of the connection; the chat log and
+    latency table are only sent when they changed.
+    """
+    handler = sessions.get(request.session_hash)
+    if handler is None:
+        # Connect failed: leave the error message shown by connect_handler
+        yield gr.update(), gr.update(), gr.update(), gr.update()
+        return
+
+    messages = turns = None
+    async for _ in handler.ui.changes():
+        chat = latency = gr.update()
+        if handler.chat_log.total != messages:
+            messages = handler.chat_log.total
+            chat = handler.chat_log.messages()
+        if handler.tracer.finished != turns:
+            turns = handler.tracer.finished
+            latency = _format_latency(handler)
+
+        audio_output = None
+        audio_bytes = handler.get_and_clear_audio_output()
+        if audio_bytes:
+            audio_output = (SAMPLE_RATE, np.frombuffer(audio_bytes, dtype=np.int16))
+
+        if not handler.is_connected:
+            yield chat, audio_output, HTML_DISCONNECTED, latency
+            return
+        status_html = HTML_SPEAKING if handler.is_speaking else HTML_IDLE
+        yield chat, audio_output, status_html, latency
 
 
-def _format_chat_history():
-    """Convert handler's chat_history to Gradio Chatbot messages format."""
+def _format_latency(handler):
+    """Render the handler's rolling turn latency histograms as a Markdown table."""
     if handler is None:
-        return []
-    messages = []
-    for role, content in handler.chat_history:
-        if role == "user":
-            messages.append({"role": "user", "content": content})
-        elif role == "assistant":
-            messages.append({"role": "assistant", "content": content})
-        elif role == "system":
-            messages.append({"role": "assistant", "content": f"[SYS] {content}"})
-    return messages
+        return LATENCY_EMPTY
+    summary = handler.tracer.summary()
+    rows = []
+    for name, label in LATENCY_ROWS:
+        stats = summary[name]
+        if stats["count"]:
+            rows.append(f"| {label} | {stats['count']} | {stats['p50']:.0f} "
+                        f"| {stats['p95']:.0f} | {stats['p99']:.0f} |")
+    if not rows:
+        return LATENCY_EMPTY
+    return (
+        f"**{handler.tracer.turns} turns** ({handler.tracer.interrupted} interrupted), "
+        "ms from end of user speech\n\n"
+        "| MILESTONE | TURNS | P50 | P95 | P99 |\n"
+        "|-----------|-------|-----|-----|-----|\n"
+        + "\n".join(rows)
+    )
 
 
 # ============================================================
@@ -674,6 +719,9 @@ def create_app():
         # ---- Header ----
         gr.HTML(HEADER_HTML)
 
+        # Browser session id, for routing the WebRTC stream to this session's handler
+        session_id = gr.State()
+
         # ---- Connection buttons ----
         with gr.Row():
             connect_btn = gr.Button(
@@ -727,8 +775,9 @@ def create_app():
             type="messages",
         )
 
-        # ---- Timer ----
-        timer = gr.Timer(value=0.5)
+        # ---- Turn latency ----
+        with gr.Accordion("TURN LATENCY", open=False, elem_classes=["jarvis-accordion"]):
+            latency_md = gr.Markdown(LATENCY_EMPTY)
 
         # ---- Member info ----
         with gr.Accordion("TEST MEMBER DATABASE", open=False, elem_classes=["jarvis-accordion"]):
@@ -742,38 +791,48 @@ def create_app():
             )
 
         # ---- Event wiring ----
+        # Every session runs its events concurrently with the others (Gradio's default is 1)
+        limit = sessions.limit
+        app.load(fn=get_session_id, outputs=[session_id])
+        app.unload(close_session)
+
+        # Once connected, the update stream holds the session's UI until disconnect
         connect_btn.click(
             fn=connect_handler,
             outputs=[chatbot, status_html, connect_btn, disconnect_btn],
+            concurrency_limit=limit,
+        ).then(
+            fn=stream_updates,
+            outputs=[chatbot, audio_output, status_html, latency_md],
+            concurrency_limit=limit,
         )
 
         disconnect_btn.click(
             fn=disconnect_handler,
             outputs=[chatbot, status_html, connect_btn, disconnect_btn],
+            concurrency_limit=limit,
         )
 
         webrtc_audio.stream(
             fn=OpenAIVoiceHandler(),
-            inputs=[webrtc_audio],
+            inputs=[webrtc_audio, session_id],
             outputs=[webrtc_audio],
             time_limit=300,
+            concurrency_limit=limit,
         )
 
         text_input.submit(
             fn=handle_text_submit,
             inputs=[text_input],
-            outputs=[chatbot, text_input],
+            outputs=[text_input],
+            concurrency_limit=limit,
         )
 
         send_btn.click(
             fn=handle_text_submit,
             inputs=[text_input],
-            outputs=[chatbot, text_input],
-        )
-
-        timer.tick(
-            fn=poll_updates,
-            outputs=[chatbot, audio_output, status_html],
+            outputs=[text_input],
+            concurrency_limit=limit,
         )
 
     return app
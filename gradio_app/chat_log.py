@@ -0,0 +1,119 @@
+"""
+Bounded chat log for the Gradio app.
+
+Messages are formatted for the Chatbot once, when they are appended, so an UI
+update only costs the new entries. Only the last CHAT_LOG_RETENTION messages stay
+in memory; older ones are replaced in the UI by a single "earlier messages" note
+and dropped, or appended to a JSONL file under CHAT_LOG_DIR if that is set. The
+log holds callers' names, phone digits and birth dates, so writing it to disk is
+opt-in.
+"""
+import json
+import os
+import time
+import uuid
+from collections import deque
+from typing import Optional
+
+CHAT_LOG_RETENTION = 200
+# Off by default: spilled messages are only written when CHAT_LOG_DIR is set
+CHAT_LOG_DIR = ""
+
+
+def chat_log_retention() -> int:
+    """CHAT_LOG_RETENTION env var: number of messages kept in memory and shown."""
+    value = os.getenv("CHAT_LOG_RETENTION", "").strip()
+    if not value:
+        return CHAT_LOG_RETENTION
+    return max(1, int(value))
+
+
+def chat_log_dir() -> Optional[str]:
+    """CHAT_LOG_DIR env var (unset, empty or off means older messages are simply dropped)."""
+    value = os.getenv("CHAT_LOG_DIR", CHAT_LOG_DIR).strip()
+    if value.lower() in ("", "off", "none", "false"):
+        return None
+    return value
+
+
+def format_message(role: str, content: str) -> dict:
+    """One chat entry in Gradio Chatbot messages format."""
+    if role == "user":
+        return {"role": "user", "content": content}
+    if role == "system":
+        return {"role": "assistant", "content": f"[SYS] {content}"}
+    return {"role": "assistant", "content": content}
+
+
+class ChatLog:
+    """
+    Pre-formatted, bounded chat history of one session.
+
+    total counts every message ever appended, so the UI can tell whether anything
+    changed without looking at the messages themselves.
+    """
+
+    def __init__(self, retention: Optional[int] = None, directory: Optional[str] = None):
+        self.retention = chat_log_retention() if retention is None else retention
+        # An explicit empty directory means off, like an empty CHAT_LOG_DIR
+        self.directory = chat_log_dir() if directory is None else (directory or None)
+        self.total = 0
+        self.spilled = 0
+        self.path: Optional[str] = None
+        self._entries: deque = deque()
+        self._messages: deque = deque()
+        self._file = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        """(role, content) pairs still held in memory, oldest first."""
+        return iter(self._entries)
+
+    def append(self, role: str, content: str) -> None:
+        self._entries.append((role, content))
+        self._messages.append(format_message(role, content))
+        self.total += 1
+        if len(self._entries) > self.retention:
+            self._spill(*self._entries.popleft())
+            self._messages.popleft()
+
+    def messages(self) -> list:
+        """
+        Retained messages for the Chatbot, preceded by a note about spilled ones.
+
+        The Chatbot only accepts its whole value, so this returns the full window
+        rather than what changed since the last call. That is bounded: a shallow
+        list of at most retention + 1 already-formatted dicts, built only when
+        stream_updates sees total change (once per burst of messages, not per audio
+        delta). Gradio also sends successive generator outputs as diffs, so only
+        the new entries reach the browser.
+        """
+        if not self.spilled:
+            return list(self._messages)
+        where = f" (saved to {self.path})" if self.path else ""
+        note = format_message("system", f"{self.spilled} earlier messages{where}")
+        return [note, *self._messages]
+
+    def _spill(self, role: str, content: str) -> None:
+        self.spilled += 1
+        if self.directory is None:
+            return
+        try:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                name = f"chat-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.jsonl"
+                self.path = os.path.join(self.directory, name)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps({"role": role, "content": content},
+                                        ensure_ascii=False) + "\n")
+            self._file.flush()
+        except OSError as e:
+            print(f"[Chat log] cannot write {self.directory}: {e}")
+            self.directory = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -7,44 +7,109 @@ import asyncio
 import base64
 import json
 import queue
+import time
 import numpy as np
 import sys
 import os
+from typing import Callable, Optional
 from openai import AsyncOpenAI
 
 # Import from the parent directory's member_db module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from member_db import TOOLS, execute_function
+from audio_stream import FrameRing
+from chat_log import ChatLog
+from member_db import TOOLS, SessionMemberCache, session_functions
+from metrics import StageTimer, summarize
+from reconnect import CONNECTION_ERRORS, ConversationLog, backoff_delays
+from resample import PolyphaseResampler
+from tool_executor import AsyncToolExecutor
+from turn_trace import TurnTracer
+from ui_updates import UiUpdates
+from uplink import AudioUplink
+from vad import VoiceActivityGate, local_vad_enabled
 
 SAMPLE_RATE = 24000  # Real-time API requires 24kHz
 FRAME_SAMPLES = 960  # 40ms at 24kHz — one WebRTC output frame
+OUTPUT_QUEUE_FRAMES = 300
+# Output ring slots beyond the queue bound: the frame being filled plus frames
+# WebRTC may still be encoding, so queued views are never overwritten
+OUTPUT_RING_SPARE_FRAMES = 4
+# Server VAD sensitivity; can be lowered when local VAD already filters noise
+SERVER_VAD_THRESHOLD = 0.95
+SERVER_VAD_THRESHOLD_WITH_LOCAL_VAD = 0.6
 
 
 class GradioRealtimeHandler:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, local_vad: Optional[bool] = None):
         self.client = AsyncOpenAI(api_key=api_key)
         self.connection = None
         self.is_connected = False
         self.is_speaking = False
-        self.chat_history = []
+        # Pre-formatted, bounded chat log (older messages spill to CHAT_LOG_DIR)
+        self.chat_log = ChatLog()
         self.audio_output_buffer = []
+        # Chat, status and latency changes are pushed to the browser's update stream
+        self.ui = UiUpdates()
         self.transcript_buffer = ""
+        # Called once the connection is gone for good (error or failed reconnect),
+        # so the owner can free the session
+        self.on_closed: Optional[Callable[[], None]] = None
         self._event_task = None
         self._context_manager = None
+        # Per-session member lookup cache, invalidated on withdrawal
+        self.member_cache = SessionMemberCache()
+        self.tool_executor = AsyncToolExecutor(session_functions(self.member_cache))
+        self._tool_tasks = set()
         # WebRTC frame queue for real-time audio output
         self.webrtc_active = False
-        self._webrtc_queue = queue.Queue(maxsize=300)
-        self._pcm_buffer = bytearray()
-
-    async def connect(self):
-        """Establish connection to Real-time API and configure session."""
-        self._context_manager = self.client.beta.realtime.connect(
-            model="gpt-4o-mini-realtime-preview"
-        )
-        self.connection = await self._context_manager.__aenter__()
-        self.is_connected = True
-
-        await self.connection.session.update(session={
+        self._webrtc_queue = queue.Queue(maxsize=OUTPUT_QUEUE_FRAMES)
+        # Frames are zero-copy views into a preallocated ring
+        self._output_ring = FrameRing(FRAME_SAMPLES, OUTPUT_QUEUE_FRAMES + OUTPUT_RING_SPARE_FRAMES)
+        # Output positions in samples: total written by the server, start of the next
+        # frame cut from the ring, and (wall clock, start, length) of the last emitted frame
+        self._write_position = 0
+        self._frame_position = 0
+        self._last_emitted = (0.0, 0, 0)
+        # Assistant audio item being played and response state, for barge-in truncation
+        self._audio_item = None
+        self._response_active = False
+        self._response_id = None
+        # Ids of the response/item cancelled by barge-in; their late deltas are
+        # dropped until the next response.created
+        self._cancelled_ids = set()
+        self._interrupted_at = None
+        self.interrupt_latencies = []
+        # Optional local VAD (LOCAL_VAD env var): only speech + padding is sent upstream
+        if local_vad is None:
+            local_vad = local_vad_enabled()
+        self.vad = VoiceActivityGate(SAMPLE_RATE) if local_vad else None
+        # Upstream audio is coalesced into packets (UPLINK_PACKET_MS, adaptive by default)
+        self.uplink = AudioUplink(SAMPLE_RATE)
+        # Browser mic audio (usually 48kHz) is resampled with filter state kept across chunks
+        self._resampler = None
+        self._rtt_task = None
+        # Local conversation log replayed into a fresh session after a dropped connection
+        self.conversation = ConversationLog(SAMPLE_RATE)
+        self._reconnecting = False
+        self.recoveries = []
+        # Per-turn latency timeline (JSONL to TURN_TRACE_FILE); playback_drained is
+        # stamped by next_output_frame once the last frame of a response has been emitted
+        self.tracer = TurnTracer("gradio", on_finish=lambda record: self.ui.publish())
+        self._awaiting_drain = False
+
+    def _add_message(self, role: str, content: str):
+        """Append a chat log entry and notify the UI."""
+        self.chat_log.append(role, content)
+        self.ui.publish()
+
+    def _set_speaking(self, speaking: bool):
+        if speaking != self.is_speaking:
+            self.is_speaking = speaking
+            self.ui.publish()
+
+    def _session_config(self) -> dict:
+        """Session settings sent with session.update."""
+        return {
             "modalities": ["text", "audio"],
             "instructions": """당신은 TEST FAQ를 담당하는 챗봇입니다.
 처음 인사할 때 "안녕하세요, TEST FAQ를 담당하는 챗봇입니다. 무엇을 도와드릴까요?"라고 말하세요.
@@ -68,26 +133,108 @@ class GradioRealtimeHandler:
             "input_audio_transcription": {"model": "whisper-1"},
             "turn_detection": {
                 "type": "server_vad",
-                "threshold": 0.95,
+                "threshold": (SERVER_VAD_THRESHOLD_WITH_LOCAL_VAD if self.vad
+                              else SERVER_VAD_THRESHOLD),
                 "prefix_padding_ms": 200,
                 "silence_duration_ms": 1200
             },
             "tools": TOOLS
-        })
+        }
+
+    async def _open_session(self, timer: StageTimer):
+        """Open the WebSocket and wait until the session config is applied."""
+        with timer.stage("connect"):
+            self._context_manager = self.client.beta.realtime.connect(
+                model="gpt-4o-mini-realtime-preview"
+            )
+            self.connection = await self._context_manager.__aenter__()
+        with timer.stage("session.update"):
+            await self.connection.session.update(session=self._session_config())
+        with timer.stage("session.updated"):
+            async for event in self.connection:
+                if event.type == "session.updated":
+                    break
+                if event.type == "error":
+                    raise RuntimeError(f"Session setup failed: {event.error.message}")
 
-        # Wait for session.updated event
-        async for event in self.connection:
-            if event.type == "session.updated":
-                break
+    async def _close_connection(self):
+        if self._context_manager:
+            try:
+                await self._context_manager.__aexit__(None, None, None)
+            except Exception:
+                pass
+        self.connection = None
+        self._context_manager = None
+
+    async def connect(self):
+        """Establish connection to Real-time API and configure session."""
+        await self._open_session(StageTimer())
+        self.is_connected = True
 
         # Request initial greeting
+        self.tracer.start_turn("greeting")
         await self.connection.response.create()
 
         # Start background event processing
         self._event_task = asyncio.create_task(self._process_events())
+        self._rtt_task = asyncio.create_task(self.uplink.probe_rtt(self.connection))
+
+    async def _reconnect(self, reason: str) -> bool:
+        """
+        Reopen a dropped connection with exponential backoff, re-send the session
+        config and replay the conversation log. Time-to-recover runs from noticing
+        the drop until the replay has been sent.
+        """
+        dropped = time.perf_counter()
+        self._reconnecting = True
+        self._add_message("system", f"Connection lost ({reason}), reconnecting...")
+        if self._rtt_task:
+            self._rtt_task.cancel()
+        await self._close_connection()
+        # Items and unsent audio from the old session mean nothing to the new one
+        self.uplink.discard()
+        self._audio_item = None
+        self._response_active = False
+        self._cancelled_ids.clear()
+        self._set_speaking(False)
+        self.transcript_buffer = ""
+
+        try:
+            for attempt, delay in enumerate(backoff_delays(), 1):
+                await asyncio.sleep(delay)
+                stages = StageTimer()
+                try:
+                    await self._open_session(stages)
+                    with stages.stage("replay"):
+                        items = self.conversation.replay_items()
+                        for item in items:
+                            await self.connection.conversation.item.create(item=item)
+                        if self.conversation.needs_response(items):
+                            self.tracer.start_turn("reconnect")
+                            await self.connection.response.create()
+                except Exception as e:
+                    print(f"[Reconnect] attempt {attempt} failed: {e}")
+                    await self._close_connection()
+                    continue
+                recovered = time.perf_counter() - dropped
+                self.recoveries.append(recovered)
+                self._rtt_task = asyncio.create_task(self.uplink.probe_rtt(self.connection))
+                print(f"[Reconnect] attempt {attempt} succeeded in {recovered * 1000:.0f} ms "
+                      f"({stages.format()})")
+                self._add_message("system", f"Reconnected in {recovered * 1000:.0f} ms "
+                                            f"({len(items)} conversation items restored)")
+                return True
+            self._add_message("system", "Reconnect failed.")
+            return False
+        finally:
+            self._reconnecting = False
 
     async def disconnect(self):
         """Close connection and clean up."""
+        if self.is_connected:
+            self.ui.close()
+        # Otherwise the connection was already lost and the update stream ends by
+        # itself after rendering that; closing it here could swallow the last render
         self.is_connected = False
         if self._event_task:
             self._event_task.cancel()
@@ -95,45 +242,75 @@ class GradioRealtimeHandler:
                 await self._event_task
             except asyncio.CancelledError:
                 pass
-        if self._context_manager:
-            try:
-                await self._context_manager.__aexit__(None, None, None)
-            except Exception:
-                pass
-        self.connection = None
-        self._context_manager = None
+        if self._rtt_task:
+            self._rtt_task.cancel()
+        for task in list(self._tool_tasks):
+            task.cancel()
+        self.tool_executor.shutdown()
+        self.member_cache.close()
+        uplink = self.uplink.stats()
+        if uplink["messages"]:
+            print(f"[Uplink] {uplink['messages_per_sec']:.1f} msg/s, "
+                  f"{uplink['bytes_per_sec'] / 1024:.1f} KB/s, packet {uplink['packet_ms']} ms")
+        if self.vad is not None:
+            vad = self.vad.stats()
+            print(f"[Local VAD] sent {vad['bytes_sent']} bytes, "
+                  f"saved {vad['bytes_saved']} bytes ({vad['saved_ratio']:.0%})")
+        interrupts = summarize(self.interrupt_latencies)
+        if interrupts["count"]:
+            print(f"[Barge-in] {interrupts['count']} interrupts, time to silence "
+                  f"p50 {interrupts['p50']:.0f} ms / max {interrupts['max']:.0f} ms")
+        recoveries = summarize(self.recoveries)
+        if recoveries["count"]:
+            print(f"[Reconnect] {recoveries['count']} reconnects, time to recover "
+                  f"p50 {recoveries['p50']:.0f} ms / max {recoveries['max']:.0f} ms")
+        first_audio = self.tracer.summary()["first_audio_delta"]
+        if first_audio["count"]:
+            print(f"[Turns] {self.tracer.turns} turns, first audio p50 {first_audio['p50']:.0f} ms "
+                  f"/ p95 {first_audio['p95']:.0f} ms / p99 {first_audio['p99']:.0f} ms")
+        self.tracer.close()
+        self.chat_log.close()
+        await self._close_connection()
 
     async def send_audio_chunk(self, audio_data: np.ndarray, input_sample_rate: int):
         """
         Accept audio from Gradio (numpy int16 array at some sample rate),
-        resample to 24kHz if needed, base64-encode, and send to Real-time API.
+        resample to 24kHz if needed and hand it to the uplink packetizer.
         """
-        if not self.is_connected or self.connection is None:
+        if not self.is_connected or self._reconnecting or self.connection is None:
             return
 
         # Resample if needed
         if input_sample_rate != SAMPLE_RATE:
-            duration = len(audio_data) / input_sample_rate
-            num_samples = int(duration * SAMPLE_RATE)
-            if num_samples == 0:
+            if self._resampler is None or self._resampler.in_rate != input_sample_rate:
+                self._resampler = PolyphaseResampler(input_sample_rate, SAMPLE_RATE)
+            audio_data = self._resampler.process(audio_data)
+            if not len(audio_data):
                 return
-            indices = np.linspace(0, len(audio_data) - 1, num_samples).astype(int)
-            audio_data = audio_data[indices]
 
         # Ensure int16
         if audio_data.dtype != np.int16:
             audio_data = (audio_data * 32767).astype(np.int16)
 
-        pcm_bytes = audio_data.tobytes()
-        encoded = base64.b64encode(pcm_bytes).decode("utf-8")
-        await self.connection.input_audio_buffer.append(audio=encoded)
+        if self.vad is not None:
+            audio_data = self.vad.feed(audio_data)
+            if not len(audio_data):
+                await self.uplink.flush(self.connection)
+                return
+
+        try:
+            await self.uplink.send(self.connection, np.ascontiguousarray(audio_data))
+        except CONNECTION_ERRORS:
+            # The event loop task notices the drop and reconnects; this audio is lost
+            self.uplink.discard()
 
     async def send_text_message(self, text: str):
         """Send a text message to the Real-time API."""
-        if not self.is_connected or self.connection is None:
+        if not self.is_connected or self._reconnecting or self.connection is None:
             return
 
-        self.chat_history.append(("user", text))
+        self._add_message("user", text)
+        self.tracer.start_turn("text_message")
         await self.connection.conversation.item.create(
             item={
                 "type": "message",
@@ -151,33 +328,60 @@ class GradioRealtimeHandler:
         self.audio_output_buffer.clear()
         return combined
 
-    def _enqueue_audio_frames(self, audio_bytes: bytes):
-        """Split PCM bytes into fixed-size frames and enqueue for WebRTC."""
-        self._pcm_buffer.extend(audio_bytes)
-        frame_bytes = FRAME_SAMPLES * 2  # 2 bytes per int16 sample
-        while len(self._pcm_buffer) >= frame_bytes:
-            chunk = bytes(self._pcm_buffer[:frame_bytes])
-            self._pcm_buffer = self._pcm_buffer[frame_bytes:]
-            frame_array = np.frombuffer(chunk, dtype=np.int16).reshape(1, -1)
-            try:
-                self._webrtc_queue.put_nowait((SAMPLE_RATE, frame_array))
-            except queue.Full:
-                try:
-                    self._webrtc_queue.get_nowait()
-                except queue.Empty:
-                    pass
-                self._webrtc_queue.put_nowait((SAMPLE_RATE, frame_array))
+    def _enqueue_audio_frames(self, samples: np.ndarray):
+        """Cut PCM16 samples into fixed-size frames and enqueue them for WebRTC."""
+        self._write_position += len(samples)
+        for frame in self._output_ring.feed(samples):
+            self._enqueue_frame(frame)
 
     def _flush_audio_frames(self):
-        """Flush remaining bytes in pcm buffer as a final (possibly shorter) frame."""
-        if len(self._pcm_buffer) >= 2:
-            chunk = bytes(self._pcm_buffer)
-            self._pcm_buffer.clear()
-            frame_array = np.frombuffer(chunk, dtype=np.int16).reshape(1, -1)
+        """Flush the remaining samples as a final (possibly shorter) frame."""
+        frame = self._output_ring.flush()
+        if frame is not None:
+            self._enqueue_frame(frame)
+
+    def _enqueue_frame(self, frame: np.ndarray):
+        """Queue one (1, n) frame view, dropping the oldest frame when the queue is full."""
+        item = (self._frame_position, (SAMPLE_RATE, frame))
+        self._frame_position += frame.shape[1]
+        try:
+            self._webrtc_queue.put_nowait(item)
+        except queue.Full:
             try:
-                self._webrtc_queue.put_nowait((SAMPLE_RATE, frame_array))
-            except queue.Full:
+                self._webrtc_queue.get_nowait()
+            except queue.Empty:
                 pass
+            self._webrtc_queue.put_nowait(item)
+
+    def next_output_frame(self):
+        """Pop the next WebRTC output frame (None when idle) and advance the played cursor."""
+        try:
+            position, frame = self._webrtc_queue.get_nowait()
+        except queue.Empty:
+            if self._interrupted_at is not None:
+                # First silent frame after a barge-in
+                self.interrupt_latencies.append(time.perf_counter() - self._interrupted_at)
+                self._interrupted_at = None
+            if self._awaiting_drain:
+                # Everything received for the response has been handed to WebRTC
+                self._awaiting_drain = False
+                self.tracer.mark("playback_drained")
+                if not self._response_active and not self._tool_tasks:
+                    self.tracer.end_turn()
+            return None
+        self._last_emitted = (time.perf_counter(), position, frame[1].shape[1])
+        return frame
+
+    def _playback_position(self) -> int:
+        """
+        Position (in samples written) of the audio currently being played.
+
+        Estimated from the last frame handed to WebRTC; the browser's own jitter
+        buffer is not visible here.
+        """
+        emitted_at, start, length = self._last_emitted
+        elapsed = time.perf_counter() - emitted_at
+        return start + min(length, int(elapsed * SAMPLE_RATE))
 
     def _clear_webrtc_queue(self):
         """Drain all pending frames from the WebRTC queue."""
@@ -186,77 +390,176 @@ class GradioRealtimeHandler:
                 self._webrtc_queue.get_nowait()
             except queue.Empty:
                 break
-        self._pcm_buffer.clear()
+        self._output_ring.clear()
+        self._frame_position = self._write_position
+
+    async def _interrupt_response(self):
+        """
+        Barge-in: stop output within one frame, cancel the in-flight response and
+        truncate the assistant item to what the caller actually heard.
+        """
+        item = self._audio_item
+        position = self._playback_position()
+        self._interrupted_at = time.perf_counter()
+        self._awaiting_drain = False
+        self.tracer.end_turn(interrupted=True)
+        self._set_speaking(False)
+        self.audio_output_buffer.clear()
+        self._clear_webrtc_queue()
+        if item is not None:
+            self._cancelled_ids.add(item["item_id"])
+        if self._response_active:
+            self._cancelled_ids.add(self._response_id)
+            await self.connection.response.cancel()
+        # Only WebRTC playback has a cursor; fully played items need no truncation
+        if (self.webrtc_active and item is not None
+                and (position < item["end"] or self._response_active)):
+            played = min(max(0, position - item["start"]), item["end"] - item["start"])
+            await self.connection.conversation.item.truncate(
+                item_id=item["item_id"],
+                content_index=item["content_index"],
+                audio_end_ms=played * 1000 // SAMPLE_RATE,
+            )
+        self._audio_item = None
+
+    def _is_cancelled(self, event) -> bool:
+        """True for deltas of a response cancelled by barge-in (sent before the cancel landed)."""
+        return event.response_id in self._cancelled_ids or event.item_id in self._cancelled_ids
 
     async def _process_events(self):
-        """Background loop processing server events."""
-        try:
-            async for event in self.connection:
-                if event.type == "response.audio.delta":
-                    self.is_speaking = True
-                    audio_bytes = base64.b64decode(event.delta)
-                    if not self.webrtc_active:
-                        self.audio_output_buffer.append(audio_bytes)
-                    self._enqueue_audio_frames(audio_bytes)
-
-                elif event.type == "response.audio.done":
-                    self.is_speaking = False
-                    self._flush_audio_frames()
-
-                elif event.type == "response.audio_transcript.delta":
-                    self.transcript_buffer += event.delta
-
-                elif event.type == "response.audio_transcript.done":
-                    if self.transcript_buffer:
-                        self.chat_history.append(("assistant", self.transcript_buffer))
-                        self.transcript_buffer = ""
-
-                elif event.type == "response.text.delta":
-                    self.transcript_buffer += event.delta
-
-                elif event.type == "response.text.done":
-                    if self.transcript_buffer:
-                        self.chat_history.append(("assistant", self.transcript_buffer))
-                        self.transcript_buffer = ""
-
-                elif event.type == "conversation.item.input_audio_transcription.completed":
-                    if hasattr(event, "transcript") and event.transcript:
-                        self.chat_history.append(("user", event.transcript))
-
-                elif event.type == "input_audio_buffer.speech_started":
-                    self.is_speaking = False
-                    self.audio_output_buffer.clear()
-                    self._clear_webrtc_queue()
-
-                elif event.type == "response.function_call_arguments.done":
-                    await self._handle_function_call(event)
-
-                elif event.type == "error":
-                    self.chat_history.append(
-                        ("system", f"Error: {event.error.message}")
-                    )
-
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            self.chat_history.append(("system", f"Connection error: {str(e)}"))
-            self.is_connected = False
+        """Background loop processing server events, reconnecting when the socket drops."""
+        while self.is_connected:
+            try:
+                await self._receive_events()
+                reason = "closed by server"
+            except asyncio.CancelledError:
+                return
+            except CONNECTION_ERRORS as e:
+                reason = str(e) or type(e).__name__
+            except Exception as e:
+                self._connection_lost(f"Connection error: {str(e)}")
+                return
+            if not self.is_connected:
+                # disconnect() was called
+                return
+            if not await self._reconnect(reason):
+                self._connection_lost()
+                return
+
+    def _connection_lost(self, message: Optional[str] = None):
+        """Give up on the session: show the final state, then notify the owner."""
+        self.is_connected = False
+        if message:
+            self._add_message("system", message)
+        else:
+            self.ui.publish()
+        if self.on_closed is not None:
+            self.on_closed()
+
+    async def _receive_events(self):
+        """Handle events from the current connection until it closes."""
+        async for event in self.connection:
+            self.conversation.observe(event)
+            if event.type == "response.audio.delta":
+                if self._is_cancelled(event):
+                    continue
+                self._set_speaking(True)
+                audio_bytes = base64.b64decode(event.delta)
+                if not self.webrtc_active:
+                    self.audio_output_buffer.append(audio_bytes)
+                item = self._audio_item
+                if item is None or item["item_id"] != event.item_id:
+                    item = self._audio_item = {
+                        "item_id": event.item_id,
+                        "content_index": event.content_index,
+                        "start": self._write_position,
+                    }
+                self._enqueue_audio_frames(np.frombuffer(audio_bytes, dtype=np.int16))
+                item["end"] = self._write_position
+                self.tracer.mark("first_audio_delta")
+
+            elif event.type == "response.created":
+                self._response_active = True
+                self._response_id = event.response.id
+                self._cancelled_ids.clear()
+                self.tracer.mark("response_created")
+
+            elif event.type == "response.done":
+                self._response_active = False
+
+            elif event.type == "response.audio.done":
+                self._set_speaking(False)
+                self._flush_audio_frames()
+                self.tracer.mark("audio_done")
+                if self.webrtc_active:
+                    self._awaiting_drain = True
+                else:
+                    # No WebRTC playback to wait for: the clip is handed over as-is
+                    self.tracer.mark("playback_drained")
+                    self.ui.publish()
+
+            elif event.type == "response.audio_transcript.delta":
+                if self._is_cancelled(event):
+                    continue
+                self.transcript_buffer += event.delta
+
+            elif event.type == "response.audio_transcript.done":
+                if self.transcript_buffer:
+                    self._add_message("assistant", self.transcript_buffer)
+                    self.transcript_buffer = ""
+
+            elif event.type == "response.text.delta":
+                self.transcript_buffer += event.delta
+
+            elif event.type == "response.text.done":
+                if self.transcript_buffer:
+                    self._add_message("assistant", self.transcript_buffer)
+                    self.transcript_buffer = ""
+
+            elif event.type == "conversation.item.input_audio_transcription.completed":
+                self.tracer.mark("transcription_completed")
+                if hasattr(event, "transcript") and event.transcript:
+                    self._add_message("user", event.transcript)
+
+            elif event.type == "input_audio_buffer.speech_started":
+                await self._interrupt_response()
+
+            elif event.type == "input_audio_buffer.speech_stopped":
+                self.tracer.start_turn("speech_stopped")
+
+            elif event.type == "response.function_call_arguments.done":
+                # Run tools off the event loop so audio keeps flowing
+                self.tracer.function_call_started(event.call_id, event.name)
+                task = asyncio.create_task(self._handle_function_call(event))
+                self._tool_tasks.add(task)
+                task.add_done_callback(self._tool_tasks.discard)
+
+            elif event.type == "error":
+                # Cancelling a response the server already finished is harmless
+                if event.error.code == "response_cancel_not_active":
+                    continue
+                self._add_message("system", f"Error: {event.error.message}")
 
     async def _handle_function_call(self, event):
         """Process function call from the AI."""
         call_id = event.call_id
         name = event.name
-        arguments = json.loads(event.arguments)
+        arguments = event.arguments
 
-        self.chat_history.append(("system", f"[Function: {name}({arguments})]"))
+        self._add_message("system", f"[Function: {name}({arguments})]")
 
-        result = execute_function(name, arguments)
+        # Parses the arguments too; failures come back as a success=False result
+        result = await self.tool_executor.execute(name, arguments)
+        self.tracer.function_call_finished(call_id)
+        stats = self.member_cache.stats()
+        print(f"[Tool cache] {name}: {stats['hits']} hits / {stats['misses']} misses")
 
-        await self.connection.conversation.item.create(
-            item={
-                "type": "function_call_output",
-                "call_id": call_id,
-                "output": json.dumps(result, ensure_ascii=False)
-            }
-        )
-        await self.connection.response.create()
+        # Logged before sending so a drop in between is covered by the reconnect replay
+        item = self.conversation.add_function_output(call_id, json.dumps(result, ensure_ascii=False))
+        if self._reconnecting or self.connection is None:
+            return
+        try:
+            await self.connection.conversation.item.create(item=item)
+            await self.connection.response.create()
+        except CONNECTION_ERRORS:
+            pass
@@ -0,0 +1,119 @@
+"""
+Per-browser Real-time sessions for the Gradio app.
+
+Each browser session (Gradio session hash) gets its own GradioRealtimeHandler, so
+callers never share a connection, chat history or audio queue. The number of
+concurrently connected callers is capped by GRADIO_MAX_SESSIONS.
+"""
+import asyncio
+import os
+import threading
+from typing import Optional
+
+from realtime_handler import GradioRealtimeHandler
+
+MAX_SESSIONS = 4
+
+
+def max_sessions() -> int:
+    """GRADIO_MAX_SESSIONS env var: maximum number of concurrently connected callers."""
+    value = os.getenv("GRADIO_MAX_SESSIONS", "").strip()
+    if not value:
+        return MAX_SESSIONS
+    return max(1, int(value))
+
+
+class SessionLimitError(Exception):
+    """Raised when a new caller would exceed the concurrent session limit."""
+
+
+class SessionManager:
+    """
+    Maps Gradio session ids to their GradioRealtimeHandler.
+
+    open() reserves a slot before connecting so parallel connects cannot overshoot
+    the limit. Lookups come from both the event loop (WebRTC, UI events) and
+    Gradio's worker threads (sync callbacks), hence the lock. A handler whose
+    connection is lost for good (failed reconnect) gives its slot back right away
+    instead of holding it until the browser tab closes.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = max_sessions() if limit is None else limit
+        self._handlers: dict[str, GradioRealtimeHandler] = {}
+        # Sessions whose WebRTC stream is running (may start before or after connect)
+        self._streams: set[str] = set()
+        # Cleanups of handlers released after losing their connection
+        self._closing: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str]) -> Optional[GradioRealtimeHandler]:
+        """Return the session's handler, or None if it has not connected."""
+        if session_id is None:
+            return None
+        with self._lock:
+            return self._handlers.get(session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._handlers)
+
+    async def open(self, session_id: str, api_key: str) -> GradioRealtimeHandler:
+        """Connect a new handler for the session, replacing any previous one."""
+        await self.close(session_id)
+        handler = GradioRealtimeHandler(api_key)
+        handler.on_closed = lambda: self._release(session_id, handler)
+        with self._lock:
+            if len(self._handlers) >= self.limit:
+                raise SessionLimitError(
+                    f"All {self.limit} voice sessions are in use. Please try again later."
+                )
+            self._handlers[session_id] = handler
+            handler.webrtc_active = session_id in self._streams
+        try:
+            await handler.connect()
+        except BaseException:
+            with self._lock:
+                if self._handlers.get(session_id) is handler:
+                    del self._handlers[session_id]
+            await handler.disconnect()
+            raise
+        return handler
+
+    def _release(self, session_id: str, handler: GradioRealtimeHandler) -> None:
+        """Free the slot of a handler that lost its connection and clean it up."""
+        with self._lock:
+            if self._handlers.get(session_id) is not handler:
+                return
+            del self._handlers[session_id]
+        task = asyncio.get_running_loop().create_task(handler.disconnect())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self, session_id: Optional[str]) -> None:
+        """Disconnect and forget the session's handler, if any."""
+        with self._lock:
+            handler = self._handlers.pop(session_id, None)
+        if handler is not None:
+            await handler.disconnect()
+
+    async def close_all(self) -> None:
+        with self._lock:
+            session_ids = list(self._handlers)
+        for session_id in session_ids:
+            await self.close(session_id)
+
+    def attach_stream(self, session_id: str) -> None:
+        """Mark the session's WebRTC stream as running (audio goes to the WebRTC queue)."""
+        with self._lock:
+            self._streams.add(session_id)
+            handler = self._handlers.get(session_id)
+            if handler is not None:
+                handler.webrtc_active = True
+
+    def detach_stream(self, session_id: str) -> None:
+        with self._lock:
+            self._streams.discard(session_id)
+            handler = self._handlers.get(session_id)
+            if handler is not None:
+                handler.webrtc_active = False
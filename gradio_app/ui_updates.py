@@ -0,0 +1,65 @@
+"""
+Change notifications from a session's handler to its browser.
+
+The handler publishes whenever the chat log, speaking status, latency table or
+fallback audio clip changes; the UI's streaming generator wakes up on those
+changes instead of polling on a timer.
+"""
+import asyncio
+import threading
+from typing import AsyncIterator, Optional
+
+
+class UiUpdates:
+    """
+    Coalescing per-session update stream.
+
+    publish() bumps a version counter and wakes the consumer; changes that arrive
+    while the consumer is still rendering fold into a single wake-up, so the UI
+    renders at most once per burst and does nothing while the session is idle.
+    publish() may be called from any thread (WebRTC emit, tool threads).
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        # (loop, event) of the consumer currently waiting in changes()
+        self._waiter: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+
+    def publish(self) -> None:
+        with self._lock:
+            self.version += 1
+            waiter = self._waiter
+        if waiter is not None:
+            loop, event = waiter
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Consumer's loop already closed
+                pass
+
+    def close(self) -> None:
+        """End the stream; the consumer stops without rendering again."""
+        self.closed = True
+        self.publish()
+
+    async def changes(self) -> AsyncIterator[int]:
+        """Yield the current version once now and again after every burst of changes."""
+        event = asyncio.Event()
+        with self._lock:
+            self._waiter = (asyncio.get_running_loop(), event)
+        seen = None
+        try:
+            while not self.closed:
+                version = self.version
+                if version == seen:
+                    await event.wait()
+                    event.clear()
+                    continue
+                seen = version
+                yield version
+        finally:
+            with self._lock:
+                if self._waiter is not None and self._waiter[1] is event:
+                    self._waiter = None
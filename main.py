@@ -36,15 +36,15 @@ def print_banner():
 
 def print_member_list():
     """테스트용 회원 목록을 출력합니다."""
-    from member_db import load_members
+    from member_db import get_store
 
     print("\n📋 테스트용 회원 목록:")
     print("-" * 60)
     print(f"{'이름':<10} {'전화번호':<15} {'생년월일':<12} {'상태':<10}")
     print("-" * 60)
 
-    members = load_members()
-    for m in members:
+    # CSV 대신 저장소(바이너리 스냅샷)에서 읽으므로 첫 함수 호출도 바로 처리됨
+    for m in get_store().iter_members():
         status_emoji = "✅" if m["status"] == "active" else "❌"
         print(f"{m['name']:<10} {m['phone']:<15} {m['birth_date']:<12} {status_emoji} {m['status']}")
 
@@ -52,28 +52,61 @@ def print_member_list():
     print("\n💡 테스트 예시: '김철수' / 뒷번호 '5678' / 생년월일 '19900515'\n")
 
 
+async def wait_for_enter() -> None:
+    """
+    Enter 입력을 기다립니다.
+
+    input()으로 이벤트 루프를 막지 않고 stdin이 읽을 수 있게 될 때 깨어나므로,
+    기다리는 동안에도 백그라운드 연결 준비가 진행됩니다.
+    """
+    loop = asyncio.get_running_loop()
+    entered = loop.create_future()
+
+    def on_input():
+        sys.stdin.readline()
+        if not entered.done():
+            entered.set_result(None)
+
+    try:
+        loop.add_reader(sys.stdin, on_input)
+    except (NotImplementedError, ValueError):
+        # 콘솔 입력을 감시할 수 없는 이벤트 루프(Windows 등)는 스레드에서 input()
+        await asyncio.to_thread(input)
+        return
+    try:
+        await entered
+    finally:
+        loop.remove_reader(sys.stdin)
+
+
 async def main():
     """메인 함수"""
     from realtime_client import RealtimeClient
 
     print_banner()
     api_key = check_requirements()
+    # 회원 목록을 보여 주고 Enter를 기다리는 동안 웹소켓 연결과 세션 설정을 미리 진행
+    client = RealtimeClient(api_key)
+    client.start_preparing()
+    await asyncio.sleep(0)
     print_member_list()
 
     print("🔊 마이크와 스피커가 연결되어 있는지 확인해주세요.")
     print("   시작하려면 Enter를 누르세요. (취소: Ctrl+C)")
 
     try:
-        input()
-    except KeyboardInterrupt:
+        await wait_for_enter()
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n프로그램을 종료합니다.")
+        await client.cleanup(report=False)
         return
 
     print("\n🚀 서비스 시작 중...\n")
-
-    client = RealtimeClient(api_key)
     await client.run()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
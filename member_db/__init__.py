@@ -1,47 +1,78 @@
 """
-회원 데이터베이스 관리 모듈 (CSV 기반)
+회원 데이터베이스 관리 모듈
+
+저장소는 MEMBER_DB_BACKEND 환경 변수로 선택합니다.
+- csv (기본): data/members.csv + 추가 전용 저널
+- sqlite: data/members.sqlite3 (없으면 CSV에서 가져옵니다)
 """
-import csv
+import functools
 import os
+import threading
 from datetime import datetime
-from typing import Optional
-
-DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "members.csv")
-
-
-def load_members() -> list[dict]:
-    """CSV에서 회원 목록을 로드합니다."""
-    members = []
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            members.append(row)
-    return members
-
-
-def save_members(members: list[dict]) -> None:
-    """회원 목록을 CSV에 저장합니다."""
-    if not members:
-        return
-    fieldnames = members[0].keys()
-    with open(DATA_PATH, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(members)
-
-
-def search_member_by_name(name: str) -> dict:
+from typing import Callable, Optional
+
+from .base import (
+    DATA_PATH,
+    MEMBER_FIELDS,
+    SQLITE_PATH,
+    MemberBackend,
+    normalize_birth_date,
+    normalize_phone_suffix,
+)
+from .csv_store import MemberStore, WithdrawalJournal, load_members, read_member_table, save_members
+from .index import HashIndex, MemberIndexes
+from .session_cache import SessionMemberCache
+from .snapshot import MappedMemberTable, MemberSnapshot
+from .table import MemberTable
+from .sqlite_store import SqliteMemberStore, import_csv
+
+_store: Optional[MemberBackend] = None
+_store_lock = threading.Lock()
+
+
+def create_store(backend: Optional[str] = None) -> MemberBackend:
+    """설정된 종류의 회원 저장소를 생성합니다."""
+    backend = (backend or os.getenv("MEMBER_DB_BACKEND", "csv")).lower()
+    if backend == "csv":
+        return MemberStore(DATA_PATH)
+    if backend == "sqlite":
+        if not os.path.exists(SQLITE_PATH):
+            import_csv(DATA_PATH, SQLITE_PATH)
+        return SqliteMemberStore(SQLITE_PATH)
+    raise ValueError(f"Unknown member DB backend: {backend}")
+
+
+def get_store() -> MemberBackend:
+    """프로세스 공용 회원 저장소를 반환합니다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store()
+    return _store
+
+
+def set_store(store: Optional[MemberBackend]) -> None:
+    """프로세스 공용 회원 저장소를 교체합니다 (None이면 다음 조회 시 재생성)."""
+    global _store
+    with _store_lock:
+        if _store is not None and _store is not store:
+            _store.close()
+        _store = store
+
+
+def search_member_by_name(name: str, store: Optional[MemberBackend] = None) -> dict:
     """
     이름으로 회원을 검색합니다.
 
     Args:
         name: 검색할 회원 이름
+        store: 사용할 저장소 (기본: get_store())
 
     Returns:
         검색 결과를 담은 딕셔너리
     """
-    members = load_members()
-    found = [m for m in members if m["name"] == name]
+    found = (store or get_store()).find_by_name(name, limit=1)
 
     if not found:
         return {
@@ -71,7 +102,8 @@ def search_member_by_name(name: str) -> dict:
     }
 
 
-def verify_member(name: str, phone_last_4: str, birth_date: str) -> dict:
+def verify_member(name: str, phone_last_4: str, birth_date: str,
+                  store: Optional[MemberBackend] = None) -> dict:
     """
     본인 인증을 수행합니다.
 
@@ -79,93 +111,100 @@ def verify_member(name: str, phone_last_4: str, birth_date: str) -> dict:
         name: 회원 이름
         phone_last_4: 전화번호 뒷 4자리
         birth_date: 생년월일 (YYYYMMDD 또는 YYYY-MM-DD)
+        store: 사용할 저장소 (기본: get_store())
 
     Returns:
         인증 결과를 담은 딕셔너리
     """
-    members = load_members()
-    found = [m for m in members if m["name"] == name]
+    store = store or get_store()
+    phone_key = normalize_phone_suffix(phone_last_4)
 
-    if not found:
+    # 정규화된 (이름, 전화번호 뒷 4자리, 생년월일) 키로 한 번에 조회
+    matches = store.find_by_credentials(name, phone_key, birth_date)
+    for member in matches:
+        if member["status"] != "withdrawn":
+            return {
+                "success": True,
+                "verified": True,
+                "message": "본인 인증이 완료되었습니다.",
+                "member_id": member["member_id"]
+            }
+
+    if matches:
         return {
             "success": False,
             "verified": False,
-            "message": f"'{name}' 님을 찾을 수 없습니다.",
+            "message": f"'{name}' 님은 이미 탈퇴한 회원입니다.",
             "member_id": None
         }
 
-    member = found[0]
-
-    if member["status"] == "withdrawn":
+    # 인증 실패 시에만 실패 사유를 구분
+    if not store.find_by_name(name, limit=1):
         return {
             "success": False,
             "verified": False,
-            "message": f"'{name}' 님은 이미 탈퇴한 회원입니다.",
+            "message": f"'{name}' 님을 찾을 수 없습니다.",
             "member_id": None
         }
 
-    # 전화번호 뒷 4자리 확인
-    actual_phone_last_4 = member["phone"].replace("-", "")[-4:]
-    if phone_last_4.replace("-", "")[-4:] != actual_phone_last_4:
+    # 흔한 이름은 동명이인이 많으므로 전화번호 뒷 4자리 목록에서 이름으로 거름
+    same_phone = [m for m in store.find_by_phone_suffix(phone_key) if m["name"] == name]
+    if any(m["status"] != "withdrawn" for m in same_phone):
         return {
             "success": True,
             "verified": False,
-            "message": "전화번호가 일치하지 않습니다.",
+            "message": "생년월일이 일치하지 않습니다.",
             "member_id": None
         }
 
-    # 생년월일 확인
-    normalized_birth = birth_date.replace("-", "").replace(".", "").replace("/", "")
-    actual_birth = member["birth_date"].replace("-", "")
-    if normalized_birth != actual_birth:
+    if same_phone:
         return {
-            "success": True,
+            "success": False,
             "verified": False,
-            "message": "생년월일이 일치하지 않습니다.",
+            "message": f"'{name}' 님은 이미 탈퇴한 회원입니다.",
             "member_id": None
         }
 
     return {
         "success": True,
-        "verified": True,
-        "message": "본인 인증이 완료되었습니다.",
-        "member_id": member["member_id"]
+        "verified": False,
+        "message": "전화번호가 일치하지 않습니다.",
+        "member_id": None
     }
 
 
-def process_withdrawal(member_id: str, reason: Optional[str] = None) -> dict:
+def process_withdrawal(member_id: str, reason: Optional[str] = None,
+                       store: Optional[MemberBackend] = None) -> dict:
     """
     회원 탈퇴를 처리합니다.
 
     Args:
         member_id: 탈퇴할 회원 ID
         reason: 탈퇴 사유 (선택)
+        store: 사용할 저장소 (기본: get_store())
 
     Returns:
         처리 결과를 담은 딕셔너리
     """
-    members = load_members()
-
-    for member in members:
-        if member["member_id"] == member_id:
-            if member["status"] == "withdrawn":
-                return {
-                    "success": False,
-                    "message": "이미 탈퇴 처리된 회원입니다."
-                }
+    # 존재/상태 확인과 변경을 저장소에서 한 번에 처리해 동시 요청에도 한 번만 탈퇴됨
+    member = (store or get_store()).update_status(member_id, "withdrawn", reason=reason)
 
-            member["status"] = "withdrawn"
-            save_members(members)
+    if member is None:
+        return {
+            "success": False,
+            "message": "해당 회원을 찾을 수 없습니다."
+        }
 
-            return {
-                "success": True,
-                "message": f"{member['name']} 님의 회원 탈퇴가 완료되었습니다. 그동안 이용해 주셔서 감사합니다.",
-                "withdrawn_at": datetime.now().isoformat()
-            }
+    if member["status"] == "withdrawn":
+        return {
+            "success": False,
+            "message": "이미 탈퇴 처리된 회원입니다."
+        }
 
     return {
-        "success": False,
-        "message": "해당 회원을 찾을 수 없습니다."
+        "success": True,
+        "message": f"{member['name']} 님의 회원 탈퇴가 완료되었습니다. 그동안 이용해 주셔서 감사합니다.",
+        "withdrawn_at": datetime.now().isoformat()
     }
 
 
@@ -239,8 +278,13 @@ FUNCTION_MAP = {
 }
 
 
-def execute_function(name: str, arguments: dict) -> dict:
+def session_functions(store: MemberBackend) -> dict[str, Callable]:
+    """주어진 저장소(예: 세션 캐시)를 사용하도록 묶은 FUNCTION_MAP을 반환합니다."""
+    return {name: functools.partial(function, store=store) for name, function in FUNCTION_MAP.items()}
+
+
+def execute_function(name: str, arguments: dict, store: Optional[MemberBackend] = None) -> dict:
     """Function calling 결과를 실행합니다."""
     if name in FUNCTION_MAP:
-        return FUNCTION_MAP[name](**arguments)
+        return FUNCTION_MAP[name](**arguments, store=store)
     return {"error": f"Unknown function: {name}"}
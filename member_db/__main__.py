@@ -0,0 +1,30 @@
+"""
+회원 데이터베이스 관리 명령
+
+사용법:
+    python -m member_db import-sqlite [CSV 경로] [DB 경로]
+"""
+import os
+import sys
+
+from . import DATA_PATH, SQLITE_PATH, import_csv
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] != "import-sqlite":
+        print(__doc__.strip())
+        return 1
+
+    src = argv[1] if len(argv) > 1 else DATA_PATH
+    dst = argv[2] if len(argv) > 2 else SQLITE_PATH
+    if os.path.exists(dst):
+        print(f"❌ 이미 존재하는 데이터베이스입니다: {dst}")
+        return 1
+
+    imported = import_csv(src, dst)
+    print(f"✓ {imported}명의 회원을 {dst}로 가져왔습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,78 @@
+"""
+회원 저장소 공통 정의 (경로, 백엔드 인터페이스)
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DATA_PATH = os.path.join(_DATA_DIR, "members.csv")
+SQLITE_PATH = os.path.join(_DATA_DIR, "members.sqlite3")
+
+# 조회 결과로 돌려주는 회원 필드 (CSV 헤더와 동일)
+MEMBER_FIELDS = (
+    "member_id", "name", "phone", "email", "birth_date", "registered_at", "status"
+)
+
+
+def normalize_phone_suffix(phone: str) -> str:
+    """전화번호에서 숫자만 남기고 뒷 4자리를 반환합니다."""
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    return digits[-4:]
+
+
+def normalize_birth_date(birth_date: str) -> str:
+    """생년월일(YYYY-MM-DD, YYYY.MM.DD, YYYYMMDD 등)을 YYYYMMDD로 정규화합니다."""
+    return "".join(ch for ch in birth_date if ch.isdigit())
+
+
+def credential_key(name: str, phone: str, birth_date: str) -> tuple[str, str, str]:
+    """본인 인증 인덱스 키 (이름, 전화번호 뒷 4자리, 생년월일 YYYYMMDD)를 만듭니다."""
+    return name, normalize_phone_suffix(phone), normalize_birth_date(birth_date)
+
+
+class MemberBackend(ABC):
+    """
+    회원 저장소 백엔드 인터페이스입니다.
+
+    조회 메서드는 MEMBER_FIELDS 키를 가진 딕셔너리를 반환하며,
+    search_member_by_name / verify_member / process_withdrawal 은
+    이 인터페이스만 사용합니다. close()를 뺀 메서드는 구현체가 모두 정의해야 합니다.
+    """
+
+    @abstractmethod
+    def get(self, member_id: str) -> Optional[dict]:
+        """member_id로 회원을 조회합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> list[dict]:
+        """이름이 일치하는 회원 목록을 (최대 limit명) 반환합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_phone_suffix(self, phone: str) -> list[dict]:
+        """전화번호 뒷 4자리가 일치하는 회원 목록을 반환합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_credentials(self, name: str, phone: str, birth_date: str) -> list[dict]:
+        """이름, 전화번호 뒷 4자리, 생년월일이 모두 일치하는 회원 목록을 반환합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_members(self) -> Iterator[dict]:
+        """전체 회원을 저장 순서대로 반환합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_status(self, member_id: str, status: str, **extra) -> Optional[dict]:
+        """
+        회원 상태를 원자적으로 변경하고 변경 전 회원 정보를 반환합니다.
+
+        이미 같은 상태이면 아무것도 기록하지 않으며, 회원이 없으면 None을 반환합니다.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """보유한 파일/연결을 정리합니다."""
@@ -0,0 +1,140 @@
+"""
+회원 저장소 쓰기 직렬화 도구
+
+- FileLock: 여러 프로세스가 같은 데이터 파일에 쓰지 않도록 거는 파일 잠금
+- GroupCommitQueue: 쓰기 요청을 단일 writer 스레드로 모아, 짧은 시간 안에 들어온
+  요청들을 한 번의 디스크 동기화로 커밋합니다 (group commit).
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 잠금만 사용
+    fcntl = None
+
+# 첫 요청 이후 같은 묶음으로 모을 최대 대기 시간(초)과 묶음 크기
+GROUP_COMMIT_WINDOW = 0.002
+GROUP_COMMIT_MAX_BATCH = 256
+
+_STOP = object()
+
+
+class FileLock:
+    """
+    `<path>` 파일에 대한 배타적 잠금입니다 (with 문으로 사용).
+
+    flock은 같은 프로세스의 스레드끼리는 배타적이지 않으므로 스레드 잠금을 함께 겁니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fh = None
+
+    def __enter__(self) -> "FileLock":
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            try:
+                self._fh = open(self.path, "a")
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                self._release_file()
+                self._thread_lock.release()
+                raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._release_file()
+        self._thread_lock.release()
+
+    def _release_file(self) -> None:
+        if self._fh is not None:
+            try:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            finally:
+                self._fh.close()
+                self._fh = None
+
+
+class GroupCommitQueue:
+    """
+    쓰기 요청을 모아 commit_batch(requests) 한 번으로 커밋하는 단일 writer 큐입니다.
+
+    commit_batch는 요청 목록을 받아 같은 순서의 결과 목록을 반환해야 하며,
+    writer 스레드에서만 호출되므로 별도의 쓰기 잠금이 필요 없습니다.
+    """
+
+    def __init__(
+        self,
+        commit_batch: Callable[[list], list],
+        window: float = GROUP_COMMIT_WINDOW,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        name: str = "member-db-writer",
+    ):
+        self._commit_batch = commit_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, request: Any) -> Future:
+        """요청을 큐에 넣고 커밋 결과를 받을 Future를 반환합니다."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+        future: Future = Future()
+        self._queue.put((request, future))
+        return future
+
+    def _collect(self) -> tuple[list, bool]:
+        """첫 요청을 기다린 뒤 window 동안 들어온 요청을 묶어 반환합니다."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if not batch:
+                continue
+            requests = [request for request, _ in batch]
+            try:
+                results = self._commit_batch(requests)
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def close(self) -> None:
+        """남은 요청을 모두 커밋한 뒤 writer 스레드를 종료합니다."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,457 @@
+"""
+CSV 파일 기반 회원 저장소 구현
+"""
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .base import DATA_PATH, MEMBER_FIELDS, MemberBackend, normalize_phone_suffix
+from .commit import FileLock, GroupCommitQueue
+from .index import MemberIndexes, credential_hash, hash_key
+from .snapshot import MemberSnapshot, write_snapshot_file
+from .table import MemberTable, encode_date
+
+
+class LoadedMembers(list):
+    """
+    load_members 결과 (list[dict])에 읽은 시점의 CSV 서명과 저널 위치를 붙인 것입니다.
+
+    save_members는 이 위치 이후의 저널 레코드만 새로 반영합니다.
+    """
+
+    def __init__(self, members: list[dict], signature: tuple[int, int], journal_offset: int):
+        super().__init__(members)
+        self.signature = signature
+        self.journal_offset = journal_offset
+
+
+def file_signature(path: str) -> tuple[int, int]:
+    """CSV가 바뀌었는지 판단하는 (mtime_ns, 크기)."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _apply_records(members: list[dict], records: list[dict]) -> None:
+    if not records:
+        return
+    by_id = {member["member_id"]: member for member in members}
+    for record in records:
+        member = by_id.get(record["member_id"])
+        if member is not None:
+            member["status"] = record["status"]
+
+
+def load_members(path: Optional[str] = None) -> LoadedMembers:
+    """
+    CSV에서 회원 목록을 로드하고 탈퇴 저널(`<csv>.journal`)을 반영합니다.
+
+    압축(CSV 교체 + 저널 비우기) 도중의 상태를 읽지 않도록 파일 잠금을 잡고 읽습니다.
+    """
+    path = path or DATA_PATH
+    with FileLock(f"{path}.lock"):
+        signature = file_signature(path)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            members = list(csv.DictReader(f))
+        records, offset = WithdrawalJournal(f"{path}.journal").read_from(0)
+    _apply_records(members, records)
+    return LoadedMembers(members, signature, offset)
+
+
+def save_members(members: list[dict], path: Optional[str] = None) -> None:
+    """
+    회원 목록 전체를 CSV에 저장합니다.
+
+    파일 잠금 안에서, members를 읽은 뒤 저널에 추가된 상태 변경(실행 중인 MemberStore의
+    탈퇴 처리 등)을 members에 다시 반영하고 CSV를 원자적으로 교체한 다음, 반영한
+    저널만 비웁니다. members가 load_members 결과가 아니면 저널 전체를 새 변경으로 봅니다.
+    실행 중인 MemberStore는 CSV가 바뀐 것을 보고 다시 로드합니다.
+
+    Raises:
+        RuntimeError: load_members 이후 다른 저장이나 압축으로 CSV가 교체된 경우
+            (읽은 저널 위치가 더 이상 맞지 않으므로 다시 불러와 수정해야 함)
+    """
+    if not members:
+        return
+    path = path or DATA_PATH
+    loaded = isinstance(members, LoadedMembers)
+    fieldnames = list(members[0].keys())
+    tmp_path = f"{path}.{os.getpid()}.save"
+    with FileLock(f"{path}.lock"):
+        if loaded and file_signature(path) != members.signature:
+            raise RuntimeError(f"{path} changed since load_members(); reload and retry")
+        journal = WithdrawalJournal(f"{path}.journal")
+        records, offset = journal.read_from(members.journal_offset if loaded else 0)
+        _apply_records(members, records)
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(members)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        journal.discard_until(offset)
+        if loaded:
+            members.signature = file_signature(path)
+            members.journal_offset = 0
+
+
+def write_snapshot(members: Iterable[dict], path: str,
+                   fieldnames: Sequence[str] = MEMBER_FIELDS) -> None:
+    """회원 목록을 CSV로 쓰고 디스크에 동기화합니다 (rename 전 임시 파일용)."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(members)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_member_table(path: Optional[str] = None) -> MemberTable:
+    """CSV에서 회원 목록을 컬럼 기반 MemberTable로 로드합니다 (추가 컬럼과 헤더 순서 유지)."""
+    with open(path or DATA_PATH, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or list(MEMBER_FIELDS)
+        table = MemberTable(header)
+        columns = [header.index(field) for field in MEMBER_FIELDS + table.extra_fields]
+        for values in reader:
+            if values:
+                table.append(*(values[i] for i in columns))
+    return table
+
+
+class WithdrawalJournal:
+    """
+    회원 상태 변경을 한 줄씩 덧붙이는 추가 전용(append-only) 저널입니다.
+
+    각 레코드는 JSON 한 줄이며 기록할 때마다 fsync 하므로, 탈퇴 처리 비용이
+    회원 수와 무관하게 일정합니다. 레코드는 멱등(상태 덮어쓰기)이라
+    같은 레코드를 여러 번 재생해도 결과가 같습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def _ensure_open(self) -> None:
+        # 다른 프로세스가 압축해 파일이 교체되었으면 새 파일을 다시 엽니다
+        if self._fh is not None:
+            try:
+                current = os.stat(self.path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(self._fh.fileno()).st_ino:
+                self.close()
+        if self._fh is None:
+            self._fh = open(self.path, "ab")
+
+    def append(self, record: dict) -> None:
+        """레코드를 저널 끝에 추가하고 디스크에 동기화합니다."""
+        self.append_many([record])
+
+    def append_many(self, records: list[dict]) -> None:
+        """여러 레코드를 한 번의 쓰기와 한 번의 fsync로 추가합니다."""
+        self._ensure_open()
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        self._fh.write(data.encode("utf-8"))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def read_from(self, offset: int) -> tuple[list[dict], int]:
+        """offset 이후의 완전한 레코드들과 다음 읽기 위치를 반환합니다."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        records = []
+        consumed = 0
+        for line in data.splitlines(keepends=True):
+            # 기록 도중 중단되어 개행이 없는 마지막 줄은 무시
+            if not line.endswith(b"\n"):
+                break
+            consumed += len(line)
+            if line.strip():
+                records.append(json.loads(line))
+        return records, offset + consumed
+
+    def discard_until(self, offset: int) -> None:
+        """offset 이전 레코드를 버리고 나머지만 남깁니다 (원자적 교체)."""
+        self.close()
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class MemberStore(MemberBackend):
+    """
+    회원 CSV를 한 번만 로드해 메모리에 보관하고 조회용 인덱스를 유지합니다.
+
+    회원은 컬럼 기반 테이블에 보관하며, member_id, 이름, 전화번호 뒷 4자리,
+    본인 인증 키(이름, 뒷 4자리, 생년월일)로 행 번호 해시 인덱스를 만듭니다.
+    CSV 파일의 수정 시각(mtime)이 바뀌면 다음 조회 시 다시 로드합니다.
+
+    use_snapshot이 켜져 있으면 테이블과 인덱스를 `<csv>.bin` 바이너리 스냅샷으로
+    저장해 두고, 이후 프로세스는 CSV를 파싱하지 않고 스냅샷을 mmap 해서 씁니다.
+    스냅샷은 CSV가 바뀐 경우에만 다시 만듭니다.
+
+    상태 변경은 CSV를 다시 쓰지 않고 저널(`<csv>.journal`)에 추가되며,
+    로드 시 기본 CSV 위에 재생됩니다. 쓰기는 단일 writer 스레드가 파일 잠금
+    (`<csv>.lock`)을 잡고 묶음 단위로 커밋합니다 (group commit).
+    저널이 COMPACT_THRESHOLD 건을 넘으면 백그라운드에서 새 CSV 스냅샷으로 압축합니다.
+    """
+
+    COMPACT_THRESHOLD = 1000
+
+    def __init__(self, path: Optional[str] = None, use_snapshot: bool = True):
+        self.path = path or DATA_PATH
+        self.snapshot_path = f"{self.path}.bin"
+        self.use_snapshot = use_snapshot
+        self.journal = WithdrawalJournal(f"{self.path}.journal")
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(f"{self.path}.lock")
+        self._commits = GroupCommitQueue(self._commit_batch)
+        self._signature = None
+        self._journal_offset = 0
+        self._pending_records = 0
+        self._compact_thread = None
+        self.table = MemberTable()
+        self.indexes = MemberIndexes.empty()
+
+    def _file_signature(self) -> tuple[int, int]:
+        return file_signature(self.path)
+
+    def reload(self) -> None:
+        """스냅샷 또는 CSV에서 테이블과 인덱스를 다시 만들고 저널을 재생합니다."""
+        with self._lock:
+            signature = self._file_signature()
+            snapshot = None
+            if self.use_snapshot:
+                snapshot = MemberSnapshot.open(self.snapshot_path, signature)
+
+            if snapshot is None:
+                table = read_member_table(self.path)
+                indexes = MemberIndexes.build(table)
+                if self.use_snapshot:
+                    snapshot = self._write_snapshot(table, indexes, signature)
+
+            if snapshot is not None:
+                # 힙의 테이블 대신 mmap 된 스냅샷을 사용 (페이지 캐시를 프로세스 간 공유)
+                table, indexes = snapshot.table, snapshot.indexes
+
+            self.table = table
+            self.indexes = indexes
+            self._signature = signature
+            self._journal_offset = 0
+            self._pending_records = 0
+            self._replay_journal()
+
+    def _write_snapshot(self, table, indexes: MemberIndexes,
+                        signature: tuple[int, int]) -> Optional[MemberSnapshot]:
+        try:
+            write_snapshot_file(self.snapshot_path, table, indexes, signature)
+        except OSError:
+            # 데이터 디렉터리에 쓸 수 없으면 스냅샷 없이 동작
+            return None
+        return MemberSnapshot.open(self.snapshot_path, signature)
+
+    def _replay_journal(self) -> None:
+        """아직 반영하지 않은 저널 레코드를 메모리에 적용합니다."""
+        records, self._journal_offset = self.journal.read_from(self._journal_offset)
+        for record in records:
+            row = self._row_of(record["member_id"])
+            if row is not None:
+                self.table.set_status(row, record["status"])
+        self._pending_records += len(records)
+
+    def refresh(self) -> None:
+        """파일이 변경되었거나 아직 로드되지 않았다면 다시 로드합니다."""
+        with self._lock:
+            if self._signature is None or self._file_signature() != self._signature:
+                self.reload()
+                return
+            journal_size = self.journal.size()
+            if journal_size < self._journal_offset:
+                # 다른 프로세스가 압축해 저널이 줄어든 경우
+                self.reload()
+            elif journal_size > self._journal_offset:
+                self._replay_journal()
+
+    def _row_of(self, member_id: str) -> Optional[int]:
+        for row in self.indexes.by_id.lookup(hash_key(member_id)):
+            if self.table.member_id(row) == member_id:
+                return row
+        return None
+
+    def get(self, member_id: str) -> Optional[dict]:
+        """member_id로 회원을 조회합니다."""
+        with self._lock:
+            self.refresh()
+            row = self._row_of(member_id)
+            return None if row is None else self.table.row(row)
+
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> list[dict]:
+        """이름이 일치하는 회원 목록을 (최대 limit명) 반환합니다."""
+        with self._lock:
+            self.refresh()
+            table = self.table
+            found = []
+            for row in self.indexes.by_name.lookup(hash_key(name)):
+                if limit is not None and len(found) >= limit:
+                    break
+                if table.name(row) == name:
+                    found.append(table.row(row))
+            return found
+
+    def find_by_phone_suffix(self, phone: str) -> list[dict]:
+        """전화번호 뒷 4자리가 일치하는 회원 목록을 반환합니다."""
+        suffix = normalize_phone_suffix(phone)
+        with self._lock:
+            self.refresh()
+            table = self.table
+            return [
+                table.row(row) for row in self.indexes.by_phone_suffix.lookup(hash_key(suffix))
+                if normalize_phone_suffix(table.phone(row)) == suffix
+            ]
+
+    def find_by_credentials(self, name: str, phone: str, birth_date: str) -> list[dict]:
+        """이름, 전화번호 뒷 4자리, 생년월일이 모두 일치하는 회원 목록을 반환합니다."""
+        suffix = normalize_phone_suffix(phone)
+        birth_ymd = encode_date(birth_date)
+        key_hash = credential_hash(name, suffix, birth_ymd)
+        with self._lock:
+            self.refresh()
+            table = self.table
+            return [
+                table.row(row) for row in self.indexes.by_credentials.lookup(key_hash)
+                if table.name(row) == name
+                and table.birth_ymd(row) == birth_ymd
+                and normalize_phone_suffix(table.phone(row)) == suffix
+            ]
+
+    def iter_members(self) -> Iterator[dict]:
+        """전체 회원을 저장 순서대로 반환합니다."""
+        with self._lock:
+            self.refresh()
+            table = self.table
+        yield from table.rows()
+
+    def update_status(self, member_id: str, status: str, **extra) -> Optional[dict]:
+        """회원 상태 변경을 writer 큐에 넣고 저널에 커밋될 때까지 기다립니다."""
+        return self._commits.submit((member_id, status, extra)).result()
+
+    def _commit_batch(self, requests: list[tuple[str, str, dict]]) -> list[Optional[dict]]:
+        """
+        writer 스레드에서 상태 변경 묶음을 검사하고 저널에 한 번에 기록합니다.
+
+        파일 잠금으로 다른 프로세스의 쓰기와 직렬화하며, 잠금을 잡은 뒤
+        저널을 다시 읽어 다른 프로세스가 먼저 바꾼 상태를 반영하고 검사합니다.
+        """
+        with self._file_lock:
+            with self._lock:
+                self.refresh()
+                results = []
+                records = []
+                batch_status: dict[str, str] = {}
+                for member_id, status, extra in requests:
+                    row = self._row_of(member_id)
+                    if row is None:
+                        results.append(None)
+                        continue
+                    previous = self.table.row(row)
+                    previous["status"] = batch_status.get(member_id, previous["status"])
+                    results.append(previous)
+                    if previous["status"] == status:
+                        continue
+                    batch_status[member_id] = status
+                    records.append({
+                        "member_id": member_id,
+                        "status": status,
+                        "at": datetime.now().isoformat(),
+                        **extra,
+                    })
+
+            # fsync 하는 동안에도 조회는 계속되도록 메모리 잠금 밖에서 기록
+            if records:
+                self.journal.append_many(records)
+
+            with self._lock:
+                self._replay_journal()
+                if self._pending_records >= self.COMPACT_THRESHOLD:
+                    self._schedule_compaction()
+        return results
+
+    def _schedule_compaction(self) -> None:
+        if self._compact_thread is not None and self._compact_thread.is_alive():
+            return
+        self._compact_thread = threading.Thread(
+            target=self.compact, name="member-journal-compact", daemon=True
+        )
+        self._compact_thread.start()
+
+    def compact(self) -> None:
+        """저널을 반영한 새 CSV(와 바이너리) 스냅샷을 만들고 반영된 저널을 비웁니다."""
+        with self._lock:
+            self.refresh()
+            table = self.table.copy()
+            indexes = self.indexes
+            offset = self._journal_offset
+            start_signature = self._signature
+        if not len(table):
+            return
+
+        # 오래 걸리는 스냅샷 기록은 잠금 밖에서 수행
+        # 여러 프로세스가 동시에 압축할 수 있으므로 임시 파일은 프로세스별로 둠
+        tmp_path = f"{self.path}.{os.getpid()}.snapshot"
+        write_snapshot(table.rows(), tmp_path, table.fields)
+
+        with self._file_lock, self._lock:
+            if self._file_signature() != start_signature:
+                # 그 사이 다른 프로세스가 먼저 압축함
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, self.path)
+            self.journal.discard_until(offset)
+            self._signature = self._file_signature()
+            self._journal_offset -= offset
+            self._pending_records = 0
+            signature = self._signature
+
+        # 상태는 인덱스에 포함되지 않으므로 기존 인덱스를 그대로 기록
+        if self.use_snapshot:
+            try:
+                write_snapshot_file(self.snapshot_path, table, indexes, signature)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """남은 쓰기와 백그라운드 압축을 기다리고 저널 파일을 닫습니다."""
+        self._commits.close()
+        if self._compact_thread is not None:
+            self._compact_thread.join()
+        with self._lock:
+            self.journal.close()
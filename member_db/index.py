@@ -0,0 +1,153 @@
+"""
+회원 조회용 평면(flat) 해시 인덱스
+
+인덱스는 정수 array 네 개로만 이루어져 있어 그대로 파일에 쓰고 mmap으로
+다시 열 수 있습니다 (딕셔너리를 역직렬화할 필요가 없음).
+
+- slot_hashes / slot_starts / slot_counts: 오픈 어드레싱 해시 테이블 슬롯
+- postings: 같은 키를 가진 행 번호들을 키별로 모아 둔 배열
+
+키 해시는 프로세스와 무관하게 같아야 하므로 blake2b 64비트를 사용합니다.
+해시가 충돌할 수 있으므로 조회 결과는 호출 측에서 실제 값과 비교해 거릅니다.
+"""
+from array import array
+from hashlib import blake2b
+from typing import Sequence
+
+from .base import normalize_phone_suffix
+
+EMPTY = ()
+
+
+def hash_key(key: str) -> int:
+    """문자열 키의 64비트 해시를 반환합니다."""
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def credential_hash(name: str, phone: str, birth_ymd: int) -> int:
+    """본인 인증 키 (이름, 전화번호 뒷 4자리, 생년월일 YYYYMMDD)의 해시를 반환합니다."""
+    return hash_key(f"{name}\x1f{normalize_phone_suffix(phone)}\x1f{birth_ymd:08d}")
+
+
+class HashIndex:
+    """키 해시 → 행 번호 목록을 찾는 해시 인덱스입니다."""
+
+    __slots__ = ("slot_hashes", "slot_starts", "slot_counts", "postings", "_mask")
+
+    def __init__(self, slot_hashes: Sequence[int], slot_starts: Sequence[int],
+                 slot_counts: Sequence[int], postings: Sequence[int]):
+        self.slot_hashes = slot_hashes
+        self.slot_starts = slot_starts
+        self.slot_counts = slot_counts
+        self.postings = postings
+        self._mask = len(slot_hashes) - 1
+
+    @classmethod
+    def build(cls, hashes: Sequence[int]) -> "HashIndex":
+        """
+        행 순서대로 나열된 키 해시들로 인덱스를 만듭니다.
+
+        키별 목록을 만들지 않고 슬롯 배열만으로 두 번 훑습니다 (1차: 키별 행 수,
+        2차: postings 채우기). 수천만 행에서도 인덱스 크기 외의 메모리를 거의 쓰지 않습니다.
+        """
+        # 1차: 키별 행 수를 세면서, 적재율이 50%를 넘으면 슬롯 배열을 두 배로 키움
+        size = 8
+        slot_hashes = array("Q", bytes(8 * size))
+        slot_counts = array("I", bytes(4 * size))
+        used = 0
+        for key_hash in hashes:
+            mask = size - 1
+            slot = key_hash & mask
+            while slot_counts[slot] and slot_hashes[slot] != key_hash:
+                slot = (slot + 1) & mask
+            if not slot_counts[slot]:
+                slot_hashes[slot] = key_hash
+                used += 1
+            slot_counts[slot] += 1
+            if used * 2 > size:
+                size *= 2
+                slot_hashes, slot_counts = cls._rehash(slot_hashes, slot_counts, size)
+
+        slot_starts = array("I", bytes(4 * size))
+        start = 0
+        for slot in range(size):
+            slot_starts[slot] = start
+            start += slot_counts[slot]
+
+        # 2차: 키별 구간에 행 번호를 오름차순으로 채움
+        index = cls(slot_hashes, slot_starts, slot_counts, array("I", bytes(4 * start)))
+        cursors = array("I", slot_starts)
+        postings = index.postings
+        for row, key_hash in enumerate(hashes):
+            slot = index._slot(key_hash)
+            postings[cursors[slot]] = row
+            cursors[slot] += 1
+        return index
+
+    @staticmethod
+    def _rehash(slot_hashes: array, slot_counts: array, size: int) -> tuple[array, array]:
+        mask = size - 1
+        new_hashes = array("Q", bytes(8 * size))
+        new_counts = array("I", bytes(4 * size))
+        for key_hash, count in zip(slot_hashes, slot_counts):
+            if count:
+                slot = key_hash & mask
+                while new_counts[slot]:
+                    slot = (slot + 1) & mask
+                new_hashes[slot] = key_hash
+                new_counts[slot] = count
+        return new_hashes, new_counts
+
+    def _slot(self, key_hash: int) -> int:
+        """키 해시가 있는 (없으면 비어 있는) 슬롯 번호를 반환합니다."""
+        mask = self._mask
+        slot = key_hash & mask
+        while self.slot_counts[slot] and self.slot_hashes[slot] != key_hash:
+            slot = (slot + 1) & mask
+        return slot
+
+    def lookup(self, key_hash: int) -> Sequence[int]:
+        """키 해시에 해당하는 행 번호들을 반환합니다."""
+        slot = self._slot(key_hash)
+        count = self.slot_counts[slot]
+        if not count:
+            return EMPTY
+        start = self.slot_starts[slot]
+        return self.postings[start:start + count]
+
+
+class MemberIndexes:
+    """MemberStore가 사용하는 인덱스 묶음입니다."""
+
+    NAMES = ("by_id", "by_name", "by_phone_suffix", "by_credentials")
+
+    __slots__ = NAMES
+
+    def __init__(self, by_id: HashIndex, by_name: HashIndex,
+                 by_phone_suffix: HashIndex, by_credentials: HashIndex):
+        self.by_id = by_id
+        self.by_name = by_name
+        self.by_phone_suffix = by_phone_suffix
+        self.by_credentials = by_credentials
+
+    @classmethod
+    def build(cls, table) -> "MemberIndexes":
+        """테이블의 모든 행에 대해 인덱스를 만듭니다."""
+        ids, names, phones, credentials = (array("Q") for _ in range(4))
+        for row in range(len(table)):
+            name = table.name(row)
+            phone = table.phone(row)
+            ids.append(hash_key(table.member_id(row)))
+            names.append(hash_key(name))
+            phones.append(hash_key(normalize_phone_suffix(phone)))
+            credentials.append(credential_hash(name, phone, table.birth_ymd(row)))
+        return cls(
+            HashIndex.build(ids),
+            HashIndex.build(names),
+            HashIndex.build(phones),
+            HashIndex.build(credentials),
+        )
+
+    @classmethod
+    def empty(cls) -> "MemberIndexes":
+        return cls.build(())
@@ -0,0 +1,108 @@
+"""
+대화 세션 단위 회원 조회 캐시
+
+탈퇴 시나리오는 한 세션 안에서 search_member_by_name → verify_member →
+process_withdrawal 순서로 같은 회원을 반복 조회합니다. SessionMemberCache는
+저장소 앞에 두는 MemberBackend로, 세션 동안 조회 결과를 기억하고
+이 세션에서 쓰기가 일어나면 전부 비웁니다.
+
+다른 세션/프로세스의 쓰기는 알 수 없으므로 항목은 SESSION_CACHE_TTL 초 후 만료됩니다.
+상태 변경 자체는 항상 저장소의 update_status가 판단하므로, 오래된 조회 결과로
+중복 탈퇴가 일어나지는 않습니다.
+"""
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from .base import MemberBackend, credential_key
+
+SESSION_CACHE_TTL = 30.0
+
+
+class SessionMemberCache(MemberBackend):
+    """
+    저장소 조회 결과를 세션 동안 기억하는 캐시입니다.
+
+    store를 주지 않으면 호출할 때마다 get_store()의 현재 저장소를 사용합니다.
+    hits / misses / invalidations 카운터로 캐시 효과를 확인할 수 있습니다.
+    """
+
+    def __init__(self, store: Optional[MemberBackend] = None, ttl: float = SESSION_CACHE_TTL):
+        self._store = store
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def store(self) -> MemberBackend:
+        if self._store is not None:
+            return self._store
+        from . import get_store
+        return get_store()
+
+    def _cached(self, key: tuple, load: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = load()
+        with self._lock:
+            self._entries[key] = (now, value)
+        return value
+
+    def get(self, member_id: str) -> Optional[dict]:
+        member = self._cached(("get", member_id), lambda: self.store.get(member_id))
+        return None if member is None else dict(member)
+
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> list[dict]:
+        found = self._cached(
+            ("name", name, limit), lambda: self.store.find_by_name(name, limit=limit)
+        )
+        return [dict(member) for member in found]
+
+    def find_by_phone_suffix(self, phone: str) -> list[dict]:
+        _, suffix, _ = credential_key("", phone, "")
+        found = self._cached(("phone", suffix), lambda: self.store.find_by_phone_suffix(suffix))
+        return [dict(member) for member in found]
+
+    def find_by_credentials(self, name: str, phone: str, birth_date: str) -> list[dict]:
+        key = credential_key(name, phone, birth_date)
+        found = self._cached(
+            ("credentials", *key), lambda: self.store.find_by_credentials(name, phone, birth_date)
+        )
+        return [dict(member) for member in found]
+
+    def iter_members(self) -> Iterator[dict]:
+        """전체 순회는 캐시하지 않고 저장소에 그대로 위임합니다."""
+        return self.store.iter_members()
+
+    def update_status(self, member_id: str, status: str, **extra) -> Optional[dict]:
+        """저장소에 상태 변경을 커밋하고 세션 캐시를 비웁니다."""
+        try:
+            return self.store.update_status(member_id, status, **extra)
+        finally:
+            self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+        }
+
+    def close(self) -> None:
+        """캐시만 비웁니다 (공유 저장소는 닫지 않음)."""
+        self.clear()
@@ -0,0 +1,298 @@
+"""
+회원 테이블의 메모리 매핑(mmap) 바이너리 스냅샷
+
+CSV 옆에 `<csv>.bin` 파일로 저장하며, 새 프로세스는 CSV를 파싱하지 않고
+이 파일을 mmap 해서 바로 조회를 시작합니다. 파일 구성:
+
+    MAGIC(8) | 헤더 길이(4) | JSON 헤더 | (8바이트 정렬) 섹션들
+
+- records: 고정 폭 레코드 (member_id, 이름, 전화번호, 이메일, 추가 컬럼들,
+  생년월일, 가입일, 상태 코드). 문자열 폭은 데이터의 최대 길이로 정합니다.
+  정수로 압축할 수 없는 날짜 값은 헤더의 raw_dates에 원래 문자열로 둡니다.
+- <인덱스>.<배열>: HashIndex를 이루는 정수 배열들
+
+헤더에는 원본 CSV의 (mtime_ns, size)가 기록되어 있어, CSV가 바뀌었으면
+스냅샷을 버리고 다시 만듭니다.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Iterator, Optional, Sequence
+
+from .base import MEMBER_FIELDS
+from .index import HashIndex, MemberIndexes
+from .table import DATE_FIELDS, decode_date, encode_date, pack_date
+
+MAGIC = b"MBRSNAP1"
+VERSION = 2
+_INDEX_ARRAYS = (
+    ("slot_hashes", "Q"), ("slot_starts", "I"), ("slot_counts", "I"), ("postings", "I"),
+)
+# member_id, 이름, 전화번호, 이메일(과 추가 컬럼)은 가변 폭 문자열, 나머지는 정수
+_STRING_FIELDS = 4
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _record_struct(widths: list[int]) -> struct.Struct:
+    return struct.Struct("<" + "".join(f"{w}s" for w in widths) + "IIB")
+
+
+class MappedMemberTable:
+    """
+    스냅샷의 고정 폭 레코드를 읽는 MemberTable 호환 테이블입니다.
+
+    레코드 영역은 읽기 전용이므로, 저널로 바뀐 상태는 행 번호별 덮어쓰기로 보관합니다.
+    """
+
+    def __init__(self, records: memoryview, count: int, widths: list[int], statuses: list[str],
+                 fields: Sequence[str] = MEMBER_FIELDS,
+                 raw_dates: Optional[dict[str, dict[int, str]]] = None):
+        self._records = records
+        self._count = count
+        self._widths = widths
+        self._struct = _record_struct(widths)
+        self.fields = tuple(fields)
+        self.extra_fields = tuple(field for field in self.fields if field not in MEMBER_FIELDS)
+        # 레코드에서 문자열 필드 뒤 생년월일(정수)의 위치
+        self._dates = len(widths)
+        self.raw_dates = raw_dates or {field: {} for field in DATE_FIELDS}
+        self.statuses = list(statuses)
+        self._status_overrides: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _unpack(self, row: int) -> tuple:
+        return self._struct.unpack_from(self._records, row * self._struct.size)
+
+    @staticmethod
+    def _text(value: bytes) -> str:
+        return value.rstrip(b"\0").decode("utf-8")
+
+    def _date(self, field: str, packed: int, row: int) -> str:
+        return decode_date(packed) if packed else self.raw_dates[field].get(row, "")
+
+    def member_id(self, row: int) -> str:
+        return self._text(self._unpack(row)[0])
+
+    def name(self, row: int) -> str:
+        return self._text(self._unpack(row)[1])
+
+    def phone(self, row: int) -> str:
+        return self._text(self._unpack(row)[2])
+
+    def birth_ymd(self, row: int) -> int:
+        packed = self._unpack(row)[self._dates]
+        if packed:
+            return packed
+        raw = self.raw_dates["birth_date"].get(row)
+        return encode_date(raw) if raw else 0
+
+    def status_code(self, status: str) -> int:
+        try:
+            return self.statuses.index(status)
+        except ValueError:
+            self.statuses.append(status)
+            return len(self.statuses) - 1
+
+    def status(self, row: int) -> str:
+        code = self._status_overrides.get(row)
+        if code is None:
+            code = self._unpack(row)[self._dates + 2]
+        return self.statuses[code]
+
+    def set_status(self, row: int, status: str) -> None:
+        self._status_overrides[row] = self.status_code(status)
+
+    def row(self, row: int) -> dict:
+        values = self._unpack(row)
+        dates = self._dates
+        code = self._status_overrides.get(row, values[dates + 2])
+        member = dict(zip(MEMBER_FIELDS, (
+            *(self._text(v) for v in values[:_STRING_FIELDS]),
+            self._date("birth_date", values[dates], row),
+            self._date("registered_at", values[dates + 1], row),
+            self.statuses[code],
+        )))
+        for field, value in zip(self.extra_fields, values[_STRING_FIELDS:dates]):
+            member[field] = self._text(value)
+        return member
+
+    def rows(self) -> Iterator[dict]:
+        for row in range(self._count):
+            yield self.row(row)
+
+    def copy(self) -> "MappedMemberTable":
+        """레코드 영역은 공유하고 상태 덮어쓰기만 복사한 테이블을 반환합니다."""
+        table = MappedMemberTable(self._records, self._count, self._widths, self.statuses,
+                                  self.fields, self.raw_dates)
+        table._status_overrides = self._status_overrides.copy()
+        return table
+
+
+def _encoded_rows(table, string_fields: tuple) -> Iterator[tuple[list[bytes], dict]]:
+    for row in range(len(table)):
+        member = table.row(row)
+        yield [member[field].encode("utf-8") for field in string_fields], member
+
+
+def write_snapshot_file(path: str, table, indexes: MemberIndexes,
+                        csv_signature: tuple[int, int]) -> None:
+    """테이블과 인덱스를 바이너리 스냅샷으로 기록합니다 (임시 파일 후 원자적 교체)."""
+    count = len(table)
+    fields = table.fields
+    string_fields = MEMBER_FIELDS[:_STRING_FIELDS] + table.extra_fields
+
+    # 1차: 문자열 컬럼별 최대 폭 계산, 정수로 압축할 수 없는 날짜 수집
+    widths = [1] * len(string_fields)
+    raw_dates: dict[str, dict[str, str]] = {field: {} for field in DATE_FIELDS}
+    for row, (values, member) in enumerate(_encoded_rows(table, string_fields)):
+        for i, value in enumerate(values):
+            if len(value) > widths[i]:
+                widths[i] = len(value)
+        for field in DATE_FIELDS:
+            if member[field] and not pack_date(member[field]):
+                raw_dates[field][str(row)] = member[field]
+    statuses = list(table.statuses)
+    status_codes = {status: code for code, status in enumerate(statuses)}
+    record = _record_struct(widths)
+
+    sizes = [("records", "", record.size * count)]
+    arrays = {}
+    for index_name in MemberIndexes.NAMES:
+        index = getattr(indexes, index_name)
+        for array_name, typecode in _INDEX_ARRAYS:
+            data = memoryview(getattr(index, array_name)).cast("B")
+            arrays[f"{index_name}.{array_name}"] = data
+            sizes.append((f"{index_name}.{array_name}", typecode, len(data)))
+
+    sections = {}
+    offset = 0
+    for name, typecode, size in sizes:
+        sections[name] = [offset, size, typecode]
+        offset = _align(offset + size)
+
+    header = json.dumps({
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "csv_signature": list(csv_signature),
+        "count": count,
+        "widths": widths,
+        "fields": list(fields),
+        "raw_dates": raw_dates,
+        "statuses": statuses,
+        "sections": sections,
+    }).encode("utf-8")
+    base = _align(len(MAGIC) + 4 + len(header))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(4, "little"))
+        f.write(header)
+
+        # 2차: 레코드를 묶음 단위로 직렬화해 기록
+        f.seek(base + sections["records"][0])
+        chunk = bytearray()
+        for values, member in _encoded_rows(table, string_fields):
+            chunk += record.pack(
+                *values,
+                pack_date(member["birth_date"]),
+                pack_date(member["registered_at"]),
+                status_codes[member["status"]],
+            )
+            if len(chunk) >= 1 << 20:
+                f.write(chunk)
+                chunk.clear()
+        f.write(chunk)
+
+        for name, data in arrays.items():
+            f.seek(base + sections[name][0])
+            f.write(data)
+        f.truncate(base + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class MemberSnapshot:
+    """mmap 으로 연 스냅샷의 테이블과 인덱스입니다."""
+
+    def __init__(self, table: MappedMemberTable, indexes: MemberIndexes):
+        self.table = table
+        self.indexes = indexes
+
+    @classmethod
+    def open(cls, path: str, csv_signature: tuple[int, int]) -> Optional["MemberSnapshot"]:
+        """
+        스냅샷을 엽니다. 없거나 CSV와 맞지 않거나 잘리거나 손상되었으면 None을 반환하며,
+        이때 호출하는 쪽은 CSV에서 다시 로드하고 스냅샷을 새로 만듭니다.
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # 없는 파일, 빈 파일(mmap 불가), 읽기 권한 없음
+            return None
+
+        try:
+            return cls._load(mapped, csv_signature)
+        except Exception:
+            # 헤더 JSON/레코드 구조가 깨졌거나 섹션이 잘린 파일
+            pass
+        try:
+            mapped.close()
+        except BufferError:
+            # 만들다 만 섹션 뷰가 아직 남아 있으면 가비지 컬렉션 때 닫힘
+            pass
+        return None
+
+    @classmethod
+    def _load(cls, mapped: mmap.mmap, csv_signature: tuple[int, int]) -> Optional["MemberSnapshot"]:
+        header = None
+        if mapped[:len(MAGIC)] == MAGIC:
+            start = len(MAGIC) + 4
+            length = int.from_bytes(mapped[len(MAGIC):start], "little")
+            header = json.loads(mapped[start:start + length])
+        if (
+            header is None
+            or header["version"] != VERSION
+            or header["byteorder"] != sys.byteorder
+            or tuple(header["csv_signature"]) != tuple(csv_signature)
+        ):
+            mapped.close()
+            return None
+
+        base = _align(len(MAGIC) + 4 + length)
+        for offset, size, _ in header["sections"].values():
+            if base + offset + size > len(mapped):
+                raise ValueError("snapshot section is truncated")
+        view = memoryview(mapped)
+
+        def section(name: str) -> memoryview:
+            offset, size, typecode = header["sections"][name]
+            data = view[base + offset:base + offset + size]
+            return data.cast(typecode) if typecode else data
+
+        records = section("records")
+        if len(records) != _record_struct(header["widths"]).size * header["count"]:
+            raise ValueError("snapshot record size does not match its header")
+
+        raw_dates = {
+            field: {int(row): value for row, value in header["raw_dates"][field].items()}
+            for field in DATE_FIELDS
+        }
+        table = MappedMemberTable(
+            records, header["count"], header["widths"], header["statuses"],
+            header["fields"], raw_dates,
+        )
+        indexes = MemberIndexes(*(
+            HashIndex(*(section(f"{index_name}.{array_name}") for array_name, _ in _INDEX_ARRAYS))
+            for index_name in MemberIndexes.NAMES
+        ))
+        return cls(table, indexes)
@@ -0,0 +1,247 @@
+"""
+SQLite 기반 회원 저장소 구현
+
+WAL 모드로 동작하며 스레드별 연결을 재사용합니다. 모든 쿼리는 고정된
+SQL 문자열이라 sqlite3 모듈의 준비된 문장(prepared statement) 캐시를 그대로 탑니다.
+"""
+import csv
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterator, Optional
+
+from .base import (
+    DATA_PATH,
+    MEMBER_FIELDS,
+    SQLITE_PATH,
+    MemberBackend,
+    credential_key,
+    normalize_birth_date,
+    normalize_phone_suffix,
+)
+from .commit import GroupCommitQueue
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    member_id     TEXT PRIMARY KEY,
+    name          TEXT NOT NULL,
+    phone         TEXT NOT NULL,
+    phone_last4   TEXT NOT NULL,
+    email         TEXT,
+    birth_date    TEXT NOT NULL,
+    birth_ymd     TEXT NOT NULL,
+    registered_at TEXT,
+    status        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS status_log (
+    member_id TEXT NOT NULL,
+    status    TEXT NOT NULL,
+    reason    TEXT,
+    at        TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_members_name ON members (name);
+CREATE INDEX IF NOT EXISTS idx_members_phone ON members (phone_last4);
+CREATE INDEX IF NOT EXISTS idx_members_credentials ON members (name, phone_last4, birth_ymd);
+"""
+
+# 보조 인덱스 항목은 키 다음에 rowid 순으로 정렬되므로, 동명이인을 CSV/가져오기 순서
+# (ORDER BY rowid)로 돌려줄 때 별도 정렬이 필요 없음
+_COLUMNS = ", ".join(MEMBER_FIELDS)
+SQL_GET = f"SELECT {_COLUMNS} FROM members WHERE member_id = ?"
+SQL_FIND_BY_NAME = f"SELECT {_COLUMNS} FROM members WHERE name = ? ORDER BY rowid LIMIT ?"
+SQL_FIND_BY_PHONE = f"SELECT {_COLUMNS} FROM members WHERE phone_last4 = ? ORDER BY rowid"
+SQL_FIND_BY_CREDENTIALS = (
+    f"SELECT {_COLUMNS} FROM members "
+    "WHERE name = ? AND phone_last4 = ? AND birth_ymd = ? ORDER BY rowid"
+)
+SQL_ALL = f"SELECT {_COLUMNS} FROM members ORDER BY rowid"
+SQL_UPDATE_STATUS = "UPDATE members SET status = ? WHERE member_id = ?"
+SQL_LOG_STATUS = "INSERT INTO status_log (member_id, status, reason, at) VALUES (?, ?, ?, ?)"
+SQL_INSERT = (
+    "INSERT OR REPLACE INTO members "
+    "(member_id, name, phone, phone_last4, email, birth_date, birth_ymd, registered_at, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+IMPORT_BATCH_SIZE = 50_000
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, cached_statements=64)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # 탈퇴 커밋마다 디스크 동기화 (CSV 저널의 fsync와 같은 보장)
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """birth_ymd 컬럼이 없는 (이전 버전에서 가져온) 데이터베이스를 갱신합니다."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(members)")}
+    if "birth_ymd" in columns:
+        return
+    conn.create_function("normalize_birth_date", 1, normalize_birth_date, deterministic=True)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("ALTER TABLE members ADD COLUMN birth_ymd TEXT NOT NULL DEFAULT ''")
+        conn.execute("UPDATE members SET birth_ymd = normalize_birth_date(birth_date)")
+        conn.execute("DROP INDEX IF EXISTS idx_members_auth")
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def import_csv(csv_path: Optional[str] = None, db_path: Optional[str] = None) -> int:
+    """
+    회원 CSV를 SQLite 데이터베이스로 가져옵니다.
+
+    CSV를 스트리밍으로 읽어 배치 단위로 삽입하고, 인덱스는 적재 후에 만듭니다.
+
+    Returns:
+        가져온 회원 수
+    """
+    csv_path = csv_path or DATA_PATH
+    db_path = db_path or SQLITE_PATH
+    conn = _connect(db_path)
+    count = 0
+    try:
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        with open(csv_path, "r", encoding="utf-8") as f:
+            batch = []
+            for row in csv.DictReader(f):
+                batch.append((
+                    row["member_id"], row["name"], row["phone"],
+                    normalize_phone_suffix(row["phone"]), row["email"],
+                    row["birth_date"], normalize_birth_date(row["birth_date"]),
+                    row["registered_at"], row["status"],
+                ))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    conn.executemany(SQL_INSERT, batch)
+                    count += len(batch)
+                    batch.clear()
+            conn.executemany(SQL_INSERT, batch)
+            count += len(batch)
+        conn.execute("COMMIT")
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return count
+
+
+class SqliteMemberStore(MemberBackend):
+    """
+    SQLite 데이터베이스에 저장된 회원을 조회/변경합니다.
+
+    연결은 스레드마다 하나씩 만들어 재사용합니다. 쓰기는 단일 writer 스레드가
+    모아서 하나의 BEGIN IMMEDIATE 트랜잭션으로 커밋하며 (group commit),
+    여러 프로세스의 동시 쓰기는 SQLite 쓰기 잠금으로 직렬화됩니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or SQLITE_PATH
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._commits = GroupCommitQueue(self._commit_batch)
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        conn.executescript(INDEXES)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self.path)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _to_dict(row: Optional[tuple]) -> Optional[dict]:
+        if row is None:
+            return None
+        return dict(zip(MEMBER_FIELDS, row))
+
+    def get(self, member_id: str) -> Optional[dict]:
+        """member_id로 회원을 조회합니다."""
+        return self._to_dict(self._conn().execute(SQL_GET, (member_id,)).fetchone())
+
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> list[dict]:
+        """이름이 일치하는 회원 목록을 (최대 limit명) 반환합니다."""
+        # SQLite에서 LIMIT -1은 제한 없음
+        rows = self._conn().execute(SQL_FIND_BY_NAME, (name, -1 if limit is None else limit)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def find_by_phone_suffix(self, phone: str) -> list[dict]:
+        """전화번호 뒷 4자리가 일치하는 회원 목록을 반환합니다."""
+        suffix = normalize_phone_suffix(phone)
+        rows = self._conn().execute(SQL_FIND_BY_PHONE, (suffix,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def find_by_credentials(self, name: str, phone: str, birth_date: str) -> list[dict]:
+        """이름, 전화번호 뒷 4자리, 생년월일이 모두 일치하는 회원 목록을 반환합니다."""
+        # birth_ymd 컬럼은 가져올 때 같은 규칙으로 정규화해 둔 값 (phone_last4와 동일)
+        rows = self._conn().execute(
+            SQL_FIND_BY_CREDENTIALS, credential_key(name, phone, birth_date)
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def iter_members(self) -> Iterator[dict]:
+        """전체 회원을 저장 순서대로 반환합니다."""
+        for row in self._conn().execute(SQL_ALL):
+            yield self._to_dict(row)
+
+    def update_status(self, member_id: str, status: str, **extra) -> Optional[dict]:
+        """회원 상태 변경을 writer 큐에 넣고 커밋될 때까지 기다립니다."""
+        return self._commits.submit((member_id, status, extra)).result()
+
+    def _commit_batch(self, requests: list[tuple[str, str, dict]]) -> list[Optional[dict]]:
+        """writer 스레드에서 상태 변경 묶음을 하나의 트랜잭션으로 커밋합니다."""
+        conn = self._conn()
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for member_id, status, extra in requests:
+                previous = self._to_dict(conn.execute(SQL_GET, (member_id,)).fetchone())
+                results.append(previous)
+                if previous is None or previous["status"] == status:
+                    continue
+                conn.execute(SQL_UPDATE_STATUS, (status, member_id))
+                conn.execute(
+                    SQL_LOG_STATUS,
+                    (member_id, status, extra.get("reason"), datetime.now().isoformat()),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def close(self) -> None:
+        """남은 쓰기를 커밋하고 이 저장소가 연 모든 연결을 닫습니다."""
+        self._commits.close()
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    # 다른 스레드에서 만든 연결은 해당 스레드 종료 시 정리됨
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
@@ -0,0 +1,209 @@
+"""
+회원 데이터의 컬럼 기반 압축 표현
+
+행마다 딕셔너리를 두는 대신 컬럼별 array에 값을 보관합니다.
+- member_id, 전화번호, 이메일은 UTF-8로 이어 붙인 bytearray + 오프셋 array로 저장합니다.
+- 이름과 상태 값은 사전(고유 값 목록)에 한 번만 두고 행에는 정수 코드만 저장합니다.
+- 생년월일, 가입일은 YYYY-MM-DD 형식이면 YYYYMMDD 정수(array 'I')로 저장하고,
+  그 밖의 값(시각이 붙은 가입일 등)은 행 번호별 원래 문자열로 따로 보관합니다.
+- 상태는 1바이트 코드(array 'B')로 저장합니다.
+- MEMBER_FIELDS 밖의 CSV 컬럼도 문자열 컬럼으로 보관하고 헤더 순서를 기억하므로,
+  압축으로 CSV를 다시 써도 원본과 같은 값과 컬럼이 유지됩니다.
+조회 결과는 필요할 때만 딕셔너리로 만들어 반환합니다.
+"""
+import re
+import sys
+from array import array
+from typing import Iterator, Optional, Sequence
+
+from .base import MEMBER_FIELDS, normalize_birth_date
+
+# 정수로 압축해도 decode_date로 똑같이 되돌릴 수 있는 날짜 형식
+_PACKABLE_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+DATE_FIELDS = ("birth_date", "registered_at")
+
+
+def encode_date(value: str) -> int:
+    """
+    조회용 생년월일 입력(YYYY-MM-DD, YYYYMMDD 등)을 YYYYMMDD 정수로 변환합니다.
+
+    숫자가 정확히 8자리가 아니면 0 (어떤 회원과도 일치하지 않음)입니다.
+    """
+    digits = normalize_birth_date(value)
+    return int(digits) if len(digits) == 8 and digits.isascii() else 0
+
+
+def pack_date(value: str) -> int:
+    """YYYY-MM-DD 형식이면 YYYYMMDD 정수를, 아니면 0(원래 문자열을 따로 보관)을 반환합니다."""
+    if _PACKABLE_DATE.fullmatch(value):
+        return int(value.replace("-", ""))
+    return 0
+
+
+def decode_date(value: int) -> str:
+    """YYYYMMDD 정수를 YYYY-MM-DD 문자열로 되돌립니다."""
+    if not value:
+        return ""
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+
+class StringColumn:
+    """문자열들을 하나의 UTF-8 bytearray에 이어 붙여 보관하는 컬럼입니다."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, value: str) -> None:
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def copy(self) -> "StringColumn":
+        column = StringColumn()
+        column.data = bytearray(self.data)
+        column.offsets = array("Q", self.offsets)
+        return column
+
+
+class MemberTable:
+    """회원 목록을 컬럼별로 보관하는 테이블입니다."""
+
+    __slots__ = (
+        "member_ids", "name_codes", "names", "_name_lookup", "phones", "emails",
+        "birth_dates", "registered_at", "status_codes", "statuses",
+        "fields", "extra_fields", "extras", "raw_dates",
+    )
+
+    def __init__(self, fields: Sequence[str] = MEMBER_FIELDS):
+        # CSV 헤더 순서와 MEMBER_FIELDS 밖의 컬럼들
+        self.fields = tuple(fields)
+        self.extra_fields = tuple(field for field in self.fields if field not in MEMBER_FIELDS)
+        self.extras = [StringColumn() for _ in self.extra_fields]
+        self.member_ids = StringColumn()
+        self.name_codes = array("I")
+        # 이름 코드 → 이름 (동명이인은 같은 코드를 공유)
+        self.names: list[str] = []
+        self._name_lookup: dict[str, int] = {}
+        self.phones = StringColumn()
+        self.emails = StringColumn()
+        self.birth_dates = array("I")
+        self.registered_at = array("I")
+        self.status_codes = array("B")
+        # 상태 코드 → 상태 문자열 (코드는 처음 등장한 순서대로 부여)
+        self.statuses: list[str] = []
+        # 정수로 압축할 수 없는 날짜 값: 컬럼 → {행 번호: 원래 문자열} (정수 컬럼에는 0)
+        self.raw_dates: dict[str, dict[int, str]] = {field: {} for field in DATE_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.member_ids)
+
+    def name_code(self, name: str, create: bool = False) -> Optional[int]:
+        """이름의 코드를 반환합니다. create가 False이고 처음 보는 이름이면 None."""
+        code = self._name_lookup.get(name)
+        if code is None and create:
+            code = len(self.names)
+            self.names.append(name)
+            self._name_lookup[name] = code
+        return code
+
+    def status_code(self, status: str) -> int:
+        """상태 문자열의 코드를 반환하고, 처음 보는 상태면 새로 등록합니다."""
+        try:
+            return self.statuses.index(status)
+        except ValueError:
+            self.statuses.append(sys.intern(status))
+            return len(self.statuses) - 1
+
+    def append(self, member_id: str, name: str, phone: str, email: str,
+               birth_date: str, registered_at: str, status: str, *extras: str) -> int:
+        """회원 한 명을 추가하고 행 번호를 반환합니다 (extras는 extra_fields 순서)."""
+        row = len(self.member_ids)
+        self.member_ids.append(member_id)
+        self.name_codes.append(self.name_code(name, create=True))
+        self.phones.append(phone)
+        self.emails.append(email)
+        self.birth_dates.append(self._pack_date("birth_date", row, birth_date))
+        self.registered_at.append(self._pack_date("registered_at", row, registered_at))
+        self.status_codes.append(self.status_code(status))
+        for column, value in zip(self.extras, extras):
+            column.append(value)
+        return row
+
+    def _pack_date(self, field: str, row: int, value: str) -> int:
+        packed = pack_date(value)
+        if not packed and value:
+            self.raw_dates[field][row] = value
+        return packed
+
+    def _date(self, field: str, packed: int, row: int) -> str:
+        return decode_date(packed) if packed else self.raw_dates[field].get(row, "")
+
+    def member_id(self, row: int) -> str:
+        return self.member_ids[row]
+
+    def name(self, row: int) -> str:
+        return self.names[self.name_codes[row]]
+
+    def phone(self, row: int) -> str:
+        return self.phones[row]
+
+    def birth_ymd(self, row: int) -> int:
+        packed = self.birth_dates[row]
+        if packed:
+            return packed
+        raw = self.raw_dates["birth_date"].get(row)
+        return encode_date(raw) if raw else 0
+
+    def status(self, row: int) -> str:
+        return self.statuses[self.status_codes[row]]
+
+    def set_status(self, row: int, status: str) -> None:
+        self.status_codes[row] = self.status_code(status)
+
+    def row(self, row: int) -> dict:
+        """행 번호에 해당하는 회원을 딕셔너리로 만들어 반환합니다 (추가 컬럼 포함)."""
+        member = dict(zip(MEMBER_FIELDS, (
+            self.member_ids[row],
+            self.names[self.name_codes[row]],
+            self.phones[row],
+            self.emails[row],
+            self._date("birth_date", self.birth_dates[row], row),
+            self._date("registered_at", self.registered_at[row], row),
+            self.statuses[self.status_codes[row]],
+        )))
+        for field, column in zip(self.extra_fields, self.extras):
+            member[field] = column[row]
+        return member
+
+    def rows(self) -> Iterator[dict]:
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def copy(self) -> "MemberTable":
+        """컬럼을 복사한 새 테이블을 반환합니다."""
+        table = MemberTable(self.fields)
+        table.extras = [column.copy() for column in self.extras]
+        table.raw_dates = {field: raw.copy() for field, raw in self.raw_dates.items()}
+        table.member_ids = self.member_ids.copy()
+        table.name_codes = array("I", self.name_codes)
+        table.names = self.names.copy()
+        table._name_lookup = self._name_lookup.copy()
+        table.phones = self.phones.copy()
+        table.emails = self.emails.copy()
+        table.birth_dates = array("I", self.birth_dates)
+        table.registered_at = array("I", self.registered_at)
+        table.status_codes = array("B", self.status_codes)
+        table.statuses = self.statuses.copy()
+        return table
@@ -0,0 +1,92 @@
+"""
+실시간 클라이언트 계측 도구
+
+- LoopLagMonitor: asyncio 이벤트 루프가 얼마나 늦게 깨어나는지(루프 지연) 측정
+- summarize: 측정값 목록의 백분위수 요약
+- StageTimer: 시작 준비 같은 순차 단계별 소요 시간 기록
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(samples, scale: float = 1000.0) -> dict:
+    """측정값(초)들의 개수, 평균, 백분위수, 최댓값을 scale 단위(기본 ms)로 반환합니다."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    summary = {"count": len(ordered), "mean": sum(ordered) / len(ordered) * scale}
+    for p in PERCENTILES:
+        rank = max(1, -(-p * len(ordered) // 100))  # nearest-rank
+        summary[f"p{p}"] = ordered[rank - 1] * scale
+    summary["max"] = ordered[-1] * scale
+    return summary
+
+
+class LoopLagMonitor:
+    """
+    interval 마다 잠들었다 깨어나며 예정 시각보다 늦어진 시간을 기록합니다.
+
+    이벤트 루프에서 동기 I/O 등으로 막히는 코드가 있으면 지연이 그만큼 커집니다.
+    """
+
+    def __init__(self, interval: float = 0.005, max_samples: int = 100_000):
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        interval = self.interval
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lag = time.perf_counter() - expected
+            if len(self.samples) >= self.max_samples:
+                # 오래 실행되면 앞쪽 절반을 버려 최근 값 위주로 유지
+                del self.samples[: self.max_samples // 2]
+            self.samples.append(max(0.0, lag))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> dict:
+        """루프 지연 요약 (ms)."""
+        return summarize(self.samples)
+
+
+class StageTimer:
+    """단계 이름과 소요 시간(초)을 기록 순서대로 보관합니다."""
+
+    def __init__(self):
+        self.stages: list[tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록 실행 시간을 name 단계로 기록합니다 (예외가 나도 기록)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+
+    def format(self, names: Optional[list[str]] = None) -> str:
+        """'이름 12ms → 이름 3ms' 형태의 한 줄 요약 (names가 있으면 그 단계만)."""
+        return " → ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.stages
+                          if names is None or name in names)
@@ -4,123 +4,219 @@ OpenAI Real-time API 클라이언트 모듈 (공식 라이브러리 사용)
 import asyncio
 import base64
 import json
-import pyaudio
-from openai import AsyncOpenAI
-from member_db import TOOLS, execute_function
+import time
+from typing import Optional
 
-# 오디오 설정
-CHUNK = 1024
-FORMAT = pyaudio.paInt16
-CHANNELS = 1
+import numpy as np
+from openai import AsyncOpenAI
+from audio_io import AudioIO, PyAudioIO
+from audio_stream import MicrophoneCapture, PlaybackEngine
+from echo_cancel import EchoCanceller, full_duplex_enabled
+from member_db import TOOLS, SessionMemberCache, session_functions
+from metrics import LoopLagMonitor, StageTimer, summarize
+from reconnect import CONNECTION_ERRORS, ConversationLog, backoff_delays
+from tool_executor import AsyncToolExecutor
+from turn_trace import TurnTracer
+from uplink import AudioUplink
+from vad import VoiceActivityGate, local_vad_enabled
+
+# 오디오 설정 (PCM16 mono)
 SAMPLE_RATE = 24000  # Real-time API는 24kHz 사용
+FRAME_SAMPLES = int(SAMPLE_RATE * 0.02)  # 20ms 입력 프레임
+
+# 서버 VAD 민감도. 로컬 VAD가 잡음을 미리 걸러 주면 임계값을 낮춰도 됨
+SERVER_VAD_THRESHOLD = 0.95
+SERVER_VAD_THRESHOLD_WITH_LOCAL_VAD = 0.6
+
+# 시작 준비 단계 (Enter 전 백그라운드)와 Enter 후 단계 이름
+PREPARE_STAGES = ["오디오 초기화", "연결", "세션 설정 전송", "세션 설정 확인", "오디오 장치 열기"]
+START_STAGES = ["준비 대기", "오디오 시작"]
+
+# 종료 시 출력할 턴 지연 히스토그램 (턴 시작 = 발화 끝 대비)
+TURN_LABELS = {
+    "transcription_completed": "받아쓰기 완료",
+    "response_created": "응답 시작",
+    "first_audio_delta": "첫 응답 음성",
+    "function_call": "함수 호출 소요",
+    "audio_done": "응답 음성 수신 완료",
+    "playback_drained": "재생 완료",
+}
+PLAYBACK_POLL_INTERVAL = 0.02
 
 # 디버그 모드
 DEBUG = False
 
 
 class RealtimeClient:
-    def __init__(self, api_key: str):
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, local_vad: Optional[bool] = None,
+                 full_duplex: Optional[bool] = None, audio_io: Optional[AudioIO] = None,
+                 websocket_base_url: Optional[str] = None):
+        """
+        audio_io: 오디오 입출력 드라이버 (기본: PyAudioIO = 실제 마이크/스피커).
+        websocket_base_url: Real-time API 대신 접속할 웹소켓 주소 (로컬 대역 서버 등).
+        """
+        self.timer = StageTimer()
+        self.client = AsyncOpenAI(api_key=api_key, websocket_base_url=websocket_base_url)
         self.connection = None
-        self.audio = pyaudio.PyAudio()
-        self.input_stream = None
-        self.output_stream = None
+        self._connection_manager = None
+        self._prepare_task = None
+        # Enter 시각과 첫 응답 음성 도착까지 걸린 시간
+        self._entered_at = None
+        self.first_audio_latency = None
+        with self.timer.stage("오디오 초기화"):
+            self.audio_io = audio_io if audio_io is not None else PyAudioIO()
+        self._audio_opened = False
         self.is_running = False
         self.is_playing = False
-        self.audio_queue = asyncio.Queue()
+        # 마이크는 오디오 드라이버 콜백 스레드가 링 버퍼에 채우고 send_audio가 await로 꺼냄
+        self.capture = MicrophoneCapture(FRAME_SAMPLES)
+        # 응답 음성은 지터 버퍼에 넣고 오디오 드라이버 콜백 스레드가 재생
+        self.playback = PlaybackEngine(SAMPLE_RATE)
+        # 로컬 VAD (LOCAL_VAD 환경 변수 또는 local_vad 인자로 켬): 말소리 구간만 전송
+        if local_vad is None:
+            local_vad = local_vad_enabled()
+        self.vad = VoiceActivityGate(SAMPLE_RATE) if local_vad else None
+        # full-duplex (FULL_DUPLEX 환경 변수 또는 full_duplex 인자로 켬): 재생 중에도
+        # 마이크를 막지 않고, 스피커 출력을 참조 신호로 반향을 제거해 전송
+        if full_duplex is None:
+            full_duplex = full_duplex_enabled()
+        self.echo_canceller = None
+        if full_duplex:
+            self.echo_canceller = EchoCanceller(FRAME_SAMPLES, SAMPLE_RATE)
+            self.playback.enable_reference()
+            self._reference_frame = np.zeros(FRAME_SAMPLES, dtype=np.int16)
+        # 재생 중인 응답 음성 항목 (item_id, content_index, 재생 위치 좌표의 시작/끝)
+        self._audio_item = None
+        self._response_active = False
+        self._response_id = None
+        # 끼어들기로 취소한 응답/항목 id: 다음 response.created까지 늦게 도착한 delta를 버림
+        self._cancelled_ids: set[str] = set()
+        # 마이크 프레임을 패킷 길이(UPLINK_PACKET_MS, 기본 자동)만큼 모아 전송
+        self.uplink = AudioUplink(SAMPLE_RATE)
+        self._rtt_task = None
+        # 연결이 끊기면 새 세션에 다시 넣을 대화 기록, 연결 상태, 복구 시간(초)들
+        self.conversation = ConversationLog(SAMPLE_RATE)
+        self._connected = asyncio.Event()
+        self.recoveries: list[float] = []
+        # 턴별 지연 타임라인 (TURN_TRACE_FILE에 JSONL로 기록)
+        self.tracer = TurnTracer("cli")
+        self._drain_task = None
+        self.loop_lag = LoopLagMonitor()
+        # 세션 동안 회원 조회 결과를 재사용 (탈퇴 처리 시 무효화)
+        self.member_cache = SessionMemberCache()
+        self.tool_executor = AsyncToolExecutor(session_functions(self.member_cache))
+        self._tool_tasks = set()
+
+    def open_audio_streams(self):
+        """오디오 입출력을 열어 둡니다 (start_audio_streams() 전까지 멈춘 상태)."""
+        self.audio_io.open(SAMPLE_RATE, FRAME_SAMPLES, self.capture.callback, self.playback.callback)
+        self._audio_opened = True
 
     def start_audio_streams(self):
-        """오디오 입출력 스트림을 시작합니다."""
-        self.input_stream = self.audio.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=SAMPLE_RATE,
-            input=True,
-            frames_per_buffer=CHUNK
-        )
-
-        self.output_stream = self.audio.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=SAMPLE_RATE,
-            output=True,
-            frames_per_buffer=CHUNK
-        )
+        """오디오 입출력을 시작합니다."""
+        if not self._audio_opened:
+            self.open_audio_streams()
+        self.audio_io.start()
 
     async def send_audio(self):
         """마이크 입력을 전송합니다."""
-        read_size = int(SAMPLE_RATE * 0.02)  # 20ms chunks
-
         while self.is_running:
             try:
-                if self.input_stream and not self.is_playing:
-                    data = self.input_stream.read(read_size, exception_on_overflow=False)
-                    encoded = base64.b64encode(data).decode("utf-8")
-                    await self.connection.input_audio_buffer.append(audio=encoded)
-
-                await asyncio.sleep(0.01)
+                data = await self.capture.read_frame()
+                if data is None:
+                    break
+                if not self._connected.is_set():
+                    # 재연결 중에는 입력을 버림
+                    continue
+                samples = np.frombuffer(data, dtype=np.int16)
+                if self.echo_canceller is not None:
+                    # 재생 중인 응답의 반향을 빼고 그대로 전송 (끼어들기 가능)
+                    self.playback.read_reference(self._reference_frame)
+                    samples = self.echo_canceller.process(samples, self._reference_frame)
+                elif self.is_playing or self.playback.is_active():
+                    # 응답 재생 중에는 마이크 입력을 버림 (자기 목소리 인식 방지)
+                    await self.uplink.flush(self.connection)
+                    continue
+                if self.vad is not None:
+                    samples = self.vad.feed(samples)
+                    if not len(samples):
+                        await self.uplink.flush(self.connection)
+                        continue
+                backlog = self.capture.ring.available() / SAMPLE_RATE
+                await self.uplink.send(self.connection, samples, backlog=backlog)
+            except CONNECTION_ERRORS:
+                # 연결이 끊김: handle_events 쪽에서 다시 연결할 때까지 입력을 버림
+                self._connected.clear()
             except Exception as e:
                 if self.is_running:
                     print(f"오디오 전송 오류: {e}")
                 break
 
-    async def play_audio(self):
-        """오디오 큐에서 데이터를 재생합니다."""
-        while self.is_running:
-            try:
-                audio_data = await asyncio.wait_for(self.audio_queue.get(), timeout=0.1)
-                self.output_stream.write(audio_data)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                if self.is_running:
-                    print(f"오디오 재생 오류: {e}")
-
     async def handle_events(self):
         """서버 이벤트를 처리합니다."""
         async for event in self.connection:
             if DEBUG:
                 print(f"[DEBUG] Event: {event.type}")
+            self.conversation.observe(event)
 
-            if event.type == "session.created":
-                print("✓ 세션이 생성되었습니다.")
-
-            elif event.type == "session.updated":
-                print("✓ 세션 설정 완료")
-                # 초기 인사 요청
-                await self.send_initial_greeting()
-
-            elif event.type == "input_audio_buffer.speech_started":
+            if event.type == "input_audio_buffer.speech_started":
                 if DEBUG:
                     print("[DEBUG] 음성 입력 시작")
                 self.is_playing = False
-                # 오디오 큐 비우기
-                while not self.audio_queue.empty():
-                    try:
-                        self.audio_queue.get_nowait()
-                    except:
-                        break
+                self.tracer.end_turn(interrupted=True)
+                await self.interrupt_response()
 
             elif event.type == "input_audio_buffer.speech_stopped":
                 if DEBUG:
                     print("[DEBUG] 음성 입력 종료")
+                self.tracer.start_turn("speech_stopped")
 
             elif event.type == "response.audio.delta":
+                if self._is_cancelled(event):
+                    continue
                 # 음성 응답 수신
                 self.is_playing = True
+                if self.first_audio_latency is None and self._entered_at is not None:
+                    self.first_audio_latency = time.perf_counter() - self._entered_at
+                self.tracer.mark("first_audio_delta")
                 audio_bytes = base64.b64decode(event.delta)
-                await self.audio_queue.put(audio_bytes)
+                item = self._audio_item
+                if item is None or item["item_id"] != event.item_id:
+                    start = self.playback.write_position()
+                    item = self._audio_item = {
+                        "item_id": event.item_id,
+                        "content_index": event.content_index,
+                        "start": start,
+                        "end": start,
+                    }
+                self.playback.write(audio_bytes)
+                item["end"] = self.playback.write_position()
 
             elif event.type == "response.audio.done":
                 self.is_playing = False
-                # AI 응답 후 입력 버퍼 비우기 (이전 소음 제거)
-                await self.connection.input_audio_buffer.clear()
+                self.playback.mark_end()
+                self.tracer.mark("audio_done")
+                if self._drain_task is None or self._drain_task.done():
+                    self._drain_task = asyncio.create_task(self._watch_playback_drained())
+                # 반이중: AI 응답 후 입력 버퍼 비우기 (이전 소음 제거)
+                # 전이중은 재생 중에도 마이크가 열려 있어, 비우면 끼어든 발화가 사라짐
+                if self.echo_canceller is None:
+                    await self.connection.input_audio_buffer.clear()
 
             elif event.type == "response.created":
+                self._response_active = True
+                self._response_id = event.response.id
+                self._cancelled_ids.clear()
+                self.tracer.mark("response_created")
                 # AI 응답 시작 시 줄바꿈
                 print("\n🤖 ", end="", flush=True)
 
+            elif event.type == "response.done":
+                self._response_active = False
+
             elif event.type == "response.audio_transcript.delta":
+                if self._is_cancelled(event):
+                    continue
                 # AI 응답 텍스트 출력
                 print(f"\033[94m{event.delta}\033[0m", end="", flush=True)
 
@@ -129,66 +225,105 @@ class RealtimeClient:
 
             elif event.type == "conversation.item.input_audio_transcription.completed":
                 # 사용자 음성 인식 결과 (출력하지 않음)
-                pass
+                self.tracer.mark("transcription_completed")
 
             elif event.type == "response.function_call_arguments.done":
-                await self.handle_function_call(event)
+                # 도구 실행 중에도 이벤트 처리가 계속되도록 별도 태스크로 실행
+                self.tracer.function_call_started(event.call_id, event.name)
+                task = asyncio.create_task(self.handle_function_call(event))
+                self._tool_tasks.add(task)
+                task.add_done_callback(self._tool_tasks.discard)
 
             elif event.type == "error":
+                # 서버가 이미 끝낸 응답을 끼어들기로 취소하려 한 경우는 무시
+                if event.error.code == "response_cancel_not_active":
+                    continue
                 print(f"\n❌ 오류: {event.error.message}")
                 if DEBUG:
                     print(f"   코드: {event.error.code}")
 
+    async def _watch_playback_drained(self):
+        """
+        받은 응답 음성을 장치가 모두 재생하면 playback_drained를 기록합니다.
+
+        함수 호출 뒤 이어질 응답이 없으면(응답 진행 중도, 실행 중인 도구도 없으면) 턴을 마감합니다.
+        """
+        while self.playback.is_active():
+            await asyncio.sleep(PLAYBACK_POLL_INTERVAL)
+        self.tracer.mark("playback_drained")
+        if not self._response_active and not self._tool_tasks:
+            self.tracer.end_turn()
+
+    def _is_cancelled(self, event) -> bool:
+        """끼어들기로 취소한 응답의 delta이면 True (취소 전에 서버가 보낸 것들)."""
+        return event.response_id in self._cancelled_ids or event.item_id in self._cancelled_ids
+
+    async def interrupt_response(self):
+        """
+        사용자가 말을 시작하면 응답 재생을 한 프레임 안에 멈추고, 서버에 응답 취소와
+        함께 실제로 들려준 지점까지만 대화 기록에 남기도록(truncate) 알립니다.
+        """
+        item = self._audio_item
+        position = self.playback.interrupt()
+        if item is not None:
+            self._cancelled_ids.add(item["item_id"])
+        if self._response_active:
+            self._cancelled_ids.add(self._response_id)
+            await self.connection.response.cancel()
+        # 끝까지 들려준 항목은 자를 필요 없음
+        if item is not None and (position < item["end"] or self._response_active):
+            played = min(max(0, position - item["start"]), item["end"] - item["start"])
+            await self.connection.conversation.item.truncate(
+                item_id=item["item_id"],
+                content_index=item["content_index"],
+                audio_end_ms=played * 1000 // SAMPLE_RATE,
+            )
+            if DEBUG:
+                print(f"[DEBUG] 응답 자르기: {item['item_id']} @ {played * 1000 // SAMPLE_RATE}ms")
+        self._audio_item = None
+
     async def handle_function_call(self, event):
         """Function calling을 처리합니다."""
         call_id = event.call_id
         name = event.name
-        arguments = json.loads(event.arguments)
+        arguments = event.arguments
 
         print(f"\n⚙️  함수 호출: {name}")
         print(f"   인자: {arguments}")
 
-        # 함수 실행
-        result = execute_function(name, arguments)
+        # 함수 실행 (인자 파싱 포함, 스레드 풀, 시간 제한 적용). 실패해도 결과가 나옴
+        result = await self.tool_executor.execute(name, arguments)
+        self.tracer.function_call_finished(call_id)
         print(f"   결과: {result}")
+        stats = self.member_cache.stats()
+        print(f"   조회 캐시: 적중 {stats['hits']} / 미스 {stats['misses']}")
+
+        # 결과 전송. 대화 기록에 먼저 남기므로 연결이 끊겨 있으면 재연결 때 재전송되고
+        # 응답 생성도 그때 다시 요청됨
+        item = self.conversation.add_function_output(call_id, json.dumps(result, ensure_ascii=False))
+        if not self._connected.is_set():
+            return
+        try:
+            await self.connection.conversation.item.create(item=item)
 
-        # 결과 전송
-        await self.connection.conversation.item.create(
-            item={
-                "type": "function_call_output",
-                "call_id": call_id,
-                "output": json.dumps(result, ensure_ascii=False)
-            }
-        )
-
-        # 응답 생성 요청
-        await self.connection.response.create()
+            # 응답 생성 요청
+            await self.connection.response.create()
+        except CONNECTION_ERRORS:
+            pass
 
     async def send_initial_greeting(self):
         """AI가 먼저 인사하도록 요청합니다."""
         print("\n🎤 말씀해 주세요. (종료: Ctrl+C)\n")
 
         # AI가 먼저 인사하도록 응답 생성 요청
+        self.tracer.start_turn("greeting")
         await self.connection.response.create()
 
-    async def run(self):
-        """클라이언트를 실행합니다."""
-        self.is_running = True
-
-        try:
-            print("🔗 API 연결 중...")
-
-            async with self.client.beta.realtime.connect(
-                model="gpt-realtime"
-            ) as conn:
-                self.connection = conn
-                print("✓ API 연결 완료")
-
-                # 세션 설정
-                await conn.session.update(
-                    session={
-                        "modalities": ["text", "audio"],
-                        "instructions": """당신은 TEST FAQ를 담당하는 챗봇입니다.
+    def _session_config(self) -> dict:
+        """session.update로 보낼 세션 설정."""
+        return {
+            "modalities": ["text", "audio"],
+            "instructions": """당신은 TEST FAQ를 담당하는 챗봇입니다.
 처음 인사할 때 "안녕하세요, TEST FAQ를 담당하는 챗봇입니다. 무엇을 도와드릴까요?"라고 말하세요.
 
 회원 탈퇴를 원하는 경우 다음 절차를 따르세요:
@@ -204,31 +339,146 @@ class RealtimeClient:
 - 친절하고 공손한 말투를 사용하세요.
 - 한국어로 대화하세요.
 - 짧고 간결하게 응답하세요.""",
-                        "voice": "alloy",
-                        "input_audio_format": "pcm16",
-                        "output_audio_format": "pcm16",
-                        "input_audio_transcription": {
-                            "model": "whisper-1"
-                        },
-                        "turn_detection": {
-                            "type": "server_vad",
-                            "threshold": 0.95,  # 0.0~1.0, 거의 최대치
-                            "prefix_padding_ms": 200,
-                            "silence_duration_ms": 1200  # 말 끝난 후 대기 시간
-                        },
-                        "tools": TOOLS
-                    }
-                )
+            "voice": "alloy",
+            "input_audio_format": "pcm16",
+            "output_audio_format": "pcm16",
+            "input_audio_transcription": {
+                "model": "whisper-1"
+            },
+            "turn_detection": {
+                "type": "server_vad",
+                # 0.0~1.0, 로컬 VAD가 없으면 거의 최대치
+                "threshold": (SERVER_VAD_THRESHOLD_WITH_LOCAL_VAD if self.vad
+                              else SERVER_VAD_THRESHOLD),
+                "prefix_padding_ms": 200,
+                "silence_duration_ms": 1200  # 말 끝난 후 대기 시간
+            },
+            "tools": TOOLS
+        }
+
+    async def prepare(self):
+        """
+        웹소켓 연결, 세션 설정, 오디오 장치 열기를 미리 끝내 둡니다.
+
+        main.py가 배너와 회원 목록을 보여 주는 동안 백그라운드 태스크로 실행하며,
+        run()은 이 작업이 끝나기를 기다린 뒤 바로 오디오를 시작합니다.
+        """
+        await self._open_session(self.timer)
+        with self.timer.stage("오디오 장치 열기"):
+            self.open_audio_streams()
+
+    async def _open_session(self, timer: StageTimer):
+        """웹소켓을 열고 세션 설정이 적용될 때까지 기다립니다."""
+        with timer.stage("연결"):
+            self._connection_manager = self.client.beta.realtime.connect(model="gpt-realtime")
+            self.connection = await self._connection_manager.__aenter__()
+        with timer.stage("세션 설정 전송"):
+            await self.connection.session.update(session=self._session_config())
+        with timer.stage("세션 설정 확인"):
+            async for event in self.connection:
+                if event.type == "session.updated":
+                    break
+                if event.type == "error":
+                    raise RuntimeError(f"세션 설정 실패: {event.error.message}")
+
+    async def _close_connection(self):
+        if self._connection_manager is not None:
+            try:
+                await self._connection_manager.__aexit__(None, None, None)
+            except Exception:
+                pass
+            self._connection_manager = None
+            self.connection = None
+
+    async def reconnect(self, reason: str) -> bool:
+        """
+        끊긴 연결을 지수 백오프로 다시 열고, 세션 설정과 대화 기록을 재전송합니다.
+
+        끊김을 알아챈 때부터 대화 기록 재전송을 마칠 때까지를 복구 시간으로 기록합니다.
+        """
+        dropped = time.perf_counter()
+        self._connected.clear()
+        print(f"\n🔌 연결이 끊겼습니다 ({reason}). 다시 연결합니다...")
+        if self._rtt_task is not None:
+            self._rtt_task.cancel()
+        await self._close_connection()
+        # 이전 세션의 응답 항목과 보내지 못한 입력은 새 세션에서 의미가 없음
+        self.uplink.discard()
+        self._audio_item = None
+        self._response_active = False
+        self._cancelled_ids.clear()
+        self.is_playing = False
+
+        for attempt, delay in enumerate(backoff_delays(), 1):
+            await asyncio.sleep(delay)
+            stages = StageTimer()
+            try:
+                await self._open_session(stages)
+                with stages.stage("대화 기록 재전송"):
+                    items = self.conversation.replay_items()
+                    for item in items:
+                        await self.connection.conversation.item.create(item=item)
+                    if self.conversation.needs_response(items):
+                        self.tracer.start_turn("reconnect")
+                        await self.connection.response.create()
+            except Exception as e:
+                print(f"   재연결 {attempt}번째 시도 실패: {e}")
+                await self._close_connection()
+                continue
+            recovered = time.perf_counter() - dropped
+            self.recoveries.append(recovered)
+            self._connected.set()
+            self._rtt_task = asyncio.create_task(self.uplink.probe_rtt(self.connection))
+            print(f"✓ 재연결 완료: {attempt}번째 시도, 복구 {recovered * 1000:.0f}ms "
+                  f"(대화 항목 {len(items)}개 복원 / {stages.format()})")
+            return True
+        print("❌ 재연결에 실패했습니다.")
+        return False
+
+    def start_preparing(self) -> asyncio.Task:
+        """prepare()를 백그라운드 태스크로 시작합니다."""
+        if self._prepare_task is None:
+            self._prepare_task = asyncio.create_task(self.prepare())
+        return self._prepare_task
+
+    async def run(self):
+        """클라이언트를 실행합니다."""
+        self.is_running = True
+        entered = time.perf_counter()
 
-                # 오디오 스트림 시작
+        try:
+            prepare_task = self.start_preparing()
+            if not prepare_task.done():
+                print("🔗 API 연결 중...")
+            with self.timer.stage("준비 대기"):
+                await prepare_task
+            print("✓ API 연결 및 세션 설정 완료")
+
+            # 오디오 스트림 시작
+            with self.timer.stage("오디오 시작"):
                 self.start_audio_streams()
+            self.loop_lag.start()
+            self._rtt_task = asyncio.create_task(self.uplink.probe_rtt(self.connection))
+            print(f"⏱  시작 준비: {self.timer.format(PREPARE_STAGES)}")
+            print(f"   Enter 후: {self.timer.format(START_STAGES)}")
+
+            self._entered_at = entered
+            self._connected.set()
+            await self.send_initial_greeting()
 
-                # 태스크 실행
-                await asyncio.gather(
-                    self.send_audio(),
-                    self.play_audio(),
-                    self.handle_events()
-                )
+            # 마이크 전송은 계속 두고, 이벤트 수신이 연결 끊김으로 끝나면 다시 연결
+            sender = asyncio.create_task(self.send_audio())
+            try:
+                while self.is_running:
+                    try:
+                        await self.handle_events()
+                        reason = "서버가 연결을 닫음"
+                    except CONNECTION_ERRORS as e:
+                        reason = str(e) or type(e).__name__
+                    if not await self.reconnect(reason):
+                        break
+            finally:
+                sender.cancel()
 
         except KeyboardInterrupt:
             print("\n\n프로그램을 종료합니다.")
@@ -239,16 +489,74 @@ class RealtimeClient:
         finally:
             await self.cleanup()
 
-    async def cleanup(self):
-        """리소스를 정리합니다."""
+    def print_turn_latency(self):
+        """턴 시작 대비 시점별 지연 히스토그램을 출력합니다."""
+        if not self.tracer.turns:
+            return
+        print(f"🗣  대화 턴 {self.tracer.turns}회 (끼어들기 {self.tracer.interrupted}회)")
+        summary = self.tracer.summary()
+        for name, label in TURN_LABELS.items():
+            stats = summary[name]
+            if stats["count"]:
+                print(f"   {label}: p50 {stats['p50']:.0f}ms / p95 {stats['p95']:.0f}ms "
+                      f"/ p99 {stats['p99']:.0f}ms ({stats['count']}회)")
+        if self.tracer.path:
+            print(f"   턴별 타임라인: {self.tracer.path}")
+
+    async def cleanup(self, report: bool = True):
+        """리소스를 정리합니다. report가 False면 통계를 출력하지 않습니다 (시작 전 취소)."""
         self.is_running = False
+        self.capture.close()
+        await self.loop_lag.stop()
 
-        if self.input_stream:
-            self.input_stream.stop_stream()
-            self.input_stream.close()
-
-        if self.output_stream:
-            self.output_stream.stop_stream()
-            self.output_stream.close()
-
-        self.audio.terminate()
+        if self._prepare_task is not None and not self._prepare_task.done():
+            self._prepare_task.cancel()
+            try:
+                await self._prepare_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._rtt_task is not None:
+            self._rtt_task.cancel()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+        for task in list(self._tool_tasks):
+            task.cancel()
+        self.tool_executor.shutdown()
+        self.member_cache.close()
+
+        self.audio_io.close()
+
+        await self._close_connection()
+        self.tracer.close()
+
+        if not report:
+            return
+        if self.first_audio_latency is not None:
+            print(f"⏱  Enter 후 첫 응답 음성까지 {self.first_audio_latency * 1000:.0f}ms")
+        playback = self.playback.stats()
+        print(f"🔈 재생: 끊김 {playback['underruns']}회 / 버퍼 초과 {playback['overruns']}회 "
+              f"/ 지터 버퍼 {playback['prebuffer_ms']}ms")
+        if self.vad is not None:
+            vad = self.vad.stats()
+            print(f"🎙  로컬 VAD: 전송 {vad['bytes_sent'] // 1024}KB / "
+                  f"절약 {vad['bytes_saved'] // 1024}KB ({vad['saved_ratio']:.0%})")
+        if self.echo_canceller is not None:
+            aec = self.echo_canceller.stats()
+            print(f"🔁 반향 제거: 감쇄 {aec['erle_db']:.1f}dB / "
+                  f"동시 발화 {aec['double_talk_frames']}프레임")
+        uplink = self.uplink.stats()
+        if uplink["messages"]:
+            print(f"📤 업링크: 초당 메시지 {uplink['messages_per_sec']:.1f}개 / "
+                  f"{uplink['bytes_per_sec'] / 1024:.1f}KB/s / 패킷 {uplink['packet_ms']}ms")
+        recoveries = summarize(self.recoveries)
+        if recoveries["count"]:
+            print(f"🔌 재연결 {recoveries['count']}회: 복구 p50 {recoveries['p50']:.0f}ms "
+                  f"/ 최대 {recoveries['max']:.0f}ms")
+        interrupts = summarize(self.playback.interrupt_latencies)
+        if interrupts["count"]:
+            print(f"✋ 끼어들기 {interrupts['count']}회: 무음까지 p50 {interrupts['p50']:.0f}ms "
+                  f"/ 최대 {interrupts['max']:.0f}ms")
+        self.print_turn_latency()
+        lag = self.loop_lag.summary()
+        if lag["count"]:
+            print(f"⏱  이벤트 루프 지연(ms): p50 {lag['p50']:.1f} / p99 {lag['p99']:.1f} / 최대 {lag['max']:.1f}")
@@ -0,0 +1,180 @@
+"""
+연결 끊김 복구
+
+웹소켓이 끊기면 서버 쪽 대화 기록(본인 인증 진행 상황 포함)도 함께 사라지므로,
+클라이언트가 대화 항목을 직접 기록해 두었다가 새 세션에 다시 넣습니다.
+
+- ConversationLog: 서버 이벤트로 대화 항목(사용자/어시스턴트 메시지, 함수 호출과 결과)을
+  기록하고 conversation.item.create로 재전송할 항목 목록을 만듦. 음성 항목은
+  받아쓰기/응답 텍스트로 바꾸고, 끼어들기로 잘린 응답은 들려준 만큼만 남김
+- backoff_delays: 재연결 시도 전 대기 시간 (첫 시도는 바로, 이후 지수 백오프 + 지터)
+- CONNECTION_ERRORS: 재연결로 복구할 연결 오류 종류
+"""
+import random
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from websockets.exceptions import ConnectionClosed
+
+CONNECTION_ERRORS = (ConnectionClosed, OSError)
+
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 8.0
+RECONNECT_ATTEMPTS = 8
+MAX_LOG_ITEMS = 200
+
+
+def backoff_delays(attempts: int = RECONNECT_ATTEMPTS, base: float = RECONNECT_BASE_DELAY,
+                   cap: float = RECONNECT_MAX_DELAY):
+    """재연결 시도마다 앞서 기다릴 시간(초)을 냅니다: 0, 약 0.5, 1, 2, 4, 8, 8, ..."""
+    yield 0.0
+    for n in range(attempts - 1):
+        delay = min(cap, base * 2 ** n)
+        yield delay * random.uniform(0.5, 1.0)
+
+
+class ConversationLog:
+    """
+    대화 항목을 서버 순서대로 기록합니다.
+
+    observe()에 모든 서버 이벤트를 넘기면 항목 생성, 받아쓰기 완료, 응답 항목 완료,
+    자르기(truncate), 삭제를 반영합니다. 재전송할 때 원래 항목 id를 그대로 쓰므로
+    새 세션에서 되돌아오는 conversation.item.created 이벤트는 같은 항목을 갱신할 뿐입니다.
+    max_items를 넘으면 오래된 항목부터 버리되, 함수 호출과 그 결과는 함께 버립니다
+    (호출 없이 결과만 재전송하면 서버가 거부함).
+    """
+
+    def __init__(self, sample_rate: int, max_items: int = MAX_LOG_ITEMS):
+        self.sample_rate = sample_rate
+        self.max_items = max_items
+        self._items: OrderedDict[str, dict] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def observe(self, event) -> None:
+        kind = event.type
+        if kind in ("conversation.item.created", "response.output_item.done"):
+            self._update(event.item)
+        elif kind == "conversation.item.input_audio_transcription.completed":
+            entry = self._items.get(event.item_id)
+            if entry is not None:
+                entry["text"] = event.transcript or ""
+        elif kind == "response.audio.delta":
+            entry = self._items.get(event.item_id)
+            if entry is not None:
+                # base64 길이로 PCM16 샘플 수를 어림 (디코딩하지 않음)
+                entry["audio_samples"] = entry.get("audio_samples", 0) + len(event.delta) * 3 // 8
+        elif kind == "conversation.item.truncated":
+            entry = self._items.get(event.item_id)
+            if entry is not None:
+                entry["audio_end_ms"] = event.audio_end_ms
+        elif kind == "conversation.item.deleted":
+            self._items.pop(event.item_id, None)
+
+    def _update(self, item) -> None:
+        entry = self._items.get(item.id)
+        if entry is None:
+            entry = self._items[item.id] = {"id": item.id, "type": item.type}
+            self._trim()
+        if item.type == "message":
+            entry["role"] = item.role
+            texts = [getattr(part, "text", None) or getattr(part, "transcript", None)
+                     for part in item.content or []]
+            texts = [text for text in texts if text]
+            if texts:
+                entry["text"] = " ".join(texts)
+        elif item.type == "function_call":
+            entry.update(call_id=item.call_id, name=item.name,
+                         arguments=item.arguments or entry.get("arguments", ""),
+                         done=entry.get("done", False) or item.status == "completed")
+        elif item.type == "function_call_output":
+            entry.update(call_id=item.call_id, output=item.output)
+
+    def add_function_output(self, call_id: str, output: str) -> dict:
+        """
+        보낼 함수 결과 항목을 먼저 기록하고 conversation.item.create용 항목을 반환합니다.
+
+        전송 직전에 연결이 끊겨도 재연결 때 재전송되도록, 서버 확인을 기다리지 않고 기록합니다.
+        """
+        item = {
+            "id": f"out_{uuid.uuid4().hex[:24]}",
+            "type": "function_call_output",
+            "call_id": call_id,
+            "output": output,
+        }
+        self._items[item["id"]] = dict(item)
+        self._trim()
+        return item
+
+    def _trim(self) -> None:
+        while len(self._items) > self.max_items:
+            _, entry = self._items.popitem(last=False)
+            if entry["type"] == "function_call":
+                orphans = [item_id for item_id, other in self._items.items()
+                           if other["type"] == "function_call_output"
+                           and other.get("call_id") == entry.get("call_id")]
+                for item_id in orphans:
+                    del self._items[item_id]
+
+    def _heard_text(self, entry: dict) -> str:
+        """끼어들기로 잘린 응답은 들려준 비율만큼만 텍스트를 남깁니다."""
+        text = entry.get("text", "")
+        end_ms = entry.get("audio_end_ms")
+        samples = entry.get("audio_samples")
+        if end_ms is None or not samples:
+            return text
+        fraction = min(1.0, end_ms * self.sample_rate / 1000 / samples)
+        cut = text[:int(len(text) * fraction)]
+        # 단어 중간에서 자르지 않음
+        return cut.rsplit(" ", 1)[0] if " " in cut and fraction < 1.0 else cut
+
+    def replay_items(self) -> list[dict]:
+        """새 세션에 conversation.item.create로 넣을 항목들 (기록 순서)."""
+        items = []
+        # 호출이 재전송되지 않는 결과(삭제되었거나 완료되지 않은 호출)는 서버가 거부하므로 뺌
+        calls = set()
+        for entry in self._items.values():
+            kind = entry["type"]
+            if kind == "message":
+                role = entry.get("role")
+                text = self._heard_text(entry) if role == "assistant" else entry.get("text", "")
+                if not text:
+                    continue
+                part_type = "text" if role == "assistant" else "input_text"
+                items.append({
+                    "id": entry["id"],
+                    "type": "message",
+                    "role": role,
+                    "content": [{"type": part_type, "text": text}],
+                })
+            elif kind == "function_call":
+                if not entry.get("done"):
+                    continue
+                calls.add(entry["call_id"])
+                items.append({
+                    "id": entry["id"],
+                    "type": "function_call",
+                    "call_id": entry["call_id"],
+                    "name": entry["name"],
+                    "arguments": entry["arguments"],
+                })
+            elif kind == "function_call_output":
+                if entry["call_id"] not in calls:
+                    continue
+                items.append({
+                    "id": entry["id"],
+                    "type": "function_call_output",
+                    "call_id": entry["call_id"],
+                    "output": entry["output"],
+                })
+        return items
+
+    def needs_response(self, items: Optional[list[dict]] = None) -> bool:
+        """마지막 항목이 사용자 발화나 함수 결과라 어시스턴트 응답이 끊긴 상태인지 여부."""
+        items = self.replay_items() if items is None else items
+        if not items:
+            return False
+        last = items[-1]
+        return last["type"] == "function_call_output" or last.get("role") == "user"
@@ -0,0 +1,137 @@
+"""
+다위상(polyphase) 샘플레이트 변환
+
+브라우저(WebRTC) 마이크 입력은 보통 48kHz라 Real-time API의 24kHz로 바꿔야 합니다.
+가장 가까운 샘플을 골라 내는 방식은 12kHz 이상 성분이 그대로 접혀(aliasing) 들어가
+서버 VAD와 받아쓰기 품질을 떨어뜨립니다.
+
+- 변환비 L/M(= out_rate/in_rate 기약분수)마다 Kaiser 창 sinc 저역 통과 필터를 한 번 설계해
+  L개 위상으로 나눈 필터 뱅크를 캐시
+- 청크 사이에 필터 이력(마지막 taps-1 입력)과 위상을 이어 가므로 청크 경계에서 끊김이 없음
+- 청크 길이별 출력 위치/위상 계산 결과도 재사용하고, 계산은 NumPy로 벡터화
+- (세션 수, 샘플 수) 2차원 입력을 주면 여러 세션을 한 번에 변환 (배치 모드)
+"""
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ZERO_CROSSINGS = 16   # 필터 한쪽의 sinc 영점 수 (클수록 전이 대역이 좁아짐)
+ROLLOFF = 0.9         # 통과 대역 끝 = 두 나이퀴스트 주파수 중 낮은 쪽 × ROLLOFF
+KAISER_BETA = 8.0     # 저지 대역 감쇠 약 80dB
+MAX_PLANS = 64
+
+
+@lru_cache(maxsize=None)
+def polyphase_bank(up: int, down: int, zero_crossings: int = ZERO_CROSSINGS,
+                   rolloff: float = ROLLOFF, beta: float = KAISER_BETA) -> tuple[np.ndarray, int]:
+    """
+    (up, taps) 모양의 위상별 필터(시간 역순, float32)와 필터 중심 지연(업샘플 단위)을 반환합니다.
+
+    위상 p의 필터와 가장 최근 입력 taps개의 내적이 출력 샘플 하나입니다.
+    """
+    factor = max(up, down)
+    half = zero_crossings * factor
+    taps = -(-(2 * half + 1) // up)
+    t = np.arange(taps * up) - half
+    cutoff = rolloff / factor
+    h = cutoff * np.sinc(cutoff * t) * np.kaiser(taps * up, beta)
+    # 끝에 붙인 0 채움 구간은 창 밖
+    h[2 * half + 1:] = 0.0
+    h *= up / h.sum()
+    bank = h.reshape(taps, up).T[:, ::-1]
+    bank = np.ascontiguousarray(bank, dtype=np.float32)
+    bank.setflags(write=False)
+    return bank, half
+
+
+class PolyphaseResampler:
+    """
+    상태를 유지하는 다위상 리샘플러입니다.
+
+    process()에 같은 스트림의 청크를 차례로 넣으면, 그때까지 계산할 수 있는 출력 샘플을
+    반환합니다 (필터 지연 delay_seconds만큼 늦게 나옴). 입력이 int16이면 int16으로,
+    아니면 float32로 돌려줍니다. (세션 수, n) 2차원 입력이면 세션별 상태를 따로 두고
+    한 번에 계산하며, 첫 호출의 세션 수를 계속 써야 합니다.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, zero_crossings: int = ZERO_CROSSINGS,
+                 rolloff: float = ROLLOFF, beta: float = KAISER_BETA):
+        g = np.gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.bank, half = polyphase_bank(self.up, self.down, zero_crossings, rolloff, beta)
+        self.taps = self.bank.shape[1]
+        self.delay_seconds = half / (self.up * in_rate)
+        self._plans: dict = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """필터 이력과 위상을 처음 상태로 되돌립니다."""
+        # [..., :taps-1] = 필터 이력, 그 뒤 = 이번 청크 (청크 길이가 같으면 재사용)
+        self._buffer = None
+        # 다음 출력 샘플의 위치 (업샘플 단위, 다음 청크 첫 입력 기준)
+        self._t = 0
+
+    def _plan(self, n: int):
+        """청크 길이 n에 대한 (입력 창 시작, 위상 필터, 출력 수, 다음 위치)를 계산하거나 재사용합니다."""
+        key = (self._t, n)
+        plan = self._plans.get(key)
+        if plan is None:
+            ts = np.arange(self._t, n * self.up, self.down)
+            # 위상이 하나뿐이면 창 시작이 일정 간격이라 위치 대신 첫 시작만 보관
+            start = self._t if self.up == 1 else ts // self.up
+            filters = self.bank[0] if self.up == 1 else self.bank[ts % self.up]
+            plan = (start, filters, len(ts), self._t + len(ts) * self.down - n * self.up)
+            if len(self._plans) >= MAX_PLANS:
+                self._plans.clear()
+            self._plans[key] = plan
+        return plan
+
+    def _work_buffer(self, x: np.ndarray) -> np.ndarray:
+        history = self.taps - 1
+        shape = x.shape[:-1] + (history + x.shape[-1],)
+        buffer = self._buffer
+        if buffer is None:
+            buffer = np.zeros(shape, dtype=np.float32)
+        elif buffer.shape[:-1] != x.shape[:-1]:
+            raise ValueError(f"세션 수가 바뀌었습니다: {buffer.shape[:-1]} → {x.shape[:-1]}")
+        elif buffer.shape != shape:
+            resized = np.zeros(shape, dtype=np.float32)
+            resized[..., :history] = buffer[..., :history]
+            buffer = resized
+        self._buffer = buffer
+        buffer[..., history:] = x
+        return buffer
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """청크 하나를 변환합니다."""
+        x = np.asarray(samples)
+        n = x.shape[-1]
+        buffer = self._work_buffer(x)
+        start, filters, count, self._t = self._plan(n)
+
+        if self.up == 1 and buffer.ndim == 1:
+            # 정수배 줄이기: 입력과 필터를 down개 위상으로 나눠 위상별 상관을 더함
+            # (out[i] = Σ_k filters[k] · buffer[start + i·down + k])
+            out = np.zeros(count, dtype=np.float32)
+            for q in range(min(self.down, self.taps)):
+                out += np.correlate(buffer[start + q::self.down], filters[q::self.down],
+                                    "valid")[:count]
+        elif self.up == 1:
+            windows = sliding_window_view(buffer, self.taps, axis=-1)
+            out = windows[..., start::self.down, :][..., :count, :] @ filters
+        else:
+            # windows[..., i, :] = 새 입력 i번째 샘플까지의 최근 taps개
+            windows = sliding_window_view(buffer, self.taps, axis=-1)[..., start, :]
+            out = np.einsum("...nk,nk->...n", windows, filters)
+
+        history = self.taps - 1
+        buffer[..., :history] = buffer[..., n:]
+        if x.dtype == np.int16:
+            np.rint(out, out=out)
+            np.clip(out, -32768, 32767, out=out)
+            return out.astype(np.int16)
+        return out.astype(np.float32, copy=False)
@@ -0,0 +1,99 @@
+"""
+Function calling 도구 비동기 실행기
+
+FUNCTION_MAP의 동기 함수는 제한된 스레드 풀에서, async 함수는 그대로 await 하여
+이벤트 루프(오디오 송수신)를 막지 않고 실행합니다. 도구별 시간 제한과 동시 실행
+수 제한을 두며, 시간이 초과되거나 인자 파싱/도구 실행이 실패해도 모델에 전달할
+구조화된 결과를 반환하므로 함수 호출마다 항상 출력이 생깁니다.
+"""
+import asyncio
+import functools
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+from member_db import FUNCTION_MAP
+
+# 도구별 시간 제한(초). 쓰기 작업은 여유를 더 둡니다.
+DEFAULT_TIMEOUT = 5.0
+TOOL_TIMEOUTS = {
+    "process_withdrawal": 10.0,
+}
+
+# 도구별 동시 실행 수 제한
+DEFAULT_CONCURRENCY = 4
+TOOL_CONCURRENCY = {
+    "process_withdrawal": 1,
+}
+
+
+class AsyncToolExecutor:
+    def __init__(
+        self,
+        functions: Optional[dict[str, Callable]] = None,
+        max_workers: int = 4,
+        timeouts: Optional[dict[str, float]] = None,
+        concurrency: Optional[dict[str, int]] = None,
+    ):
+        self.functions = functions if functions is not None else FUNCTION_MAP
+        self.timeouts = {**TOOL_TIMEOUTS, **(timeouts or {})}
+        self.concurrency = {**TOOL_CONCURRENCY, **(concurrency or {})}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency.get(name, DEFAULT_CONCURRENCY))
+            self._semaphores[name] = semaphore
+        return semaphore
+
+    async def _run(self, name: str, function: Callable, arguments: dict) -> dict:
+        async with self._semaphore(name):
+            if inspect.iscoroutinefunction(function):
+                return await function(**arguments)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, functools.partial(function, **arguments)
+            )
+
+    async def execute(self, name: str, arguments: Union[str, dict]) -> dict:
+        """
+        도구를 실행하고 결과를 반환합니다.
+
+        arguments는 모델이 보낸 JSON 문자열(또는 이미 파싱한 dict)입니다. 시간 초과나
+        예외(잘못된 인자, 저장소 오류 등)는 로그를 남기고 success=False 결과로 바꿉니다.
+        """
+        function = self.functions.get(name)
+        if function is None:
+            return {"success": False, "error": f"Unknown function: {name}"}
+
+        timeout = self.timeouts.get(name, DEFAULT_TIMEOUT)
+        try:
+            if isinstance(arguments, str):
+                arguments = json.loads(arguments) if arguments.strip() else {}
+            if not isinstance(arguments, dict):
+                raise TypeError(f"arguments must be a JSON object, got {type(arguments).__name__}")
+            return await asyncio.wait_for(self._run(name, function, arguments), timeout)
+        except asyncio.TimeoutError:
+            print(f"[도구] {name}: {timeout:g}초 시간 초과")
+            # 스레드에서 실행 중인 작업은 취소할 수 없으므로 결과가 불확실함을 알림
+            return {
+                "success": False,
+                "error": "timeout",
+                "timeout_seconds": timeout,
+                "message": f"요청 처리 시간이 {timeout:g}초를 초과했습니다. "
+                           "처리 결과를 확인할 수 없으니 잠시 후 다시 시도해 주세요.",
+            }
+        except Exception as e:
+            print(f"[도구] {name} 실행 실패: {type(e).__name__}: {e}")
+            return {
+                "success": False,
+                "error": type(e).__name__,
+                "message": f"요청을 처리하지 못했습니다: {e}",
+            }
+
+    def shutdown(self) -> None:
+        """대기 중인 작업을 취소하고 스레드 풀을 정리합니다."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
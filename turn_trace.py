@@ -0,0 +1,194 @@
+"""
+대화 턴별 지연 타임라인
+
+사용자 발화가 끝난 시점(또는 인사/텍스트 입력처럼 응답을 요청한 시점)부터 응답 재생이
+끝날 때까지를 한 턴으로 보고, 그 사이의 주요 시점을 기록합니다.
+
+- speech_stopped: 서버 VAD가 발화 끝을 알림 (턴 시작)
+- transcription_completed: 사용자 음성 받아쓰기 완료
+- response_created: 서버가 응답 생성을 시작
+- first_audio_delta: 첫 응답 음성 조각 도착
+- function_call_start / function_call_end: 함수 호출 인자 수신 ~ 결과 전송
+- audio_done: 응답 음성 수신 완료
+- playback_drained: 받은 응답 음성을 모두 재생함 (턴 끝)
+
+각 시점의 턴 시작 대비 지연(ms)을 최근 TRACE_WINDOW 턴의 롤링 히스토그램으로 모아
+summary()로 p50/p95/p99를 제공하고, 끝난 턴마다 타임라인 한 줄을 JSONL 파일
+(TURN_TRACE_FILE 환경 변수, 기본 logs/turn_trace.jsonl)에 남깁니다.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from metrics import summarize
+
+MILESTONES = (
+    "speech_stopped",
+    "transcription_completed",
+    "response_created",
+    "first_audio_delta",
+    "function_call_start",
+    "function_call_end",
+    "audio_done",
+    "playback_drained",
+)
+# 한 턴에서 여러 번 나오는 시점(함수 호출 뒤 두 번째 응답 등)은 응답 시작 쪽은 처음 값,
+# 응답 끝 쪽은 마지막 값을 씀
+LAST_MILESTONES = {"function_call_end", "audio_done", "playback_drained"}
+TRACE_WINDOW = 500
+TURN_TRACE_FILE = "logs/turn_trace.jsonl"
+
+
+def turn_trace_path() -> Optional[str]:
+    """TURN_TRACE_FILE 환경 변수 (비어 있거나 off면 None = 파일에 남기지 않음)."""
+    value = os.getenv("TURN_TRACE_FILE", TURN_TRACE_FILE).strip()
+    if value.lower() in ("", "off", "none", "false"):
+        return None
+    return value
+
+
+class TurnTracer:
+    """
+    턴 타임라인을 기록하고 시점별 지연 히스토그램을 유지합니다.
+
+    이벤트 루프와 오디오 출력 쪽(WebRTC emit 등) 양쪽에서 호출해도 되도록 잠금으로 보호합니다.
+    열린 턴이 없을 때의 mark()는 무시합니다. on_finish를 주면 턴이 끝날 때마다
+    타임라인 레코드로 호출합니다 (잠금 안에서 호출되므로 가볍게).
+    """
+
+    def __init__(self, client: str, path: Optional[str] = None, window: int = TRACE_WINDOW,
+                 on_finish: Optional[Callable[[dict], None]] = None):
+        self.client = client
+        self.path = turn_trace_path() if path is None else path
+        self.on_finish = on_finish
+        self.turns = 0
+        self.finished = 0
+        self.interrupted = 0
+        self._lock = threading.Lock()
+        self._turn: Optional[dict] = None
+        self._file = None
+        self._histograms = {name: deque(maxlen=window) for name in MILESTONES[1:]}
+        self._histograms["function_call"] = deque(maxlen=window)
+
+    def start_turn(self, origin: str = "speech_stopped") -> None:
+        """새 턴을 시작합니다. 아직 끝나지 않은 이전 턴은 그대로 마감합니다."""
+        now = time.perf_counter()
+        with self._lock:
+            if self._turn is not None:
+                self._finish(interrupted=False)
+            self.turns += 1
+            self._turn = {
+                "turn": self.turns,
+                "origin": origin,
+                "started": now,
+                "wall_time": time.time(),
+                "marks": {origin: 0.0} if origin in MILESTONES else {},
+                "function_calls": {},
+            }
+
+    def mark(self, milestone: str) -> None:
+        """열린 턴에 시점을 기록합니다 (턴 시작 대비 초)."""
+        now = time.perf_counter()
+        with self._lock:
+            turn = self._turn
+            if turn is None:
+                return
+            if milestone in LAST_MILESTONES or milestone not in turn["marks"]:
+                turn["marks"][milestone] = now - turn["started"]
+
+    def function_call_started(self, call_id: str, name: str) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            turn = self._turn
+            if turn is None:
+                return
+            offset = now - turn["started"]
+            turn["function_calls"][call_id] = {"name": name, "start": offset, "end": None}
+            turn["marks"].setdefault("function_call_start", offset)
+
+    def function_call_finished(self, call_id: str) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            turn = self._turn
+            if turn is None or call_id not in turn["function_calls"]:
+                return
+            offset = now - turn["started"]
+            turn["function_calls"][call_id]["end"] = offset
+            turn["marks"]["function_call_end"] = offset
+
+    def is_open(self) -> bool:
+        return self._turn is not None
+
+    def end_turn(self, interrupted: bool = False) -> None:
+        """열린 턴을 마감합니다 (재생 완료 또는 끼어들기)."""
+        with self._lock:
+            if self._turn is not None:
+                self._finish(interrupted)
+
+    def _finish(self, interrupted: bool) -> None:
+        turn, self._turn = self._turn, None
+        self.finished += 1
+        if interrupted:
+            self.interrupted += 1
+        for name, offset in turn["marks"].items():
+            if name in self._histograms:
+                self._histograms[name].append(offset)
+        calls = []
+        for call in turn["function_calls"].values():
+            if call["end"] is not None:
+                self._histograms["function_call"].append(call["end"] - call["start"])
+            calls.append({
+                "name": call["name"],
+                "start_ms": _ms(call["start"]),
+                "end_ms": _ms(call["end"]),
+            })
+        record = {
+            "client": self.client,
+            "turn": turn["turn"],
+            "origin": turn["origin"],
+            "wall_time": round(turn["wall_time"], 3),
+            "interrupted": interrupted,
+            "marks_ms": {name: _ms(offset) for name, offset in turn["marks"].items()},
+            "function_calls": calls,
+        }
+        self._write(record)
+        if self.on_finish is not None:
+            self.on_finish(record)
+
+    def _write(self, record: dict) -> None:
+        if self.path is None:
+            return
+        try:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            # 턴당 한 줄이라 바로 내보내도 부담이 작음
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except OSError as e:
+            print(f"턴 기록 저장 실패 ({self.path}): {e}")
+            self.path = None
+
+    def summary(self) -> dict:
+        """시점별(턴 시작 대비)과 함수 호출 소요 시간의 백분위수 요약 (ms)."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._histograms.items()}
+        return {name: summarize(values) for name, values in samples.items()}
+
+    def close(self) -> None:
+        """열린 턴을 마감하고 기록 파일을 닫습니다."""
+        with self._lock:
+            if self._turn is not None:
+                self._finish(interrupted=False)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
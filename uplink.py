@@ -0,0 +1,173 @@
+"""
+업링크 오디오 패킷화
+
+20ms 마이크 프레임마다 input_audio_buffer.append 메시지를 하나씩 보내면 JSON 직렬화,
+base64 문자열 생성, 웹소켓 프레임 처리 같은 메시지당 비용이 오디오 자체보다 커집니다.
+AudioUplink는 프레임을 미리 할당한 버퍼에 모아 패킷 길이(packet_ms)만큼 찼을 때
+한 메시지로 보냅니다.
+
+- 패킷 길이는 UPLINK_PACKET_MS 환경 변수로 고정하거나(예: 100), auto(기본)로 두면
+  측정한 왕복 지연(RTT)과 전송 적체(backlog)에 맞춰 PACKET_MIN_MS~PACKET_MAX_MS 사이에서 조절
+  - 보내는 데 걸린 시간 + 아직 못 보낸 입력이 패킷 길이의 CONGESTED_RATIO 배를 넘으면
+    (링크가 실시간을 겨우 따라가는 중) 한 단계 늘림
+  - CALM_PACKETS 개 연속으로 여유가 있으면 한 단계 줄임 (RTT/4 아래로는 줄이지 않음)
+- 초당 메시지 수, 초당 바이트 수, 전송 시간 백분위수를 stats()로 제공
+"""
+import asyncio
+import binascii
+import os
+import time
+from collections import deque
+from typing import Optional
+
+from metrics import summarize
+
+PACKET_MIN_MS = 40
+PACKET_MAX_MS = 200
+PACKET_STEP_MS = 20
+# 패킷 길이를 RTT의 이 비율 이상으로 유지 (RTT가 크면 패킷을 모으는 지연은 상대적으로 작음)
+RTT_PACKET_RATIO = 0.25
+CONGESTED_RATIO = 0.8
+CALM_PACKETS = 25
+RTT_PROBE_INTERVAL = 5.0
+RTT_PROBE_TIMEOUT = 5.0
+
+
+def uplink_packet_ms() -> Optional[int]:
+    """UPLINK_PACKET_MS 환경 변수 (auto 또는 비어 있으면 None = 자동 조절)."""
+    value = os.getenv("UPLINK_PACKET_MS", "auto").strip().lower()
+    if value in ("", "auto"):
+        return None
+    return max(1, int(value))
+
+
+class AudioUplink:
+    """
+    PCM16 입력을 패킷 단위로 모아 input_audio_buffer.append로 보냅니다.
+
+    send()에 임의 길이의 PCM16 바이트나 int16 배열을 넣으면 패킷이 찰 때마다 전송하고,
+    flush()는 남은 입력을 바로 보냅니다 (발화 끝, 재생 시작 등 입력이 끊길 때 호출).
+    """
+
+    def __init__(self, sample_rate: int, packet_ms: Optional[int] = None,
+                 min_ms: int = PACKET_MIN_MS, max_ms: int = PACKET_MAX_MS):
+        if packet_ms is None:
+            packet_ms = uplink_packet_ms()
+        self.sample_rate = sample_rate
+        self.adaptive = packet_ms is None
+        self.min_ms = min_ms if self.adaptive else packet_ms
+        self.max_ms = max_ms if self.adaptive else packet_ms
+        self.packet_ms = self.min_ms
+        # 최대 패킷 길이만큼 미리 할당해 두고 계속 재사용
+        self._buffer = bytearray(self._ms_to_bytes(self.max_ms))
+        self._view = memoryview(self._buffer)
+        self._pending = 0
+        self._calm = 0
+        self.rtt: Optional[float] = None
+        self.messages = 0
+        self.bytes_sent = 0
+        self.audio_bytes = 0
+        self._started: Optional[float] = None
+        self._send_times: deque = deque(maxlen=1000)
+
+    def _ms_to_bytes(self, ms: int) -> int:
+        return self.sample_rate * ms // 1000 * 2
+
+    def pending_ms(self) -> float:
+        """버퍼에 모여 있고 아직 보내지 않은 오디오 길이 (ms)."""
+        return self._pending / 2 * 1000 / self.sample_rate
+
+    async def send(self, connection, pcm, backlog: float = 0.0) -> None:
+        """
+        입력을 버퍼에 모으고 패킷 길이가 찰 때마다 전송합니다.
+
+        backlog: 호출자 쪽에 쌓여 아직 send()하지 못한 입력 길이(초). 적체 판단에 사용.
+        """
+        data = memoryview(pcm).cast("B")
+        offset = 0
+        while offset < len(data):
+            target = self._ms_to_bytes(self.packet_ms)
+            count = min(len(data) - offset, max(0, target - self._pending))
+            self._view[self._pending:self._pending + count] = data[offset:offset + count]
+            self._pending += count
+            offset += count
+            if self._pending >= target:
+                await self._send_packet(connection, backlog)
+
+    def discard(self) -> None:
+        """모여 있는 입력을 보내지 않고 버립니다 (연결이 끊겼을 때)."""
+        self._pending = 0
+
+    async def flush(self, connection) -> None:
+        """모여 있는 입력을 패킷 길이와 상관없이 바로 보냅니다."""
+        if self._pending:
+            await self._send_packet(connection, 0.0)
+
+    async def _send_packet(self, connection, backlog: float) -> None:
+        encoded = binascii.b2a_base64(self._view[:self._pending], newline=False).decode("ascii")
+        audio_bytes = self._pending
+        self._pending = 0
+        started = time.perf_counter()
+        if self._started is None:
+            self._started = started
+        await connection.input_audio_buffer.append(audio=encoded)
+        elapsed = time.perf_counter() - started
+        self._send_times.append(elapsed)
+        self.messages += 1
+        self.bytes_sent += len(encoded)
+        self.audio_bytes += audio_bytes
+        if self.adaptive:
+            self._adapt(elapsed + backlog)
+
+    def _adapt(self, backlog: float) -> None:
+        floor = self.min_ms
+        if self.rtt is not None:
+            floor = max(floor, int(self.rtt * 1000 * RTT_PACKET_RATIO))
+        if backlog * 1000 > self.packet_ms * CONGESTED_RATIO:
+            self._calm = 0
+            self.packet_ms = min(self.packet_ms + PACKET_STEP_MS, self.max_ms)
+        else:
+            self._calm += 1
+            if self._calm >= CALM_PACKETS:
+                self._calm = 0
+                self.packet_ms = max(self.packet_ms - PACKET_STEP_MS, self.min_ms)
+        self.packet_ms = max(self.packet_ms, min(floor, self.max_ms))
+
+    def observe_rtt(self, rtt: float) -> None:
+        """왕복 지연 측정값(초)을 반영합니다."""
+        self.rtt = rtt if self.rtt is None else self.rtt * 0.8 + rtt * 0.2
+
+    async def probe_rtt(self, connection, interval: float = RTT_PROBE_INTERVAL) -> None:
+        """
+        웹소켓 ping/pong으로 interval 마다 RTT를 잽니다 (취소될 때까지 실행).
+
+        연결 객체가 ping을 지원하지 않으면 바로 끝나고, 적체만으로 패킷 길이를 조절합니다.
+        """
+        websocket = getattr(connection, "_connection", None)
+        ping = getattr(websocket, "ping", None)
+        if ping is None:
+            return
+        while True:
+            started = time.perf_counter()
+            try:
+                pong = await ping()
+                await asyncio.wait_for(pong, RTT_PROBE_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                return
+            self.observe_rtt(time.perf_counter() - started)
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "messages": self.messages,
+            "bytes_sent": self.bytes_sent,
+            "audio_bytes": self.audio_bytes,
+            "messages_per_sec": self.messages / elapsed if elapsed else 0.0,
+            "bytes_per_sec": self.bytes_sent / elapsed if elapsed else 0.0,
+            "packet_ms": self.packet_ms,
+            "rtt_ms": self.rtt * 1000 if self.rtt is not None else None,
+            "send_ms": summarize(list(self._send_times)),
+        }
@@ -0,0 +1,140 @@
+"""
+클라이언트 측 음성 구간 검출 (local VAD)
+
+마이크 입력을 20ms 프레임으로 나눠 에너지(dBFS)와 영교차율(ZCR)을 NumPy로
+한 번에 계산하고, 말소리 구간과 그 앞뒤 여유분만 서버로 보냅니다.
+
+- pre-roll: 말 시작이 감지되기 직전 프레임들을 함께 보내 첫 음절이 잘리지 않게 함
+- hangover: 말이 끝난 뒤에도 일정 시간 계속 보내, 서버 VAD가 발화 종료(무음)를
+  감지할 수 있게 함 (서버 silence_duration_ms 보다 길어야 함)
+- 잡음 바닥(noise floor)을 추적해 주변 소음 수준에 맞춰 임계값이 움직임
+"""
+import os
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+FRAME_MS = 20
+PREROLL_MS = 300            # 서버 prefix_padding_ms(200) 이상
+HANGOVER_MS = 1500          # 서버 silence_duration_ms(1200) + 여유
+SPEECH_MARGIN_DB = 12.0     # 잡음 바닥보다 이만큼 크면 말소리 후보
+MIN_SPEECH_DB = -55.0       # 이보다 작은 소리는 잡음 바닥과 무관하게 무시
+MAX_SPEECH_ZCR = 0.45       # 이보다 영교차가 잦으면 광대역 잡음(쉿 소리 등)으로 판단
+START_FRAMES = 2            # 연속 말소리 프레임 수가 이만큼 되면 발화 시작
+
+
+def local_vad_enabled() -> bool:
+    """LOCAL_VAD 환경 변수로 로컬 VAD 사용 여부를 정합니다 (기본: 끔)."""
+    return os.getenv("LOCAL_VAD", "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+def frame_features(samples: np.ndarray, frame_samples: int) -> tuple[np.ndarray, np.ndarray]:
+    """int16 샘플을 프레임으로 나눠 프레임별 에너지(dBFS)와 영교차율을 반환합니다."""
+    count = len(samples) // frame_samples
+    frames = samples[:count * frame_samples].reshape(count, frame_samples).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    energy_db = 20.0 * np.log10(rms / 32768.0 + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy_db, zcr
+
+
+class VoiceActivityGate:
+    """
+    PCM16 입력 중 보낼 부분만 골라내는 게이트입니다.
+
+    feed()에 임의 길이의 int16 샘플을 넣으면 서버로 보낼 샘플(없으면 빈 배열)을
+    반환합니다. 프레임 길이에 못 미치는 나머지는 다음 호출로 넘깁니다.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = FRAME_MS,
+                 preroll_ms: int = PREROLL_MS, hangover_ms: int = HANGOVER_MS,
+                 margin_db: float = SPEECH_MARGIN_DB, min_db: float = MIN_SPEECH_DB,
+                 max_zcr: float = MAX_SPEECH_ZCR, start_frames: int = START_FRAMES):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.max_zcr = max_zcr
+        self.start_frames = start_frames
+        self._preroll: deque = deque(maxlen=max(start_frames, preroll_ms // frame_ms))
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._noise_floor: Optional[float] = None
+        self._candidate = 0
+        self._hangover = 0
+        self.active = False
+        self.samples_in = 0
+        self.samples_sent = 0
+        self.segments = 0
+
+    def _is_speech(self, energy_db: float, zcr: float) -> bool:
+        floor = self._noise_floor
+        if floor is None:
+            floor = self._noise_floor = energy_db
+        speech = (energy_db > max(floor + self.margin_db, self.min_db)
+                  and zcr < self.max_zcr)
+        # 잡음 바닥은 조용해지면 빠르게 내려가고, 시끄러워지면 천천히 올라감
+        if energy_db < floor:
+            self._noise_floor = floor + (energy_db - floor) * 0.1
+        elif not speech:
+            self._noise_floor = floor + (energy_db - floor) * 0.02
+        else:
+            self._noise_floor = floor + (energy_db - floor) * 0.001
+        return speech
+
+    def feed(self, samples: np.ndarray) -> np.ndarray:
+        """입력 샘플을 받아 서버로 보낼 샘플을 반환합니다."""
+        self.samples_in += len(samples)
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+        frame_samples = self.frame_samples
+        usable = len(samples) - len(samples) % frame_samples
+        self._remainder = samples[usable:].copy()
+
+        energy_db, zcr = frame_features(samples[:usable], frame_samples)
+        out = []
+        for i in range(len(energy_db)):
+            frame = samples[i * frame_samples:(i + 1) * frame_samples]
+            speech = self._is_speech(float(energy_db[i]), float(zcr[i]))
+            if self.active:
+                out.append(frame)
+                if speech:
+                    self._hangover = self.hangover_frames
+                else:
+                    self._hangover -= 1
+                    if self._hangover <= 0:
+                        self.active = False
+                continue
+
+            self._candidate = self._candidate + 1 if speech else 0
+            if self._candidate >= self.start_frames:
+                # 발화 시작: 직전 프레임들(pre-roll)과 함께 전송 시작
+                self.active = True
+                self.segments += 1
+                self._candidate = 0
+                self._hangover = self.hangover_frames
+                out.extend(self._preroll)
+                self._preroll.clear()
+                out.append(frame)
+            else:
+                self._preroll.append(frame.copy())
+
+        if not out:
+            return np.zeros(0, dtype=np.int16)
+        sent = np.concatenate(out)
+        self.samples_sent += len(sent)
+        return sent
+
+    def stats(self) -> dict:
+        """입력/전송 바이트와 절약한 바이트."""
+        bytes_in = self.samples_in * 2
+        bytes_sent = self.samples_sent * 2
+        return {
+            "bytes_in": bytes_in,
+            "bytes_sent": bytes_sent,
+            "bytes_saved": bytes_in - bytes_sent,
+            "saved_ratio": (bytes_in - bytes_sent) / bytes_in if bytes_in else 0.0,
+            "segments": self.segments,
+        }